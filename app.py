@@ -20,6 +20,11 @@ Examples:
   python app.py find "egg, tomato, onion"
   python app.py find "chicken, rice" --provider spoonacular --max-mins 30
   python app.py find "pasta, tomato" --diet vegetarian --max-cost 2.00
+  python app.py find "egg, rice, onion, garlic" --max-missing 1
+  python app.py find "chicken, rice" --query "spicy curry"
+  python app.py find --query "curr*"
+  python app.py suggest "egg, rice, onion, garlic" --count 3
+  python app.py plan "egg, rice, onion, garlic" --days 5 --diet vegetarian
   python app.py export results.json --format json
         """
     )
@@ -31,8 +36,15 @@ Examples:
     find_parser.add_argument(
         'ingredients',
         type=str,
+        nargs='?',
+        default='',
         help='Comma-separated list of ingredients (e.g., "egg, tomato, onion")'
     )
+    find_parser.add_argument(
+        '--query',
+        type=str,
+        help='Free-text search in titles, instructions, cuisines and categories (e.g., "spicy curry"; "curr*" for a prefix)'
+    )
     find_parser.add_argument(
         '--provider',
         type=str,
@@ -81,11 +93,87 @@ Examples:
         default='used-desc',
         help='How to sort results (default: used-desc)'
     )
+    find_parser.add_argument(
+        '--max-missing',
+        type=int,
+        help='Only show recipes missing at most this many ingredients (0 = cook now)'
+    )
     find_parser.add_argument(
         '--export',
         type=str,
         help='Export results to file (e.g., results.json or results.csv)'
     )
+    find_parser.add_argument(
+        '--prewarm',
+        action='store_true',
+        help='Open provider connections in the background while starting up'
+    )
+    
+    # Suggest command (what to buy next, from the offline recipes)
+    suggest_parser = subparsers.add_parser('suggest', help='Suggest ingredients to buy that unlock the most recipes')
+    suggest_parser.add_argument(
+        'ingredients',
+        type=str,
+        help='Comma-separated list of ingredients you have'
+    )
+    suggest_parser.add_argument(
+        '--count',
+        type=int,
+        default=1,
+        help='Pick this many ingredients to buy together (default: 1)'
+    )
+    suggest_parser.add_argument(
+        '--limit',
+        type=int,
+        default=10,
+        help='Number of single-ingredient suggestions to show (default: 10)'
+    )
+    suggest_parser.add_argument(
+        '--max-mins',
+        type=int,
+        help='Only count recipes taking at most this many minutes'
+    )
+    suggest_parser.add_argument(
+        '--diet',
+        type=str,
+        choices=['vegetarian', 'vegan', 'gluten-free', 'ketogenic', 'paleo'],
+        help='Only count recipes fitting this diet'
+    )
+    
+    # Plan command (several recipes sharing one shopping list)
+    plan_parser = subparsers.add_parser('plan', help='Plan meals that share ingredients, with a shopping list')
+    plan_parser.add_argument(
+        'ingredients',
+        type=str,
+        help='Comma-separated list of ingredients you have'
+    )
+    plan_parser.add_argument(
+        '--days',
+        type=int,
+        default=7,
+        help='Number of recipes to plan (default: 7)'
+    )
+    plan_parser.add_argument(
+        '--max-mins',
+        type=int,
+        help='Maximum cooking time in minutes'
+    )
+    plan_parser.add_argument(
+        '--diet',
+        type=str,
+        choices=['vegetarian', 'vegan', 'gluten-free', 'ketogenic', 'paleo'],
+        help='Dietary preference'
+    )
+    plan_parser.add_argument(
+        '--exclude',
+        type=str,
+        help='Comma-separated list of ingredients to exclude'
+    )
+    plan_parser.add_argument(
+        '--export',
+        type=str,
+        help='Export the planned recipes to file (e.g., plan.json or plan.csv)'
+    )
     
     # Export command (for exporting previously found recipes)
     export_parser = subparsers.add_parser('export', help='Export recipes to file')
@@ -107,11 +195,25 @@ Examples:
         parser.print_help()
         return 0
     
+    if args.command == 'find' and not args.ingredients and not args.query:
+        find_parser.error('give ingredients, --query, or both')
+    
+    # Start connection warmup before the heavier UI imports
+    if args.command == 'find':
+        from core.config import should_prewarm
+        if args.prewarm or should_prewarm():
+            from core.orchestrator import prewarm_providers
+            prewarm_providers(args.provider)
+    
     # Import UI module here to avoid circular imports
-    from ui.cli import handle_find_command, handle_export_command
+    from ui.cli import handle_find_command, handle_export_command, handle_plan_command, handle_suggest_command
     
     if args.command == 'find':
         return handle_find_command(args)
+    elif args.command == 'suggest':
+        return handle_suggest_command(args)
+    elif args.command == 'plan':
+        return handle_plan_command(args)
     elif args.command == 'export':
         return handle_export_command(args)
     
@@ -0,0 +1,122 @@
+"""
+Benchmark: fallback recipe database import/startup cost
+
+Compares the old layout (recipes as a Python list literal inside the
+module) with the lazily loaded data file. The legacy module is generated
+from the current data into a temporary directory. Each case runs in a
+fresh interpreter, and both cold (.pyc compiled) and warm (cached
+bytecode) imports are measured.
+
+Before timing, it asserts that importing the startup modules does not
+load optional heavy dependencies (NumPy), which are only imported by the
+search paths that use them.
+
+Usage:
+    python -m benchmarks.bench_fallback_import [--runs 5]
+"""
+import argparse
+import os
+import pprint
+import shutil
+import subprocess
+import sys
+import tempfile
+from providers.fallback_recipes import load_fallback_recipes
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a child interpreter; prints "<import seconds>" or "<KiB allocated>"
+TIME_PROBE = """
+import time
+import core.model, core.performance
+start = time.perf_counter()
+import {module} as m
+{touch}
+print(time.perf_counter() - start)
+"""
+
+# Runs in a child interpreter; prints the LAZY_MODULES the import loaded
+LAZY_PROBE = """
+import sys
+import {module}
+print(" ".join(name for name in {lazy!r} if name in sys.modules))
+"""
+
+# Loaded on first use only, never when the app starts
+LAZY_MODULES = ("numpy",)
+STARTUP_MODULES = ("providers.fallback_recipes", "core.orchestrator")
+
+MEMORY_PROBE = """
+import tracemalloc
+import core.model, core.performance
+tracemalloc.start()
+import {module} as m
+{touch}
+print(tracemalloc.get_traced_memory()[0] / 1024)
+"""
+
+
+def write_legacy_module(directory: str) -> None:
+    """Generate the old-style module with the recipe list literal"""
+    with open(os.path.join(directory, "legacy_fallback_recipes.py"), "w", encoding="utf-8") as f:
+        f.write("from core.model import Recipe, Provider, IngredientItem\n\n")
+        f.write("FALLBACK_RECIPES = ")
+        f.write(pprint.pformat(load_fallback_recipes(), width=100, sort_dicts=False))
+        f.write("\n")
+
+
+def probe(template: str, module: str, touch: str, pythonpath: str, cold: bool) -> float:
+    """Run a probe for a module in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    if cold:
+        # Force the literal to be compiled from source on every run
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+        shutil.rmtree(os.path.join(pythonpath.split(os.pathsep)[0], "__pycache__"), ignore_errors=True)
+    out = subprocess.run(
+        [sys.executable, "-c", template.format(module=module, touch=touch)],
+        env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return float(out)
+
+
+def assert_lazy_imports() -> None:
+    """Fail if importing a startup module loads one of LAZY_MODULES"""
+    for module in STARTUP_MODULES:
+        out = subprocess.run(
+            [sys.executable, "-c", LAZY_PROBE.format(module=module, lazy=LAZY_MODULES)],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        assert not out.strip(), f"import {module} loads {out.strip()}"
+
+
+def best_of(runs: int, *args) -> tuple:
+    seconds = min(probe(TIME_PROBE, *args) for _ in range(runs))
+    return seconds, probe(MEMORY_PROBE, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    assert_lazy_imports()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        write_legacy_module(tmp)
+        legacy_path = os.pathsep.join([tmp, REPO_ROOT])
+        
+        cases = [
+            ("literal, cold import", "legacy_fallback_recipes", "", legacy_path, True),
+            ("literal, warm import", "legacy_fallback_recipes", "", legacy_path, False),
+            ("data file, import only", "providers.fallback_recipes", "", REPO_ROOT, False),
+            ("data file, import + load", "providers.fallback_recipes", "m.load_fallback_recipes()", REPO_ROOT, False),
+        ]
+        
+        print(f"{'case':<28} {'time':>10} {'allocated':>12}")
+        for label, module, touch, path, cold in cases:
+            seconds, kib = best_of(args.runs, module, touch, path, cold)
+            print(f"{label:<28} {seconds * 1000:>8.2f}ms {kib:>9.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
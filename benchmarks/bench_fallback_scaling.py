@@ -0,0 +1,101 @@
+"""
+Benchmark: local recipe search at 10k / 100k / 1M recipes
+
+Generates deterministic synthetic corpora (benchmarks/synthetic_corpus.py),
+builds their indexes, then runs a fixed mix of queries (1-5 ingredients,
+every sort mode, some with diet/time filters and exclusions) against a
+RecipeStore and reports per-query latency percentiles. The query-level
+result cache is not involved: every query is computed.
+
+Corpora and indexes are kept in --workdir and reused by later runs.
+
+Usage:
+    python -m benchmarks.bench_fallback_scaling [--sizes 10000,100000,1000000]
+        [--queries 200] [--workdir DIR] [--pure-python]
+"""
+import argparse
+import os
+import random
+import tempfile
+from core.performance import Timer
+from providers import recipe_index
+from providers.recipe_store import RecipeStore
+from benchmarks.synthetic_corpus import write_corpus
+
+INGREDIENTS = ["eggs", "onion", "garlic", "tomato", "rice", "chicken", "potato", "cheese",
+               "butter", "milk", "flour", "beef", "pasta", "carrot", "lemon", "spinach"]
+SORT_MODES = ["relevance", "match-desc", "used-desc", "missing-asc", "time-asc"]
+DIETS = ["vegetarian", "vegan", "gluten-free", "quick"]
+
+
+def make_queries(count: int, seed: int = 7) -> list:
+    """Deterministic mix of search keyword arguments"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        query = {
+            "user_ingredients": rng.sample(INGREDIENTS, rng.randint(1, 5)),
+            "max_results": rng.choice((10, 10, 20, 50)),
+            "sort_by": rng.choice(SORT_MODES),
+        }
+        if rng.random() < 0.25:
+            query["diet"] = rng.choice(DIETS)
+        if rng.random() < 0.25:
+            query["max_minutes"] = rng.choice((15, 30, 45))
+        if rng.random() < 0.1:
+            query["exclude"] = [rng.choice(("nuts", "shrimp", "pork", "milk"))]
+        queries.append(query)
+    return queries
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=str, default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "recipe-finder-bench"))
+    parser.add_argument("--pure-python", action="store_true", help="Disable the NumPy engine")
+    args = parser.parse_args()
+    
+    if args.pure_python:
+        recipe_index.VECTORIZE = False
+    os.makedirs(args.workdir, exist_ok=True)
+    queries = make_queries(args.queries)
+    
+    print(f"engine: {'numpy' if recipe_index.VECTORIZE else 'pure python'}, {len(queries)} queries")
+    print(f"{'recipes':>10} {'data MB':>8} {'index MB':>9} {'build':>8} {'open':>8} "
+          f"{'first':>8} {'p50':>8} {'p95':>8} {'max':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        data_path = os.path.join(args.workdir, f"synthetic_{size}.jsonl")
+        if not os.path.exists(data_path):
+            write_corpus(data_path, size)
+        
+        # First open builds (and saves) the index if needed
+        with Timer() as build:
+            RecipeStore(data_path).index
+        # A fresh store maps the saved index; the first query also builds
+        # the lazy per-process structures (match index, recipe sizes)
+        store = RecipeStore(data_path)
+        with Timer() as open_time:
+            store.index
+        with Timer() as first:
+            store.search(**queries[0])
+        
+        latencies = []
+        for query in queries:
+            with Timer() as t:
+                store.search(**query)
+            latencies.append(t.elapsed * 1000)
+        latencies.sort()
+        
+        data_mb = os.path.getsize(data_path) / 2**20
+        index_mb = os.path.getsize(store.index_path) / 2**20
+        print(f"{size:>10} {data_mb:>8.1f} {index_mb:>9.1f} {build.elapsed:>7.2f}s {open_time.elapsed:>7.2f}s "
+              f"{first.elapsed * 1000:>6.1f}ms {percentile(latencies, 50):>6.1f}ms {percentile(latencies, 95):>6.1f}ms {latencies[-1]:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: JSON decoding of provider responses
+
+Decodes the same payloads with every installed JSON codec (stdlib json,
+orjson, ujson) and encodes an export document with each.
+
+Recorded responses can be supplied with --payloads DIR (every *.json file
+in the directory is read as raw bytes). Without it, TheMealDB
+lookup.php-shaped payloads with long instructions are generated.
+
+Usage:
+    python -m benchmarks.bench_json_codecs [--payloads DIR] [--rounds 5]
+"""
+import argparse
+import json
+from pathlib import Path
+from core.performance import (
+    Timer,
+    available_json_backends,
+    set_json_backend,
+    get_json_backend,
+    json_loads,
+    json_dumps
+)
+from benchmarks.bench_meal_parser import make_meals
+
+
+def load_payloads(payload_dir: str = None) -> list:
+    """Load recorded payloads, or synthesize lookup.php responses"""
+    if payload_dir:
+        return [p.read_bytes() for p in sorted(Path(payload_dir).glob("*.json"))]
+    return [json.dumps({"meals": [meal]}).encode("utf-8") for meal in make_meals(300)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=str, help="Directory of recorded *.json responses")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    payloads = load_payloads(args.payloads)
+    total_bytes = sum(len(p) for p in payloads)
+    export_doc = {"count": len(payloads), "recipes": [json.loads(p) for p in payloads]}
+    default_backend = get_json_backend()
+    
+    print(f"Payloads: {len(payloads)} ({total_bytes / 1024:.0f} KiB)")
+    print(f"{'codec':<8} {'decode':>10} {'MiB/s':>8} {'export':>10}")
+    
+    for backend in available_json_backends():
+        set_json_backend(backend)
+        best_decode = best_encode = float("inf")
+        for _ in range(args.rounds):
+            with Timer() as decode:
+                for payload in payloads:
+                    json_loads(payload)
+            with Timer() as encode:
+                json_dumps(export_doc, indent=2)
+            best_decode = min(best_decode, decode.elapsed)
+            best_encode = min(best_encode, encode.elapsed)
+        
+        throughput = total_bytes / best_decode / (1024 * 1024)
+        print(f"{backend:<8} {best_decode * 1000:>8.2f}ms {throughput:>8.1f} {best_encode * 1000:>8.2f}ms")
+    
+    set_json_backend(default_backend)
+    print(f"\nActive codec: {default_backend}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Microbenchmark: TheMealDB meal parsing
+
+Compares the original two-pass conversion (extract_ingredients_from_meal +
+extract_ingredient_items_from_meal + find_matching_ingredients) with the
+single-pass MealParser on synthetic meals built from the local recipe data.
+
+Usage:
+    python -m benchmarks.bench_meal_parser [--meals 500] [--rounds 5]
+"""
+import argparse
+from core.model import Recipe, Provider
+from core.normalize import find_matching_ingredients
+from core.performance import Timer
+from providers.fallback_recipes import load_fallback_recipes
+from providers.themealdb import TheMealDBProvider, MealParser
+
+USER_INGREDIENTS = ["eggs", "onion", "tomato", "garlic", "rice", "chicken"]
+
+
+def make_meals(count: int) -> list:
+    """Build TheMealDB-shaped payloads from fallback recipes"""
+    recipes = load_fallback_recipes()
+    meals = []
+    for n in range(count):
+        source = recipes[n % len(recipes)]
+        meal = {
+            "idMeal": str(50000 + n),
+            "strMeal": source["title"],
+            "strCategory": source["category"][0] if source["category"] else None,
+            "strArea": source["cuisine"],
+            "strTags": ",".join(source["category"]),
+            "strInstructions": source["instructions"] * 20,
+            "strMealThumb": None,
+            "strSource": None,
+            "strYoutube": None,
+        }
+        for i in range(1, 21):
+            ingredients = source["ingredients"]
+            meal[f"strIngredient{i}"] = ingredients[i - 1].title() if i <= len(ingredients) else ""
+            meal[f"strMeasure{i}"] = "1 cup" if i <= len(ingredients) else " "
+        meals.append(meal)
+    return meals
+
+
+def legacy_meal_to_recipe(provider: TheMealDBProvider, meal: dict, user_ingredients: list) -> Recipe:
+    """The original two-pass conversion, kept here for comparison"""
+    recipe_ingredients = provider.extract_ingredients_from_meal(meal)
+    ingredient_items = provider.extract_ingredient_items_from_meal(meal)
+    used, missing = find_matching_ingredients(user_ingredients, recipe_ingredients)
+    
+    categories = []
+    if meal.get("strCategory"):
+        categories.append(meal["strCategory"])
+    if meal.get("strArea"):
+        categories.append(f"{meal['strArea']} cuisine")
+    if meal.get("strTags"):
+        categories.extend(t.strip() for t in meal["strTags"].split(",") if t.strip())
+    
+    return Recipe(
+        id=meal["idMeal"],
+        provider=Provider.THEMEALDB,
+        title=meal.get("strMeal", "Unknown"),
+        image_url=meal.get("strMealThumb"),
+        source_url=meal.get("strSource") or meal.get("strYoutube"),
+        ingredients=ingredient_items,
+        used_ingredients=used,
+        missing_ingredients=missing,
+        instructions=meal.get("strInstructions"),
+        cuisine=meal.get("strArea"),
+        category_or_diet=categories
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meals", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    provider = TheMealDBProvider()
+    meals = make_meals(args.meals)
+    
+    # Sanity check: both paths must agree
+    meal_parser = MealParser(USER_INGREDIENTS)
+    for meal in meals:
+        assert legacy_meal_to_recipe(provider, meal, USER_INGREDIENTS) == meal_parser.parse(meal)
+    
+    best_legacy = best_single = float("inf")
+    for _ in range(args.rounds):
+        with Timer("legacy") as legacy:
+            for meal in meals:
+                legacy_meal_to_recipe(provider, meal, USER_INGREDIENTS)
+        with Timer("single-pass") as single:
+            meal_parser = MealParser(USER_INGREDIENTS)  # one parser per search
+            for meal in meals:
+                meal_parser.parse(meal)
+        best_legacy = min(best_legacy, legacy.elapsed)
+        best_single = min(best_single, single.elapsed)
+    
+    print(f"Meals per batch:   {args.meals}")
+    print(f"Two-pass parser:   {best_legacy * 1000:.2f} ms ({best_legacy / args.meals * 1e6:.1f} µs/meal)")
+    print(f"Single-pass:       {best_single * 1000:.2f} ms ({best_single / args.meals * 1e6:.1f} µs/meal)")
+    print(f"Speedup:           {best_legacy / best_single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
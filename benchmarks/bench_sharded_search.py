@@ -0,0 +1,68 @@
+"""
+Benchmark: in-process vs. sharded multi-process local search
+
+Searches a synthetic corpus (see benchmarks/synthetic_corpus.py) with a
+ShardedSearcher for each shard count and compares latency and throughput
+with the in-process RecipeStore. Results are checked to be identical.
+Speedups need as many free CPU cores as shards.
+
+Usage:
+    python -m benchmarks.bench_sharded_search [--size 1000000] [--shards 2,4]
+        [--queries 200] [--workdir DIR]
+"""
+import argparse
+import os
+import tempfile
+from core.performance import Timer
+from providers.fallback_shards import ShardedSearcher
+from providers.recipe_store import RecipeStore
+from benchmarks.bench_fallback_scaling import make_queries, percentile
+from benchmarks.synthetic_corpus import write_corpus
+
+
+def run(searcher, queries: list) -> tuple:
+    """Run all queries; returns (sorted latencies in ms, total seconds, result ids)"""
+    latencies = []
+    results = []
+    with Timer() as total:
+        for query in queries:
+            with Timer() as t:
+                results.append([r.id for r in searcher.search(**query)])
+            latencies.append(t.elapsed * 1000)
+    return sorted(latencies), total.elapsed, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--shards", type=str, default="2,4")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "recipe-finder-bench"))
+    args = parser.parse_args()
+    
+    os.makedirs(args.workdir, exist_ok=True)
+    data_path = os.path.join(args.workdir, f"synthetic_{args.size}.jsonl")
+    if not os.path.exists(data_path):
+        write_corpus(data_path, args.size)
+    queries = make_queries(args.queries)
+    
+    store = RecipeStore(data_path)
+    store.search(**queries[0])  # Load the index and build lazy structures
+    
+    print(f"{args.size} recipes, {len(queries)} queries, {os.cpu_count()} CPUs")
+    print(f"{'mode':<12} {'p50':>8} {'p95':>8} {'queries/s':>10}")
+    baseline, seconds, expected = run(store, queries)
+    print(f"{'in-process':<12} {percentile(baseline, 50):>6.1f}ms {percentile(baseline, 95):>6.1f}ms "
+          f"{len(queries) / seconds:>10.1f}")
+    
+    for shards in (int(s) for s in args.shards.split(",")):
+        with ShardedSearcher(store, shards) as searcher:
+            searcher.search(**queries[0])
+            latencies, seconds, results = run(searcher, queries)
+        assert results == expected, f"{shards} shards: results differ"
+        print(f"{f'{shards} shards':<12} {percentile(latencies, 50):>6.1f}ms {percentile(latencies, 95):>6.1f}ms "
+              f"{len(queries) / seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: full sort + slice vs. top-k selection
+
+Times sort_recipes(...)[:k] against sort_recipes(..., limit=k) (bounded
+heap) for every sort mode, and the same for the fallback engine's scored
+candidate tuples, on synthetic candidate lists of increasing size.
+Results are checked to be identical, including tie order.
+
+Usage:
+    python -m benchmarks.bench_top_k [--sizes 1000,100000,1000000] [--k 10]
+"""
+import argparse
+import heapq
+import random
+from core.model import Recipe, Provider
+from core.performance import Timer
+from core.sorters import sort_recipes
+from providers.recipe_index import candidate_sort_key
+
+SORT_MODES = ['relevance', 'match-desc', 'used-desc', 'missing-asc', 'time-asc', 'cost-asc']
+FALLBACK_MODES = ['relevance', 'used-desc', 'missing-asc', 'time-asc']
+
+
+def make_recipes(count: int, seed: int = 42) -> list:
+    """Synthetic search results with realistic used/missing/time spreads"""
+    rng = random.Random(seed)
+    # Share ingredient lists between recipes to keep memory reasonable at 1M
+    lists = [[f"ingredient {i}" for i in range(n)] for n in range(13)]
+    recipes = []
+    for i in range(count):
+        total = rng.randint(3, 12)
+        used = rng.randint(1, total)
+        recipes.append(Recipe(
+            id=str(i),
+            provider=Provider.THEMEALDB,
+            title="",
+            used_ingredients=lists[used],
+            missing_ingredients=lists[total - used],
+            ready_in_minutes=rng.choice((None, 5, 10, 15, 20, 25, 30, 40, 45, 60, 90)),
+            cost_per_serving_usd=rng.choice((None, round(rng.uniform(0.5, 8), 2)))
+        ))
+    return recipes
+
+
+def to_candidates(recipes: list) -> list:
+    """Fallback engine candidate tuples: (position, used, total, match %, time)"""
+    return [
+        (i, r.used_count, r.used_count + r.missing_count, r.match_percentage, r.ready_in_minutes)
+        for i, r in enumerate(recipes)
+    ]
+
+
+def report(size: int, label: str, full, top) -> None:
+    print(f"{size:>10} {label:<21} {full.elapsed * 1000:>8.1f}ms {top.elapsed * 1000:>8.1f}ms "
+          f"{full.elapsed / top.elapsed:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=str, default="1000,100000,1000000")
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+    
+    print(f"{'candidates':>10} {'sort_by':<21} {'full sort':>10} {'top-k':>10} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        recipes = make_recipes(size)
+        for mode in SORT_MODES:
+            with Timer() as full:
+                expected = sort_recipes(recipes, mode)[:args.k]
+            with Timer() as top:
+                result = sort_recipes(recipes, mode, limit=args.k)
+            assert [r.id for r in result] == [r.id for r in expected], mode
+            report(size, f"sorters {mode}", full, top)
+        
+        candidates = to_candidates(recipes)
+        del recipes
+        for mode in FALLBACK_MODES:
+            key = candidate_sort_key(mode)
+            with Timer() as full:
+                expected = sorted(candidates, key=key)[:args.k]
+            with Timer() as top:
+                result = heapq.nsmallest(args.k, candidates, key=key)
+            assert result == expected, mode
+            report(size, f"fallback {mode}", full, top)
+
+
+if __name__ == "__main__":
+    main()
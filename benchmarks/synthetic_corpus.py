@@ -0,0 +1,111 @@
+"""
+Deterministic synthetic recipe corpus generator
+
+Produces recipe data files (same JSON Lines format as
+providers/data/fallback_recipes.jsonl) of any size for scaling tests.
+Distributions follow the built-in recipes: each synthetic recipe starts
+from a randomly chosen built-in "prototype" (keeping its cuisine,
+categories and time range, and part of its ingredients, so realistic
+co-occurrence survives), then is filled up with ingredients drawn by
+their built-in frequency plus a long tail of variants ("smoked paprika",
+"fresh basil", ...). The same count and seed always give the same file.
+
+Usage:
+    python -m benchmarks.synthetic_corpus COUNT OUTPUT [--seed 0]
+"""
+import argparse
+import random
+from collections import Counter
+from typing import Iterator
+from providers.fallback_recipes import load_fallback_recipes
+from providers.recipe_store import write_recipe_file
+
+MODIFIERS = [
+    "fresh", "dried", "smoked", "ground", "chopped", "roasted", "organic", "frozen",
+    "toasted", "pickled", "sliced", "grated", "baby", "wild", "red", "green", "sweet",
+]
+DISHES = ["Bowl", "Stew", "Salad", "Bake", "Curry", "Skillet", "Soup", "Wrap", "Platter", "Stir-fry"]
+STYLES = ["Classic", "Quick", "Rustic", "Spicy", "Creamy", "Homestyle", "Herbed", "Zesty", "Smoky", "Golden"]
+
+# Share of filler ingredients drawn from the long tail of variants
+VARIANT_RATE = 0.25
+
+
+def generate_recipes(count: int, seed: int = 0) -> Iterator[dict]:
+    """
+    Generate synthetic recipes.
+    
+    Args:
+        count: Number of recipes
+        seed: Random seed (same seed and count -> same recipes)
+    
+    Yields:
+        Recipe dicts in the data file schema
+    """
+    rng = random.Random(seed)
+    prototypes = load_fallback_recipes()
+    frequencies = Counter(ing for recipe in prototypes for ing in recipe["ingredients"])
+    ingredients = sorted(frequencies)
+    weights = [frequencies[ing] for ing in ingredients]
+    all_categories = sorted({cat for recipe in prototypes for cat in recipe["category"]})
+    
+    for n in range(count):
+        proto = rng.choice(prototypes)
+        size = max(2, min(16, len(proto["ingredients"]) + rng.choice((-1, 0, 0, 1, 2, 3))))
+        
+        # Keep part of the prototype's ingredients, fill up by frequency
+        kept = [ing for ing in proto["ingredients"] if rng.random() < 0.6]
+        chosen = dict.fromkeys(kept[:size])
+        while len(chosen) < size:
+            ingredient = rng.choices(ingredients, weights)[0]
+            if rng.random() < VARIANT_RATE:
+                ingredient = f"{rng.choice(MODIFIERS)} {ingredient}"
+            chosen.setdefault(ingredient)
+        recipe_ings = list(chosen)
+        
+        categories = list(proto["category"])
+        if rng.random() < 0.3:
+            extra = rng.choice(all_categories)
+            if extra not in categories:
+                categories.append(extra)
+        
+        time = max(5, proto["time"] + rng.choice((-10, -5, 0, 0, 5, 10, 15)))
+        main = recipe_ings[0].title()
+        yield {
+            "id": f"synthetic_{n:07d}",
+            "title": f"{rng.choice(STYLES)} {proto['cuisine']} {main} {rng.choice(DISHES)}",
+            "cuisine": proto["cuisine"],
+            "category": categories,
+            "ingredients": recipe_ings,
+            "time": time,
+            "servings": proto["servings"],
+            "instructions": f"Prepare the {', '.join(recipe_ings[:3])}, then cook everything "
+                            f"together for about {time} minutes.",
+        }
+
+
+def write_corpus(path: str, count: int, seed: int = 0) -> None:
+    """
+    Write a synthetic corpus as a recipe data file.
+    
+    Args:
+        path: Output file path
+        count: Number of recipes
+        seed: Random seed
+    """
+    write_recipe_file(path, generate_recipes(count, seed), count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("count", type=int, help="Number of recipes")
+    parser.add_argument("output", help="Output data file (.jsonl)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    write_corpus(args.output, args.count, args.seed)
+    print(f"✓ Wrote {args.count} synthetic recipes -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
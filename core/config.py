@@ -2,6 +2,7 @@
 Fast mode configuration for Recipe Finder
 Use this for instant results without waiting for APIs
 """
+import os
 
 # Fast mode settings
 FAST_MODE = True  # Set to True for instant results
@@ -15,6 +16,27 @@ FAST_RATE_LIMIT = 0.05  # Minimal rate limiting
 # Cache settings
 FAST_CACHE_TTL = 7200  # 2 hours (longer cache for faster repeat searches)
 
+# Connection pre-warming (opt-in): open provider connections at startup
+PREWARM_CONNECTIONS = False
+
+# Local recipe search worker processes (0 = search in-process); only used
+# once the local corpus has at least SHARD_MIN_RECIPES recipes. Workers are
+# forked, which is only done on Linux (forking is unsafe on macOS) and only
+# while no other threads run - forking a threaded process such as the GUI
+# can deadlock the workers, so the GUI always searches in-process
+FALLBACK_SHARDS = 0
+SHARD_MIN_RECIPES = 100000
+
+# Directories holding user recipe packs (*.jsonl recipe data files, searched
+# together with the built-in recipes); RECIPE_PACK_PATH in the environment
+# adds more (separated like PATH)
+RECIPE_PACK_DIRS = []
+
+# Collapse near-duplicate recipes (the same dish from several providers or
+# recipe packs) in search results, keeping the best ranked copy; recipes
+# from the same source are never merged
+DEDUPLICATE_RESULTS = True
+
 def is_fast_mode():
     """Check if fast mode is enabled"""
     return FAST_MODE
@@ -30,3 +52,22 @@ def get_rate_limit():
 def should_skip_api():
     """Check if API calls should be skipped"""
     return SKIP_API_CALLS and FAST_MODE
+
+def should_prewarm():
+    """Check if provider connections should be pre-warmed at startup"""
+    return PREWARM_CONNECTIONS and not should_skip_api()
+
+def get_fallback_shards(recipe_count):
+    """Get the number of worker processes to search a local corpus with (0 = in-process)"""
+    if FALLBACK_SHARDS > 1 and recipe_count >= SHARD_MIN_RECIPES:
+        return FALLBACK_SHARDS
+    return 0
+
+def should_deduplicate():
+    """Check if near-duplicate recipes should be collapsed in search results"""
+    return DEDUPLICATE_RESULTS
+
+def get_recipe_pack_dirs():
+    """Get the directories to discover recipe packs in"""
+    env_dirs = [d for d in os.getenv("RECIPE_PACK_PATH", "").split(os.pathsep) if d]
+    return list(RECIPE_PACK_DIRS) + env_dirs
@@ -0,0 +1,144 @@
+"""Near-duplicate recipe detection across providers"""
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+from core.model import Recipe
+from core.similarity import LSHIndex, MinHasher, jaccard
+
+# Title words that do not tell dishes apart
+TITLE_STOPWORDS = {
+    "a", "an", "and", "the", "with", "of", "in", "on", "for", "my",
+    "easy", "quick", "simple", "best", "classic", "homemade", "recipe", "style",
+}
+
+# Title words naming a diet: "Vegan Thai Green Curry" is not a duplicate
+# of "Thai Green Curry", whatever their ingredients
+DIET_MARKERS = {
+    "vegan", "vegetarian", "veggie", "plant", "based", "keto", "ketogenic", "paleo", "gluten", "dairy",
+    "lactose", "sugar", "free", "low", "carb", "fat", "calorie", "halal", "kosher",
+    "pescatarian", "whole30", "healthy", "light", "lite", "skinny",
+}
+
+# Two recipes are the same dish when their title words and their ingredient
+# words are both at least this similar (Jaccard)
+TITLE_THRESHOLD = 0.75
+INGREDIENT_THRESHOLD = 0.4
+
+_MINHASHER = MinHasher()
+
+def _words(text: str) -> List[str]:
+    """Lowercase words, with simple plurals folded ("tomatoes" -> "tomato")"""
+    words = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if len(word) > 4 and word.endswith("oes"):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+def title_tokens(title: str) -> Tuple[str, ...]:
+    """
+    Canonical title: the significant words, sorted.
+    
+    Args:
+        title: Recipe title
+    
+    Returns:
+        Sorted tuple of words ("Easy Chicken Tikka Masala!" and
+        "chicken tikka masala" give the same tuple)
+    """
+    return tuple(sorted({word for word in _words(title) if word not in TITLE_STOPWORDS}))
+
+def ingredient_words(recipe: Recipe) -> Set[str]:
+    """Words of a recipe's ingredient names (providers name ingredients differently,
+    e.g. "chicken breasts" vs "chicken", so words compare better than names)"""
+    names = [item.name for item in recipe.ingredients] or recipe.used_ingredients + recipe.missing_ingredients
+    return {word for name in names for word in _words(name)}
+
+def _marker_words(recipe: Recipe) -> Set[str]:
+    """Title words that make a recipe a variant: diet words and the words of its categories"""
+    return DIET_MARKERS.union(*(_words(category) for category in recipe.category_or_diet))
+
+class _Signature(NamedTuple):
+    """What a recipe is compared by"""
+    source: tuple
+    title: Set[str]
+    ingredients: Set[str]
+    markers: Set[str]
+
+def _signature(recipe: Recipe) -> _Signature:
+    """A recipe's source, canonical title words, ingredient words and marker words"""
+    return _Signature((recipe.provider, recipe.source), set(title_tokens(recipe.title)), ingredient_words(recipe),
+                      _marker_words(recipe))
+
+def _same_dish(a: _Signature, b: _Signature) -> bool:
+    """
+    Check whether two recipes are one dish from two different sources.
+    
+    Recipes of one source (one provider, or one local data file) are
+    always distinct dishes, and so are titles that differ by a diet or
+    category word; otherwise titles and ingredient words must be similar
+    enough.
+    """
+    if a.source == b.source:
+        return False
+    if (a.title ^ b.title) & (a.markers | b.markers):
+        return False
+    if jaccard(a.title, b.title) < TITLE_THRESHOLD:
+        return False
+    if a.ingredients and b.ingredients:
+        return jaccard(a.ingredients, b.ingredients) >= INGREDIENT_THRESHOLD
+    # Without ingredients to compare, only identical titles match
+    return a.title == b.title
+
+def deduplicate_recipes(recipes: List[Recipe]) -> List[Recipe]:
+    """
+    Collapse near-duplicate recipes, e.g. the same dish from two providers.
+    
+    See iter_unique_recipes; this is its list form.
+    
+    Args:
+        recipes: Recipes in ranked order
+    
+    Returns:
+        The first, best ranked recipe of each dish, in ranked order
+    """
+    return list(iter_unique_recipes(recipes))
+
+def iter_unique_recipes(recipes: Iterable[Recipe]) -> Iterator[Recipe]:
+    """
+    Drop near-duplicates from a stream of ranked recipes, lazily.
+    
+    Each recipe's signature is its canonical title words plus a MinHash of
+    its ingredient words. Possible duplicates are only looked up among the
+    recipes already yielded, in a bucket of identical canonical titles and
+    in the ingredient LSH buckets, so the pass is linear in the number of
+    recipes and results can be consumed page by page. A duplicate is
+    dropped in favour of the better ranked recipe, so a list search and a
+    paged search keep the same records.
+    
+    Args:
+        recipes: Recipes in ranked order (e.g. a lazy search result stream)
+    
+    Yields:
+        The first recipe of each dish, in ranked order
+    """
+    kept: List[_Signature] = []
+    by_title: Dict[tuple, List[int]] = {}
+    lsh = LSHIndex()
+    for recipe in recipes:
+        signature = _signature(recipe)
+        title = tuple(sorted(signature.title))
+        candidates = set(by_title.get(title, ()))
+        minhash = None
+        if signature.ingredients:
+            minhash = _MINHASHER.signature(signature.ingredients)
+            candidates.update(lsh.candidates(minhash))
+        if any(_same_dish(signature, kept[other]) for other in candidates):
+            continue
+        
+        by_title.setdefault(title, []).append(len(kept))
+        if minhash is not None:
+            lsh.add(len(kept), minhash)
+        kept.append(signature)
+        yield recipe
@@ -1,9 +1,9 @@
 """Export recipes to various formats"""
-import json
 import csv
 from typing import List
 from pathlib import Path
 from core.model import Recipe
+from core.performance import json_dumps
 
 def export_to_json(recipes: List[Recipe], filepath: str) -> None:
     """
@@ -19,7 +19,7 @@ def export_to_json(recipes: List[Recipe], filepath: str) -> None:
     }
     
     with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write(json_dumps(data, indent=2))
     
     print(f"✓ Exported {len(recipes)} recipes to {filepath}")
 
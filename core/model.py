@@ -40,6 +40,8 @@ class Recipe:
     cuisine: Optional[str] = None
     category_or_diet: List[str] = field(default_factory=list)
     cost_per_serving_usd: Optional[float] = None
+    # Where the provider got the recipe (e.g. a local recipe data file)
+    source: Optional[str] = None
     
     @property
     def used_count(self) -> int:
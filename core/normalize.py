@@ -1,6 +1,6 @@
 """Ingredient normalization utilities"""
 import re
-from typing import List, Set
+from typing import List, Set, Tuple
 from core.performance import memoize
 
 @memoize
@@ -54,6 +54,43 @@ def normalize_for_themealdb(ingredient: str) -> str:
     """
     return ingredient.replace(' ', '_')
 
+# Words too common in recipe text to help a full-text search
+TEXT_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "of", "on", "or", "the", "then", "to", "until", "with",
+})
+
+def tokenize_text(text: str) -> List[str]:
+    """
+    Split free text (titles, instructions) into full-text search tokens.
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        Lowercase words in order, stopwords removed
+    """
+    if not text:
+        return []
+    return [word for word in re.findall(r'[^\W_]+', text.lower()) if word not in TEXT_STOPWORDS]
+
+def parse_text_query(query: str) -> List[Tuple[str, bool]]:
+    """
+    Parse a full-text query; a trailing * makes a word a prefix ("curr*").
+    
+    Args:
+        query: Raw query (e.g., "spicy curr*")
+    
+    Returns:
+        List of unique (token, is_prefix) pairs in query order
+    """
+    terms = []
+    for word, star in re.findall(r'([^\W_]+)(\*?)', (query or "").lower()):
+        term = (word, bool(star))
+        if word not in TEXT_STOPWORDS and term not in terms:
+            terms.append(term)
+    return terms
+
 def normalize_ingredient_name(name: str) -> str:
     """
     Normalize ingredient name for comparison (lowercase, no extra spaces).
@@ -141,6 +178,69 @@ def find_matching_ingredients(
     
     return used, missing
 
+class IngredientMatcher:
+    """
+    Pre-compiled matcher for a fixed set of user ingredients.
+    
+    Applies the same rules as ingredients_match (exact, containment,
+    trailing-'s' plural) but normalizes the user side once and remembers
+    each recipe ingredient it has seen, so matching a batch of recipes
+    costs one check per distinct ingredient instead of one per pair.
+    """
+    
+    def __init__(self, user_ingredients: List[str]):
+        self.user_ingredients = list(user_ingredients)
+        self._user_norms = tuple(
+            (norm, norm.rstrip('s'))
+            for norm in (normalize_ingredient_name(ing) for ing in self.user_ingredients)
+        )
+        self._seen: dict = {}
+    
+    def matches(self, recipe_ingredient: str) -> bool:
+        """
+        Check whether any user ingredient matches a recipe ingredient.
+        
+        Args:
+            recipe_ingredient: Raw recipe ingredient name
+        
+        Returns:
+            True if at least one user ingredient matches
+        """
+        result = self._seen.get(recipe_ingredient)
+        if result is None:
+            norm = normalize_ingredient_name(recipe_ingredient)
+            stem = norm.rstrip('s')
+            result = any(
+                user_norm == norm or user_norm in norm or norm in user_norm or user_stem == stem
+                for user_norm, user_stem in self._user_norms
+            )
+            self._seen[recipe_ingredient] = result
+        return result
+    
+    def split(self, recipe_ingredients: List[str]) -> tuple[List[str], List[str]]:
+        """
+        Separate recipe ingredients into used and missing.
+        
+        Equivalent to find_matching_ingredients for this matcher's user ingredients.
+        
+        Args:
+            recipe_ingredients: All ingredients in the recipe
+        
+        Returns:
+            Tuple of (used_ingredients, missing_ingredients)
+        """
+        used = []
+        missing = []
+        matches = self.matches
+        
+        for recipe_ing in recipe_ingredients:
+            if matches(recipe_ing):
+                used.append(recipe_ing)
+            else:
+                missing.append(recipe_ing)
+        
+        return used, missing
+
 def deduplicate_ingredients(ingredients: List[str]) -> List[str]:
     """
     Remove duplicate ingredients while preserving order.
@@ -1,9 +1,32 @@
 """Recipe search orchestrator - routes to appropriate providers"""
 import os
-from typing import List, Optional
+from itertools import islice
+from typing import Iterator, List, Optional
+from core.dedup import deduplicate_recipes, iter_unique_recipes
 from core.model import Recipe
 from core.normalize import parse_ingredients
-from core.sorters import sort_recipes, filter_by_max_cost, filter_by_max_time
+from core.pagination import SearchPage, open_cursor, resume_cursor
+from core.sorters import sort_recipes, filter_by_max_cost, filter_by_max_time, filter_by_max_missing, filter_by_query
+from core.performance import prewarm_connections
+
+def _should_deduplicate() -> bool:
+    """Check the config switch for collapsing near-duplicate results (on if config is unavailable)"""
+    try:
+        from core.config import should_deduplicate as configured
+    except ImportError:
+        return True
+    return configured()
+
+def _should_skip_api() -> bool:
+    """Check the config switch for fast mode (local recipes only; off if config is unavailable)"""
+    try:
+        from core.config import should_skip_api
+    except ImportError:
+        return False  # Config not available, proceed normally
+    return should_skip_api()
+
+# Recipes requested from an API provider to back a paged search
+CURSOR_API_RESULTS = 50
 
 class RecipeOrchestrator:
     """Orchestrates recipe search across different providers"""
@@ -26,7 +49,9 @@ class RecipeOrchestrator:
         max_minutes: Optional[int] = None,
         max_cost: Optional[float] = None,
         exclude: Optional[List[str]] = None,
-        sort_by: str = "used-desc"
+        sort_by: str = "used-desc",
+        max_missing: Optional[int] = None,
+        query: Optional[str] = None
     ) -> List[Recipe]:
         """
         Search for recipes using the configured provider.
@@ -40,23 +65,146 @@ class RecipeOrchestrator:
             max_cost: Maximum cost per serving (USD)
             exclude: Ingredients to exclude
             sort_by: How to sort results
+            max_missing: Only return recipes missing at most this many ingredients
+            query: Free-text query ("spicy curry"); only recipes whose title,
+                   instructions, cuisine or categories contain every word are
+                   returned. Without ingredients, the local recipes are
+                   ranked by relevance to the query
         
         Returns:
             List of Recipe objects
         """
         if not ingredients:
-            return []
+            if not query:
+                return []
+            # Providers search by ingredient; free text alone uses the local full-text index
+            return self._search_local([], max_results, diet, max_minutes, sort_by, exclude, max_missing, query)
         
         # Check if we should use fast mode (fallback only)
-        try:
-            from core.config import should_skip_api
-            if should_skip_api():
-                print("⚡ Fast mode: Using local recipe database")
-                from providers.fallback_recipes import search_fallback_recipes
-                return search_fallback_recipes(ingredients, max_results, diet, max_minutes, sort_by)
-        except ImportError:
-            pass  # Config not available, proceed normally
+        if _should_skip_api():
+            print("⚡ Fast mode: Using local recipe database")
+            return self._search_local(ingredients, max_results, diet, max_minutes, sort_by, exclude,
+                                      max_missing, query)
+        
+        recipes = self._search_provider(ingredients, max_results, diet, health, max_minutes, max_cost, exclude,
+                                        max_missing, query)
+        
+        # If no results, try fallback recipes
+        if not recipes:
+            # Note: Fallback recipes are already pre-filtered and sorted
+            return self._search_local(ingredients, max_results, diet, max_minutes, sort_by, exclude,
+                                      max_missing, query)
+        
+        # Sort results (top-k selection - only max_results are returned)
+        return self._rank_provider_results(recipes, max_minutes, max_cost, sort_by, limit=max_results)
+    
+    def iter_search(
+        self,
+        ingredients: List[str],
+        diet: Optional[str] = None,
+        health: Optional[List[str]] = None,
+        max_minutes: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        exclude: Optional[List[str]] = None,
+        sort_by: str = "used-desc",
+        max_missing: Optional[int] = None,
+        query: Optional[str] = None,
+        max_results: Optional[int] = None
+    ) -> Iterator[Recipe]:
+        """
+        Yield search results lazily, in ranked order.
         
+        Nothing is searched until the first result is requested. Local
+        results stream from a ranking computed once (see
+        providers.fallback_recipes.iter_fallback_recipes), so reading more
+        of them never repeats the search and Recipe objects are only built
+        for results actually read. API providers return one batch, which is
+        ranked once and then yielded.
+        
+        Args:
+            Same as search, except:
+            max_results: Maximum number of results (None for every local
+                         match); API providers are asked for this many
+                         recipes (default: CURSOR_API_RESULTS)
+        
+        Yields:
+            Recipe objects, best first
+        """
+        if not ingredients and not query:
+            return
+        if not ingredients or _should_skip_api():
+            yield from self._iter_local(ingredients or [], max_results, diet, max_minutes, sort_by, exclude,
+                                        max_missing, query)
+            return
+        
+        recipes = self._search_provider(ingredients, max_results or CURSOR_API_RESULTS, diet, health, max_minutes,
+                                        max_cost, exclude, max_missing, query)
+        if not recipes:
+            yield from self._iter_local(ingredients, max_results, diet, max_minutes, sort_by, exclude, max_missing,
+                                        query)
+            return
+        yield from self._rank_provider_results(recipes, max_minutes, max_cost, sort_by, limit=max_results)
+    
+    def search_page(
+        self,
+        ingredients: Optional[List[str]] = None,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        diet: Optional[str] = None,
+        health: Optional[List[str]] = None,
+        max_minutes: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        exclude: Optional[List[str]] = None,
+        sort_by: str = "used-desc",
+        max_missing: Optional[int] = None,
+        query: Optional[str] = None
+    ) -> SearchPage:
+        """
+        Get one page of results, with a cursor for the next page.
+        
+        The first call (no cursor) opens a cursor over iter_search; later
+        calls pass the returned cursor and continue from the retained
+        results and ranking instead of searching again. Page tokens can be
+        reused, e.g. to show a page again.
+        
+        Usage:
+            page = orchestrator.search_page(["eggs", "rice"], page_size=10)
+            while page.has_more:
+                page = orchestrator.search_page(cursor=page.cursor, page_size=10)
+        
+        Args:
+            ingredients: List of ingredient names (ignored with a cursor)
+            page_size: Results per page
+            cursor: Token from a previous SearchPage.cursor, or None to start
+            Other arguments: Same as search (ignored with a cursor - a cursor
+                             keeps the filters it was opened with)
+        
+        Returns:
+            SearchPage (its cursor is None after the last page)
+        
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        if cursor is None:
+            results = self.iter_search(ingredients, diet, health, max_minutes, max_cost, exclude, sort_by,
+                                       max_missing, query)
+            return open_cursor(results).page(0, page_size)
+        search_cursor, offset = resume_cursor(cursor)
+        return search_cursor.page(offset, page_size)
+    
+    def _search_provider(
+        self,
+        ingredients: List[str],
+        max_results: int,
+        diet: Optional[str],
+        health: Optional[List[str]],
+        max_minutes: Optional[int],
+        max_cost: Optional[float],
+        exclude: Optional[List[str]],
+        max_missing: Optional[int],
+        query: Optional[str]
+    ) -> List[Recipe]:
+        """Search the configured provider and drop the recipes it cannot filter out itself"""
         # Route to appropriate provider
         if self.provider == "themealdb":
             recipes = self._search_themealdb(ingredients, max_results)
@@ -71,13 +219,22 @@ class RecipeOrchestrator:
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
         
-        # If no results, try fallback recipes
-        if not recipes:
-            from providers.fallback_recipes import search_fallback_recipes
-            recipes = search_fallback_recipes(ingredients, max_results, diet, max_minutes, sort_by)
-            # Note: Fallback recipes are already pre-filtered and sorted
-            return recipes
+        if max_missing is not None:
+            recipes = filter_by_max_missing(recipes, max_missing)
         
+        if query:
+            recipes = filter_by_query(recipes, query)
+        return recipes
+    
+    def _rank_provider_results(
+        self,
+        recipes: List[Recipe],
+        max_minutes: Optional[int],
+        max_cost: Optional[float],
+        sort_by: str,
+        limit: Optional[int] = None
+    ) -> List[Recipe]:
+        """Filter, deduplicate and sort provider results (only the best limit, if given)"""
         # Apply filters
         if max_cost is not None and self.provider == "spoonacular":
             recipes = filter_by_max_cost(recipes, max_cost)
@@ -85,10 +242,61 @@ class RecipeOrchestrator:
         if max_minutes is not None:
             recipes = filter_by_max_time(recipes, max_minutes)
         
-        # Sort results
-        recipes = sort_recipes(recipes, sort_by)
+        # Collapse the same dish returned more than once, keeping its best
+        # ranked copy (as the streamed search does)
+        if _should_deduplicate():
+            return list(islice(iter_unique_recipes(sort_recipes(recipes, sort_by)), limit))
+        
+        return sort_recipes(recipes, sort_by, limit=limit)
+    
+    def _search_local(
+        self,
+        ingredients: List[str],
+        max_results: int,
+        diet: Optional[str],
+        max_minutes: Optional[int],
+        sort_by: str,
+        exclude: Optional[List[str]],
+        max_missing: Optional[int],
+        query: Optional[str] = None
+    ) -> List[Recipe]:
+        """
+        Search the local recipes (built-in and recipe packs).
         
-        return recipes[:max_results]
+        With deduplication on, twice as many recipes are fetched, and the
+        fetch keeps doubling until collapsing duplicates leaves the requested
+        number of results (or every match has been fetched).
+        """
+        from providers.fallback_recipes import search_fallback_recipes
+        if not _should_deduplicate():
+            return search_fallback_recipes(ingredients, max_results, diet, max_minutes, sort_by, exclude,
+                                           max_missing, query)
+        fetch = max_results * 2
+        while True:
+            recipes = search_fallback_recipes(ingredients, fetch, diet, max_minutes, sort_by, exclude,
+                                              max_missing, query)
+            unique = deduplicate_recipes(recipes)
+            if len(unique) >= max_results or len(recipes) < fetch:
+                return unique[:max_results]
+            fetch *= 2
+    
+    def _iter_local(
+        self,
+        ingredients: List[str],
+        max_results: Optional[int],
+        diet: Optional[str],
+        max_minutes: Optional[int],
+        sort_by: str,
+        exclude: Optional[List[str]],
+        max_missing: Optional[int],
+        query: Optional[str]
+    ) -> Iterator[Recipe]:
+        """Stream the local recipes in ranked order (near-duplicates dropped as they come)"""
+        from providers.fallback_recipes import iter_fallback_recipes
+        recipes = iter_fallback_recipes(ingredients, diet, max_minutes, sort_by, exclude, max_missing, query)
+        if _should_deduplicate():
+            recipes = iter_unique_recipes(recipes)
+        return islice(recipes, max_results)
     
     def _search_themealdb(
         self,
@@ -185,7 +393,9 @@ def search_recipes(
     max_minutes: Optional[int] = None,
     max_cost: Optional[float] = None,
     exclude_str: Optional[str] = None,
-    sort_by: str = "used-desc"
+    sort_by: str = "used-desc",
+    max_missing: Optional[int] = None,
+    query: Optional[str] = None
 ) -> List[Recipe]:
     """
     Main entry point for recipe search.
@@ -200,6 +410,8 @@ def search_recipes(
         max_cost: Maximum cost per serving
         exclude_str: Comma-separated ingredients to exclude
         sort_by: Sort method
+        max_missing: Only return recipes missing at most this many ingredients
+        query: Free-text query over titles, instructions, cuisines and categories
     
     Returns:
         List of Recipe objects
@@ -218,5 +430,37 @@ def search_recipes(
         max_minutes=max_minutes,
         max_cost=max_cost,
         exclude=exclude,
-        sort_by=sort_by
+        sort_by=sort_by,
+        max_missing=max_missing,
+        query=query
     )
+
+
+def prewarm_providers(provider: str = "themealdb"):
+    """
+    Pre-warm pooled HTTP connections for a provider in the background.
+    
+    Only providers that can actually be queried are warmed: nothing
+    happens in fast mode, and key-based providers need credentials.
+    
+    Args:
+        provider: Provider that searches will use
+    
+    Returns:
+        The warmup thread, or None if there was nothing to warm
+    """
+    from core.config import should_skip_api
+    if should_skip_api():
+        return None
+    
+    provider = provider.lower()
+    if provider == "themealdb":
+        from providers.themealdb import WARMUP_URL
+    elif provider == "spoonacular" and os.getenv("SPOONACULAR_API_KEY"):
+        from providers.spoonacular import WARMUP_URL
+    elif provider == "edamam" and os.getenv("EDAMAM_APP_ID") and os.getenv("EDAMAM_APP_KEY"):
+        from providers.edamam import WARMUP_URL
+    else:
+        return None
+    
+    return prewarm_connections({provider: WARMUP_URL})
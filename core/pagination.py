@@ -0,0 +1,122 @@
+"""Resumable cursors over lazily ranked search results"""
+import threading
+import uuid
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+from core.model import Recipe
+from core.performance import LRUCache
+
+# Open cursors kept for resuming; the least recently used are dropped first
+CURSOR_CACHE_SIZE = 64
+
+@dataclass
+class SearchPage:
+    """One page of search results and the cursor for the next page"""
+    recipes: List[Recipe] = field(default_factory=list)
+    cursor: Optional[str] = None
+    
+    @property
+    def has_more(self) -> bool:
+        """True if another page can be fetched with cursor"""
+        return self.cursor is not None
+
+class SearchCursor:
+    """
+    A ranked result stream and the results already read from it.
+    
+    Results are pulled from the stream only as pages ask for them and kept,
+    so every page token stays valid: asking for an earlier page again
+    returns the same recipes without searching again.
+    """
+    
+    def __init__(self, results: Iterator[Recipe]):
+        """
+        Args:
+            results: Recipes in ranked order (e.g. a lazy search generator)
+        """
+        self.id = uuid.uuid4().hex
+        self._results = results
+        self._read: List[Recipe] = []
+        self._exhausted = False
+        self._lock = threading.Lock()
+    
+    def fetch(self, offset: int, count: int) -> List[Recipe]:
+        """
+        Get results [offset, offset + count), reading the stream as far as needed.
+        
+        Args:
+            offset: Index of the first result
+            count: Number of results
+        
+        Returns:
+            Up to count recipes (fewer at the end of the results)
+        """
+        with self._lock:
+            missing = offset + count - len(self._read)
+            if missing > 0 and not self._exhausted:
+                self._read.extend(islice(self._results, missing))
+                self._exhausted = len(self._read) < offset + count
+            return self._read[offset:offset + count]
+    
+    def page(self, offset: int, page_size: int) -> SearchPage:
+        """
+        Get a page and the token of the page after it.
+        
+        Args:
+            offset: Index of the page's first result
+            page_size: Results per page
+        
+        Returns:
+            SearchPage (cursor is None after the last page)
+        """
+        # Read one result ahead to know whether there is a next page
+        recipes = self.fetch(offset, page_size + 1)
+        has_more = len(recipes) > page_size
+        return SearchPage(recipes[:page_size], self.token(offset + page_size) if has_more else None)
+    
+    def token(self, offset: int) -> str:
+        """Opaque token resuming this cursor at offset"""
+        return f"{self.id}:{offset}"
+
+_cursors = LRUCache(CURSOR_CACHE_SIZE)
+
+def open_cursor(results: Iterator[Recipe]) -> SearchCursor:
+    """
+    Register a result stream so its pages can be fetched by token.
+    
+    Args:
+        results: Recipes in ranked order
+    
+    Returns:
+        New SearchCursor
+    """
+    cursor = SearchCursor(results)
+    _cursors.put(cursor.id, cursor)
+    return cursor
+
+def resume_cursor(token: str) -> Tuple[SearchCursor, int]:
+    """
+    Find the cursor and offset a page token refers to.
+    
+    Args:
+        token: Token from SearchPage.cursor
+    
+    Returns:
+        Tuple of (cursor, offset)
+    
+    Raises:
+        ValueError: If the token is malformed, or its cursor has expired
+                    (more than CURSOR_CACHE_SIZE searches were opened since)
+    """
+    cursor_id, _, offset = (token or "").partition(":")
+    if not offset.isdigit():
+        raise ValueError(f"Invalid cursor: {token!r}")
+    cursor = _cursors.get(cursor_id)
+    if cursor is None:
+        raise ValueError("Cursor expired - start a new search")
+    return cursor, int(offset)
+
+def close_cursor(token: str) -> None:
+    """Forget a cursor (its retained results are freed)"""
+    _cursors.pop((token or "").partition(":")[0])
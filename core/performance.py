@@ -1,12 +1,14 @@
 """
 Performance optimization utilities for Recipe Finder
-Includes caching, connection pooling, and performance helpers
+Includes caching, connection pooling, JSON codecs, and performance helpers
 """
 
 import time
 import hashlib
 import json
-from typing import Any, Callable, Optional, Dict
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Dict
 from functools import wraps
 from datetime import datetime, timedelta
 
@@ -170,6 +172,7 @@ def benchmark(func: Callable) -> Callable:
 
 # Session pooling for HTTP requests
 _http_session_pool: Dict[str, Any] = {}
+_http_session_lock = threading.Lock()
 
 
 def get_http_session(provider: str):
@@ -185,26 +188,54 @@ def get_http_session(provider: str):
     """
     import requests
     
-    if provider not in _http_session_pool:
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'RecipeFinder/1.0',
-            'Connection': 'keep-alive'
-        })
-        
-        # Configure connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=20,
-            max_retries=2,
-            pool_block=False
-        )
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
+    with _http_session_lock:
+        if provider not in _http_session_pool:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'RecipeFinder/1.0',
+                'Connection': 'keep-alive'
+            })
+            
+            # Configure connection pooling
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=2,
+                pool_block=False
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            
+            _http_session_pool[provider] = session
         
-        _http_session_pool[provider] = session
+        return _http_session_pool[provider]
+
+
+def prewarm_connections(targets: Dict[str, str], timeout: float = 3.0) -> threading.Thread:
+    """
+    Open pooled connections to providers in a background thread.
+    
+    Sends a cheap request to each URL through the provider's pooled
+    session, so DNS lookup and TCP/TLS handshakes are done before the
+    first real search. Failures are ignored - warming is best effort.
     
-    return _http_session_pool[provider]
+    Args:
+        targets: Mapping of provider name to a cheap URL to request
+        timeout: Per-request timeout in seconds
+    
+    Returns:
+        The started (daemon) thread
+    """
+    def warm():
+        for provider, url in targets.items():
+            try:
+                get_http_session(provider).head(url, timeout=timeout, allow_redirects=False)
+            except Exception:
+                pass  # The real request will report any problem
+    
+    thread = threading.Thread(target=warm, name="connection-prewarm", daemon=True)
+    thread.start()
+    return thread
 
 
 def close_all_sessions():
@@ -215,6 +246,137 @@ def close_all_sessions():
     _http_session_pool.clear()
 
 
+# Pluggable JSON codec (orjson > ujson > stdlib json)
+def _stdlib_loads(data):
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj, indent: Optional[int] = None) -> str:
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+_json_codecs: Dict[str, tuple[Callable, Callable]] = {
+    "json": (_stdlib_loads, _stdlib_dumps)
+}
+
+try:
+    import orjson as _orjson
+    
+    def _orjson_dumps(obj, indent: Optional[int] = None) -> str:
+        # orjson only supports 2-space indentation
+        option = _orjson.OPT_INDENT_2 if indent else 0
+        return _orjson.dumps(obj, option=option).decode("utf-8")
+    
+    _json_codecs["orjson"] = (_orjson.loads, _orjson_dumps)
+except ImportError:
+    pass
+
+try:
+    import ujson as _ujson
+    
+    def _ujson_dumps(obj, indent: Optional[int] = None) -> str:
+        # ujson escapes "/" by default; match stdlib output (plain URLs)
+        return _ujson.dumps(obj, indent=indent or 0, ensure_ascii=False, escape_forward_slashes=False)
+    
+    _json_codecs["ujson"] = (_ujson.loads, _ujson_dumps)
+except ImportError:
+    pass
+
+_json_backend = next(name for name in ("orjson", "ujson", "json") if name in _json_codecs)
+
+
+def register_json_codec(name: str, loads: Callable, dumps: Callable) -> None:
+    """
+    Register a JSON codec that can be selected with set_json_backend.
+    
+    Args:
+        name: Codec name
+        loads: Function decoding str/bytes into Python objects
+        dumps: Function encoding an object to str, accepting an indent argument
+    """
+    _json_codecs[name] = (loads, dumps)
+
+
+def set_json_backend(name: str) -> None:
+    """
+    Select the JSON codec used by json_loads/json_dumps.
+    
+    Args:
+        name: Registered codec name ("orjson", "ujson", "json", ...)
+    
+    Raises:
+        ValueError: If the codec is not installed/registered
+    """
+    global _json_backend
+    if name not in _json_codecs:
+        raise ValueError(
+            f"JSON backend '{name}' not available (installed: {', '.join(available_json_backends())})"
+        )
+    _json_backend = name
+
+
+def get_json_backend() -> str:
+    """Get the name of the active JSON codec"""
+    return _json_backend
+
+
+def available_json_backends() -> list:
+    """Get names of all usable JSON codecs"""
+    return list(_json_codecs)
+
+
+def json_loads(data):
+    """
+    Decode JSON text or bytes with the active codec.
+    
+    Args:
+        data: JSON document as str or bytes
+    
+    Returns:
+        Decoded Python object
+    
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    return _json_codecs[_json_backend][0](data)
+
+
+def json_dumps(obj, indent: Optional[int] = None) -> str:
+    """
+    Encode an object as JSON text with the active codec.
+    
+    Non-ASCII characters are written as-is (UTF-8), matching
+    json.dumps(..., ensure_ascii=False).
+    
+    Args:
+        obj: Object to encode
+        indent: Pretty-print indentation (None for compact output)
+    
+    Returns:
+        JSON string
+    """
+    return _json_codecs[_json_backend][1](obj, indent)
+
+
+def decode_json_response(response):
+    """
+    Decode an HTTP response body with the active JSON codec.
+    
+    Drop-in replacement for response.json() that skips the text
+    decoding step and hands raw bytes to the fast decoders.
+    
+    Args:
+        response: requests.Response object
+    
+    Returns:
+        Decoded JSON body
+    
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    return json_loads(response.content)
+
+
 # Memoization for expensive pure functions
 def memoize(func: Callable) -> Callable:
     """
@@ -239,6 +401,88 @@ def memoize(func: Callable) -> Callable:
     return wrapper
 
 
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache.
+    
+    Usage:
+        cache = LRUCache(maxsize=256)
+        value = cache.get(key)
+        if value is None:
+            value = cache.put(key, compute(key))
+    """
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None, usable: Callable[[Any], bool] = None) -> Any:
+        """
+        Get a value, marking it most recently used.
+        
+        Args:
+            key: Cache key
+            default: Returned (and counted as a miss) if the key is absent
+            usable: Optional check; entries failing it are treated as absent
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if usable is not None and not usable(value):
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any) -> Any:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry (not counted as a hit or miss), returning its value or default"""
+        with self._lock:
+            return self._data.pop(key, default)
+    
+    def clear(self) -> None:
+        """Remove all entries and reset statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, size, hit rate (same shape as get_cache_stats)
+        """
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total > 0 else 0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_rate": f"{hit_rate:.1f}%",
+            "total_requests": total
+        }
+
+
 # Lazy evaluation helper
 class LazyProperty:
     """
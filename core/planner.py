@@ -0,0 +1,140 @@
+"""Meal planning - pick several recipes that share their missing ingredients"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from core.model import Recipe
+from core.normalize import normalize_ingredient_name
+
+# Default size of the candidate pool and of the search beam; both keep a
+# weekly plan over the local corpus in the tens of milliseconds
+PLAN_POOL_SIZE = 200
+PLAN_BEAM_WIDTH = 32
+
+@dataclass
+class MealPlan:
+    """Recipes chosen together and the combined shopping list"""
+    recipes: List[Recipe] = field(default_factory=list)
+    shopping_list: List[Tuple[str, int]] = field(default_factory=list)
+    
+    @property
+    def missing_count(self) -> int:
+        """Number of distinct ingredients to buy"""
+        return len(self.shopping_list)
+
+def _bit_count(mask: int) -> int:
+    """Number of set bits (int.bit_count needs Python 3.10)"""
+    return bin(mask).count("1")
+
+def shopping_list(recipes: List[Recipe]) -> List[Tuple[str, int]]:
+    """
+    Aggregate the missing ingredients of several recipes.
+    
+    Args:
+        recipes: Recipes to cook
+    
+    Returns:
+        List of (ingredient, number of recipes needing it), most needed
+        first, then alphabetically
+    """
+    counts: Dict[str, int] = {}
+    names: Dict[str, str] = {}
+    for recipe in recipes:
+        seen = set()
+        for name in recipe.missing_ingredients:
+            ingredient = normalize_ingredient_name(name)
+            if ingredient not in seen:
+                seen.add(ingredient)
+                names.setdefault(ingredient, name)
+                counts[ingredient] = counts.get(ingredient, 0) + 1
+    return sorted(((names[ingredient], count) for ingredient, count in counts.items()),
+                  key=lambda item: (-item[1], item[0].lower()))
+
+def plan_meals(recipes: List[Recipe], count: int, beam_width: int = PLAN_BEAM_WIDTH) -> MealPlan:
+    """
+    Choose `count` recipes whose combined shopping list is as short as possible.
+    
+    Picking the set with the fewest distinct missing ingredients is a set
+    cover style problem, so this runs a beam search: each step extends the
+    best `beam_width` partial plans by one more recipe and keeps the best
+    of the results (beam_width=1 is plain greedy). Missing ingredients are
+    bit masks, so growing a plan is an OR and scoring it a popcount.
+    
+    Args:
+        recipes: Candidate recipes (with missing_ingredients filled in, as
+                 returned by a search); repeated titles are only used once
+        count: Number of recipes to choose
+        beam_width: Partial plans kept per step
+    
+    Returns:
+        MealPlan with the chosen recipes, in pick order, and their shopping list
+    """
+    # The same dish twice in one plan is not a plan; keep the first of each title
+    titles = set()
+    unique = []
+    for recipe in recipes:
+        title = recipe.title.strip().lower()
+        if title not in titles:
+            titles.add(title)
+            unique.append(recipe)
+    recipes = unique
+    
+    count = min(count, len(recipes))
+    if count <= 0:
+        return MealPlan()
+    
+    bits: Dict[str, int] = {}
+    masks = []
+    for recipe in recipes:
+        mask = 0
+        for name in recipe.missing_ingredients:
+            mask |= 1 << bits.setdefault(normalize_ingredient_name(name), len(bits))
+        masks.append(mask)
+    sizes = [_bit_count(mask) for mask in masks]
+    
+    # Each state is (ingredients to buy, recipe missing counts summed,
+    # chosen positions in pick order, missing mask); ties go to plans whose
+    # recipes each need less, then to earlier candidates
+    beam = [(0, 0, (), 0)]
+    for _ in range(count):
+        expanded = {}
+        for _, missing_sum, chosen, mask in beam:
+            taken = set(chosen)
+            for position, recipe_mask in enumerate(masks):
+                if position in taken:
+                    continue
+                combined = mask | recipe_mask
+                plan = (_bit_count(combined), missing_sum + sizes[position], chosen + (position,), combined)
+                key = frozenset(plan[2])
+                if key not in expanded or plan < expanded[key]:
+                    expanded[key] = plan
+        beam = sorted(expanded.values(), key=lambda plan: (plan[0], plan[1], sorted(plan[2])))[:beam_width]
+    
+    chosen = [recipes[position] for position in beam[0][2]]
+    return MealPlan(chosen, shopping_list(chosen))
+
+def plan_week(user_ingredients: List[str], days: int = 7, diet: str = None, max_minutes: int = None,
+              exclude: List[str] = None, pool_size: int = PLAN_POOL_SIZE,
+              beam_width: int = PLAN_BEAM_WIDTH) -> MealPlan:
+    """
+    Plan `days` meals from the local recipes, sharing as many ingredients as possible.
+    
+    The candidates are the pool_size local recipes missing the fewest
+    ingredients (after the diet/time/exclude filters), scored by the
+    ingredient index; plan_meals then picks the combination.
+    
+    Args:
+        user_ingredients: Ingredients the user has
+        days: Number of recipes to plan
+        diet: Dietary filter (vegetarian, vegan, etc.)
+        max_minutes: Maximum cooking time in minutes
+        exclude: Ingredients to avoid
+        pool_size: Number of candidate recipes considered
+        beam_width: Partial plans kept per step (see plan_meals)
+    
+    Returns:
+        MealPlan for the week
+    """
+    from providers.fallback_recipes import search_fallback_recipes
+    
+    candidates = search_fallback_recipes(user_ingredients, max_results=max(pool_size, days), diet=diet,
+                                         max_minutes=max_minutes, sort_by="missing-asc", exclude=exclude)
+    return plan_meals(candidates, days, beam_width)
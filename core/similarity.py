@@ -0,0 +1,235 @@
+"""
+MinHash signatures and LSH buckets over ingredient sets
+
+A MinHash signature is a short, fixed-length summary of a set: two sets'
+signatures agree in each slot with probability equal to their Jaccard
+similarity. Splitting signatures into bands and bucketing recipes by band
+(locality-sensitive hashing) finds the recipes likely to be similar to a
+query by looking up a few buckets, instead of comparing it with every
+recipe.
+"""
+
+import importlib.util
+import random
+import zlib
+from typing import Dict, Hashable, Iterable, List, Sequence, Set, Tuple
+from core.normalize import normalize_ingredient_name
+
+# NumPy is optional: it speeds up building signatures for a whole corpus.
+# It is imported by the first bulk build (see _numpy), not with this
+# module, so deduplicating a page of results never loads it
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# Set to False to force the pure-Python path
+VECTORIZE = HAS_NUMPY
+
+# 64 slots in 16 bands of 4: pairs above ~50% Jaccard similarity share a
+# bucket with high probability, pairs below ~25% rarely do
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# Hash values are (a * x + b) mod a 31-bit prime, so products fit in 64 bits
+_PRIME = (1 << 31) - 1
+
+# LSH band keys combine a band's values into one 64-bit hash
+_BAND_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+def _numpy():
+    """The numpy module for the bulk paths, or None to use pure Python (see VECTORIZE)"""
+    if not VECTORIZE:
+        return None
+    import numpy
+    return numpy
+
+def ingredient_tokens(names: Iterable[str]) -> Set[str]:
+    """
+    Normalize ingredient names into a set for similarity comparisons.
+    
+    Args:
+        names: Ingredient names
+    
+    Returns:
+        Set of normalized, non-empty names
+    """
+    tokens = {normalize_ingredient_name(name) for name in names}
+    tokens.discard("")
+    return tokens
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Exact Jaccard similarity of two sets (0.0 for two empty sets)"""
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class MinHasher:
+    """Computes MinHash signatures with a fixed family of hash functions"""
+    
+    def __init__(self, num_perm: int = MINHASH_PERMUTATIONS, seed: int = 1):
+        """
+        Args:
+            num_perm: Signature length
+            seed: Seed for the hash functions (signatures are only comparable
+                  between hashers with the same num_perm and seed)
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+    
+    def token_signature(self, token: str) -> Tuple[int, ...]:
+        """Hash values of one token under every hash function"""
+        x = zlib.crc32(token.encode("utf-8")) % _PRIME
+        return tuple((a * x + b) % _PRIME for a, b in zip(self._a, self._b))
+    
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        """
+        MinHash signature of a set of tokens.
+        
+        Args:
+            tokens: Set members (e.g. from ingredient_tokens)
+        
+        Returns:
+            Tuple of num_perm ints (all _PRIME for an empty set)
+        """
+        signature = [_PRIME] * self.num_perm
+        for token in set(tokens):
+            signature = list(map(min, signature, self.token_signature(token)))
+        return tuple(signature)
+    
+    def signatures(self, n_sets: int, members: Iterable[Tuple[str, Sequence[int]]]) -> list:
+        """
+        Signatures of many sets at once, given each token's member sets.
+        
+        This is the shape of an inverted index (token -> positions), so a
+        whole corpus is hashed token by token; with NumPy each token updates
+        all of its sets with one vectorized minimum.
+        
+        Args:
+            n_sets: Number of sets
+            members: (token, positions of the sets containing it) pairs
+        
+        Returns:
+            Signatures in position order (rows of a NumPy array, or tuples)
+        """
+        np = _numpy()
+        if np is not None:
+            matrix = np.full((n_sets, self.num_perm), _PRIME, dtype=np.uint32)
+            for token, positions in members:
+                positions = np.asarray(positions, dtype=np.intp)
+                if len(positions):
+                    matrix[positions] = np.minimum(matrix[positions],
+                                                   np.array(self.token_signature(token), dtype=np.uint32))
+            return matrix
+        
+        rows = [[_PRIME] * self.num_perm for _ in range(n_sets)]
+        for token, positions in members:
+            hashes = self.token_signature(token)
+            for position in positions:
+                rows[position] = list(map(min, rows[position], hashes))
+        return [tuple(row) for row in rows]
+
+def estimate_jaccard(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the fraction of signature slots that agree"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+class LSHIndex:
+    """Buckets keys by bands of their MinHash signatures"""
+    
+    def __init__(self, bands: int = LSH_BANDS):
+        """
+        Args:
+            bands: Number of bands (must divide the signature length)
+        """
+        self.bands = bands
+        # Band key -> keys, per band (see add)
+        self._buckets: List[Dict[int, List[Hashable]]] = [{} for _ in range(bands)]
+        # (sorted band keys, row numbers) per band (see build)
+        self._sorted = []
+    
+    @classmethod
+    def build(cls, signatures, keep=None, bands: int = LSH_BANDS) -> "LSHIndex":
+        """
+        Bucket many signatures at once, keyed by row number.
+        
+        With NumPy the buckets of each band are one sorted array of band
+        keys (queried by binary search) instead of a dict entry per row.
+        
+        Args:
+            signatures: Signatures in row order (e.g. from MinHasher.signatures)
+            keep: Optional sequence of flags; rows with a false flag are left out
+            bands: Number of bands
+        
+        Returns:
+            LSHIndex (more keys can still be added with add)
+        """
+        lsh = cls(bands)
+        np = _numpy()
+        if np is not None and isinstance(signatures, np.ndarray):
+            rows = np.arange(len(signatures)) if keep is None else np.flatnonzero(np.asarray(keep))
+            keys = lsh._np_band_keys(signatures[rows])
+            for band in range(bands):
+                order = np.argsort(keys[:, band], kind="stable")
+                lsh._sorted.append((keys[order, band], rows[order]))
+        else:
+            for row, signature in enumerate(signatures):
+                if keep is None or keep[row]:
+                    lsh.add(row, signature)
+        return lsh
+    
+    def _band_keys(self, signature: Sequence[int]) -> List[int]:
+        """One 64-bit key per band (a multiplicative hash of the band's values)"""
+        rows = len(signature) // self.bands
+        keys = []
+        for band in range(self.bands):
+            key = 0
+            for value in signature[band * rows:(band + 1) * rows]:
+                key = (key * _BAND_MULTIPLIER + int(value)) & _MASK64
+            keys.append(key)
+        return keys
+    
+    def _np_band_keys(self, signatures):
+        """_band_keys for every row of a signature matrix (uint64 arithmetic wraps like the mask)"""
+        np = _numpy()
+        n_rows, num_perm = signatures.shape
+        values = signatures.astype(np.uint64).reshape(n_rows, self.bands, num_perm // self.bands)
+        keys = np.zeros((n_rows, self.bands), dtype=np.uint64)
+        for column in range(values.shape[2]):
+            keys = keys * np.uint64(_BAND_MULTIPLIER) + values[:, :, column]
+        return keys
+    
+    def add(self, key: Hashable, signature: Sequence[int]) -> None:
+        """
+        Add a key under its signature's bands.
+        
+        Args:
+            key: Any hashable key (e.g. a recipe position)
+            signature: MinHash signature
+        """
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(key)
+    
+    def candidates(self, signature: Sequence[int]) -> Set[Hashable]:
+        """
+        Keys sharing at least one band with a signature.
+        
+        Band keys are hashes, so rare collisions add unrelated candidates;
+        verify them with jaccard or estimate_jaccard.
+        
+        Args:
+            signature: MinHash signature
+        
+        Returns:
+            Set of candidate keys
+        """
+        found = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            found.update(self._buckets[band].get(band_key, ()))
+            if self._sorted:
+                # Only build() fills _sorted, with NumPy arrays
+                keys, rows = self._sorted[band]
+                band_key = keys.dtype.type(band_key)
+                start = keys.searchsorted(band_key, "left")
+                stop = keys.searchsorted(band_key, "right")
+                found.update(rows[start:stop].tolist())
+        return found
@@ -1,6 +1,8 @@
 """Recipe sorting utilities"""
-from typing import List
+import heapq
+from typing import Callable, List, Optional
 from core.model import Recipe
+from core.normalize import parse_text_query, tokenize_text
 
 def sort_by_used_ingredients_desc(recipes: List[Recipe]) -> List[Recipe]:
     """
@@ -72,7 +74,56 @@ def sort_by_relevance(recipes: List[Recipe]) -> List[Recipe]:
     
     return sorted(recipes, key=relevance_key)
 
-def sort_recipes(recipes: List[Recipe], sort_by: str) -> List[Recipe]:
+def get_sort_key(sort_by: str) -> Callable[[Recipe], object]:
+    """
+    Get an ascending sort key equivalent to a sorting method.
+    
+    sorted(recipes, key=get_sort_key(m)) orders recipes exactly like
+    sort_recipes(recipes, m), including the order of ties (stable sort on
+    negated keys gives the same result as reverse=True).
+    
+    Args:
+        sort_by: Sorting method (see sort_recipes)
+    
+    Returns:
+        Key function
+    """
+    if sort_by == 'used-desc':
+        return lambda r: -r.used_count
+    elif sort_by == 'missing-asc':
+        return lambda r: r.missing_count
+    elif sort_by == 'cost-asc':
+        return lambda r: r.cost_per_serving_usd if r.cost_per_serving_usd is not None else float('inf')
+    elif sort_by == 'time-asc':
+        return lambda r: r.ready_in_minutes if r.ready_in_minutes is not None else float('inf')
+    elif sort_by == 'match-desc':
+        return lambda r: -r.match_percentage
+    else:
+        # Default: smart relevance sort (match → used → time)
+        return lambda r: (
+            -r.match_percentage,
+            -r.used_count,
+            r.ready_in_minutes if r.ready_in_minutes is not None else 999999
+        )
+
+def top_k_recipes(recipes: List[Recipe], sort_by: str, k: int) -> List[Recipe]:
+    """
+    Get the first k recipes of sort_recipes(recipes, sort_by) without a full sort.
+    
+    Uses a bounded heap (heapq.nsmallest), O(n log k) instead of O(n log n),
+    with the same tie-breaking as the full sort.
+    
+    Args:
+        recipes: List of recipes
+        sort_by: Sorting method (see sort_recipes)
+        k: Number of recipes to keep
+    
+    Returns:
+        Best k recipes, in sorted order
+    """
+    return heapq.nsmallest(k, recipes, key=get_sort_key(sort_by))
+
+def sort_recipes(recipes: List[Recipe], sort_by: str, limit: Optional[int] = None) -> List[Recipe]:
     """
     Sort recipes according to the specified method.
     
@@ -85,6 +136,7 @@ def sort_recipes(recipes: List[Recipe], sort_by: str) -> List[Recipe]:
             - 'time-asc': Shortest time first
             - 'match-desc': Best match percentage first
             - 'relevance': Smart sort (match % → used count → time) [DEFAULT]
+        limit: Only the first `limit` recipes are needed (uses top-k selection)
     
     Returns:
         Sorted list of recipes
@@ -92,6 +144,9 @@ def sort_recipes(recipes: List[Recipe], sort_by: str) -> List[Recipe]:
     if not recipes:
         return recipes
     
+    if limit is not None and limit < len(recipes):
+        return top_k_recipes(recipes, sort_by, limit)
+    
     if sort_by == 'used-desc':
         return sort_by_used_ingredients_desc(recipes)
     elif sort_by == 'missing-asc':
@@ -139,3 +194,42 @@ def filter_by_max_time(recipes: List[Recipe], max_minutes: int) -> List[Recipe]:
         r for r in recipes
         if r.ready_in_minutes is not None and r.ready_in_minutes <= max_minutes
     ]
+
+
+def filter_by_max_missing(recipes: List[Recipe], max_missing: int) -> List[Recipe]:
+    """
+    Filter recipes by how many ingredients are missing ("cook now" mode).
+    
+    Args:
+        recipes: List of recipes
+        max_missing: Maximum number of missing ingredients
+    
+    Returns:
+        Filtered list
+    """
+    return [r for r in recipes if len(r.missing_ingredients) <= max_missing]
+
+def filter_by_query(recipes: List[Recipe], query: str) -> List[Recipe]:
+    """
+    Filter recipes by a full-text query over title, instructions, cuisine
+    and categories (every query word must appear; "curr*" matches words
+    starting with "curr").
+    
+    Args:
+        recipes: List of recipes
+        query: Full-text query
+    
+    Returns:
+        Filtered list
+    """
+    terms = parse_text_query(query)
+    if not terms:
+        return list(recipes)
+    
+    def matches(recipe: Recipe) -> bool:
+        text = " ".join([recipe.title, recipe.instructions or "", recipe.cuisine or ""] + recipe.category_or_diet)
+        words = set(tokenize_text(text))
+        return all(any(word.startswith(token) for word in words) if prefix else token in words
+                   for token, prefix in terms)
+    
+    return [r for r in recipes if matches(r)]
@@ -11,7 +11,8 @@ import webbrowser
 from core.orchestrator import search_recipes
 from core.export import export_recipes
 from core.model import Recipe
-from providers.fallback_recipes import FALLBACK_RECIPES
+from core.normalize import parse_ingredients
+from providers.fallback_recipes import best_ingredients_to_buy, fallback_recipe_count, find_similar_recipes
 
 
 class ModernRecipeFinderGUI:
@@ -398,7 +399,7 @@ class ModernRecipeFinderGUI:
         self.title_label.pack(side=tk.LEFT)
         
         # Recipe count badge (compact) - dynamically counted
-        total_recipes = len(FALLBACK_RECIPES)
+        total_recipes = fallback_recipe_count()
         self.recipe_count_label = tk.Label(
             header_frame,
             text=f"{total_recipes} recipes",
@@ -749,6 +750,41 @@ class ModernRecipeFinderGUI:
         )
         self.view_btn.pack(fill=tk.X, pady=(0, 6))
         
+        # Find similar recipes button
+        self.similar_btn = tk.Button(
+            buttons_container,
+            text="🧩 Find Similar",
+            font=('Segoe UI', 9),
+            bg=self.COLORS['bg_hover'],
+            fg=self.COLORS['text_primary'],
+            activebackground=self.COLORS['border'],
+            activeforeground=self.COLORS['text_primary'],
+            relief='flat',
+            bd=0,
+            cursor='hand2',
+            command=self.find_similar,
+            state='disabled',
+            pady=10
+        )
+        self.similar_btn.pack(fill=tk.X, pady=(0, 6))
+        
+        # Shopping suggestion button
+        suggest_btn = tk.Button(
+            buttons_container,
+            text="🛒 What to Buy?",
+            font=('Segoe UI', 9),
+            bg=self.COLORS['bg_hover'],
+            fg=self.COLORS['text_primary'],
+            activebackground=self.COLORS['border'],
+            activeforeground=self.COLORS['text_primary'],
+            relief='flat',
+            bd=0,
+            cursor='hand2',
+            command=self.suggest_ingredients,
+            pady=10
+        )
+        suggest_btn.pack(fill=tk.X, pady=(0, 6))
+        
         # Clear button
         clear_btn = tk.Button(
             buttons_container,
@@ -903,6 +939,7 @@ class ModernRecipeFinderGUI:
             self.show_details_section()  # Show details section with fixed height
             self.display_recipe_details(self.selected_recipe)
             self.view_btn.config(state='normal' if self.selected_recipe.source_url else 'disabled')
+            self.similar_btn.config(state='normal')
             
             # Ensure selected item is visible (simple scroll)
             self.results_tree.see(item)
@@ -1034,6 +1071,7 @@ class ModernRecipeFinderGUI:
             # Clear selection
             self.selected_recipe = None
             self.view_btn.config(state='disabled')
+            self.similar_btn.config(state='disabled')
             # Force layout update
             self.root.update_idletasks()
     
@@ -1042,6 +1080,57 @@ class ModernRecipeFinderGUI:
         if self.selected_recipe and self.selected_recipe.source_url:
             webbrowser.open(self.selected_recipe.source_url)
     
+    def find_similar(self):
+        """Replace the results with local recipes similar to the selected one"""
+        recipe = self.selected_recipe
+        if not recipe:
+            return
+        
+        pantry = parse_ingredients(self.ingredients_entry.get())
+        self.last_results = find_similar_recipes(recipe, int(self.max_results_var.get()), pantry)
+        self.hide_details_section()
+        self.display_results()
+        
+        if self.last_results:
+            self.status_label.config(
+                text=f"🧩 {len(self.last_results)} recipes like {recipe.title}",
+                fg=self.COLORS['success'],
+                bg=self.COLORS['bg_main']
+            )
+            self.export_btn.config(state='normal')
+        else:
+            self.status_label.config(
+                text="⚠️ No similar recipes found",
+                fg=self.COLORS['warning'],
+                bg=self.COLORS['bg_main']
+            )
+    
+    def suggest_ingredients(self):
+        """Show which ingredients to buy to unlock the most offline recipes"""
+        pantry = parse_ingredients(self.ingredients_entry.get())
+        if not pantry:
+            messagebox.showwarning("Input Required", "Please enter some ingredients!")
+            return
+        
+        diet = self.diet_var.get() if self.diet_var.get() else None
+        max_minutes = None
+        if self.max_time_var.get():
+            try:
+                max_minutes = int(self.max_time_var.get())
+            except ValueError:
+                pass
+        
+        picks = best_ingredients_to_buy(pantry, 3, diet=diet, max_minutes=max_minutes)
+        if not picks:
+            messagebox.showinfo("What to Buy", "Buying up to 3 ingredients would not complete another recipe.")
+            return
+        
+        lines = [f"• {ingredient} (+{count} recipes)" for ingredient, count in picks]
+        messagebox.showinfo(
+            "What to Buy",
+            "Buying these (in order) makes the most new recipes fully makeable:\n\n" + "\n".join(lines)
+        )
+    
     def export_results(self):
         """Export search results"""
         if not self.last_results:
@@ -1088,6 +1177,7 @@ class ModernRecipeFinderGUI:
         # Disable buttons
         self.export_btn.config(state='disabled')
         self.view_btn.config(state='disabled')
+        self.similar_btn.config(state='disabled')
         
         # Update status with modern colors
         self.status_label.config(
@@ -1099,6 +1189,16 @@ class ModernRecipeFinderGUI:
 
 def main():
     """Main entry point for modern GUI"""
+    # Never fork search workers from the Tk process (see core.config.FALLBACK_SHARDS)
+    import core.config
+    core.config.FALLBACK_SHARDS = 0
+    
+    # Opt-in: warm the default provider's connections while the window builds
+    from core.config import should_prewarm
+    if should_prewarm():
+        from core.orchestrator import prewarm_providers
+        prewarm_providers("themealdb")
+    
     root = tk.Tk()
     app = ModernRecipeFinderGUI(root)
     root.mainloop()
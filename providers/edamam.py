@@ -4,13 +4,36 @@ import time
 from typing import List, Optional
 from core.model import Recipe, Provider, IngredientItem
 from core.normalize import find_matching_ingredients
+from core.performance import get_http_session, decode_json_response
 
 # Edamam API base URL
 BASE_URL = "https://api.edamam.com/api/recipes/v2"
 
+# Cheap URL used to pre-warm pooled connections (HEAD, no API key needed)
+WARMUP_URL = BASE_URL
+
 # Rate limiting
 RATE_LIMIT_DELAY = 0.2  # seconds between requests
 
+# Response projection: only the recipe fields recipe_to_model reads.
+# Sent as repeated field= params so Edamam omits nutrients, digest,
+# image variants and other large blocks we never use.
+RESPONSE_FIELDS = (
+    'uri',
+    'label',
+    'image',
+    'url',
+    'ingredientLines',
+    'ingredients',
+    'totalTime',
+    'yield',
+    'cuisineType',
+    'mealType',
+    'dishType',
+    'dietLabels',
+    'healthLabels'
+)
+
 
 class EdamamProvider:
     """Provider for Edamam Recipe Search API v2"""
@@ -25,10 +48,8 @@ class EdamamProvider:
         """
         self.app_id = app_id
         self.app_key = app_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'RecipeFinder/1.0'
-        })
+        # Use shared session pool for better performance
+        self.session = get_http_session("edamam")
         self.last_request_time = 0
     
     def _rate_limit(self):
@@ -57,12 +78,13 @@ class EdamamProvider:
         params['app_id'] = self.app_id
         params['app_key'] = self.app_key
         params['type'] = 'public'  # Recipe type
+        params['field'] = list(RESPONSE_FIELDS)
         
         try:
             response = self.session.get(BASE_URL, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return decode_json_response(response)
+        except (requests.exceptions.RequestException, ValueError) as e:
             raise Exception(f"Edamam API request failed: {e}")
     
     def recipe_to_model(
@@ -82,17 +104,16 @@ class EdamamProvider:
         """
         recipe = recipe_data.get('recipe', {})
         
-        # Extract ingredient names
-        recipe_ingredient_names = [
-            ing.get('food', '') for ing in recipe.get('ingredients', [])
-        ]
-        
-        # Build ingredient items
+        # Extract ingredient names and items in one pass
+        recipe_ingredient_names = []
         ingredient_items = []
         for ing in recipe.get('ingredients', []):
+            name = ing.get('food', '')
+            quantity = ing.get('quantity')
+            recipe_ingredient_names.append(name)
             ingredient_items.append(IngredientItem(
-                name=ing.get('food', ''),
-                quantity=str(ing.get('quantity', '')) if ing.get('quantity') else None,
+                name=name,
+                quantity=str(quantity) if quantity else None,
                 unit=ing.get('measure', '')
             ))
         
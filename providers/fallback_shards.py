@@ -0,0 +1,225 @@
+"""
+Multi-process sharded search over large local recipe corpora
+
+The corpus is split into contiguous recipe position ranges (shards). The
+index is loaded once in the parent, which then forks one persistent worker
+process per shard, so workers share the mapped index and its lazily built
+structures (match index, recipe sizes, NumPy views) copy-on-write instead
+of loading them again.
+
+A query's ingredients are matched once in the parent (as is a free-text
+query, whose matching positions are sent along); the matched term ids
+are scattered to every worker, each worker returns the top k
+candidates of its shard, and the parent merges them into the global top k
+with the same sort keys. Shards are contiguous and ties break by
+position, so results are identical to an unsharded search. Recipes
+removed at runtime are sent along as positions to skip; recipes added at
+runtime live in the parent (RecipeStore's delta segment) and are merged
+in like one more shard.
+
+Workers are only forked on Linux: macOS defaults to "spawn" because
+forking there is unsafe (system frameworks are not fork-safe), and spawned
+workers would have to load the index again. Forking copies only the
+calling thread, so a process that runs other threads (e.g. the Tk GUI or
+connection pre-warming) risks children deadlocking on locks those threads
+held - start searchers from single-threaded programs. Elsewhere, or with
+a single shard, ShardedSearcher searches in-process.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from typing import List, Optional, Tuple
+from core.model import Recipe
+from providers import recipe_index
+from providers.recipe_index import merge_top
+from providers.recipe_store import RecipeStore
+
+
+def shard_ranges(n_recipes: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split recipe positions into contiguous, near-equal ranges.
+    
+    Args:
+        n_recipes: Number of recipes
+        shards: Number of shards
+    
+    Returns:
+        List of (start, stop) position ranges (no empty ranges)
+    """
+    shards = max(1, min(shards, n_recipes))
+    size, extra = divmod(n_recipes, shards)
+    ranges = []
+    start = 0
+    for shard in range(shards):
+        stop = start + size + (1 if shard < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def workers_supported() -> bool:
+    """Check whether worker processes can be forked safely on this platform (Linux only)"""
+    return sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods()
+
+
+def _shard_worker(index, start: int, stop: int, conn) -> None:
+    """Worker loop: answer top-k requests for positions [start, stop) until told to stop"""
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        
+        term_ids, k, sort_by, diet, max_minutes, excluded, deleted, max_missing, allowed = request
+        try:
+            keep = index.columns.mask(diet, max_minutes, start, stop)
+            if excluded:
+                keep = index.exclude_terms(excluded, keep, start, stop)
+            if deleted:
+                keep = index.without_positions(deleted, keep, start, stop)
+            if allowed is not None:
+                keep = index.only_positions(allowed, keep, start, stop)
+            conn.send(index.top_matches(term_ids, k, sort_by, keep, start, stop, max_missing))
+        except Exception as e:
+            conn.send(e)
+    conn.close()
+
+
+class ShardedSearcher:
+    """
+    Scatter/gather search over a RecipeStore with one worker process per shard.
+    
+    Usage:
+        with ShardedSearcher(RecipeStore("big.jsonl"), shards=4) as searcher:
+            recipes = searcher.search(["eggs", "onion"], max_results=10)
+    """
+    
+    def __init__(self, store: RecipeStore, shards: Optional[int] = None):
+        """
+        Args:
+            store: Recipe store to search
+            shards: Number of worker processes (default: CPU count)
+        """
+        self.store = store
+        self.shards = shards or os.cpu_count() or 1
+        self._workers = []
+        self._started = False
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Load the index and fork the workers (called by the first search)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            
+            # Build everything lazy before forking, so workers share it
+            index = self.store.index
+            index.match_index()
+            index.recipe_sizes()
+            if recipe_index.VECTORIZE:
+                index._np_arrays()
+                index.columns._np_arrays()
+            
+            if self.shards <= 1 or not workers_supported():
+                return
+            
+            context = multiprocessing.get_context("fork")
+            for start, stop in shard_ranges(index.n_recipes, self.shards):
+                conn, child_conn = context.Pipe()
+                process = context.Process(target=_shard_worker, args=(index, start, stop, child_conn), daemon=True)
+                process.start()
+                child_conn.close()
+                self._workers.append((process, conn))
+    
+    def close(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            for process, conn in self._workers:
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+                conn.close()
+            for process, _ in self._workers:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self._workers = []
+            self._started = False
+    
+    def __enter__(self) -> "ShardedSearcher":
+        self.start()
+        return self
+    
+    def __exit__(self, *args) -> None:
+        self.close()
+    
+    @property
+    def worker_count(self) -> int:
+        """Number of running worker processes (0 when searching in-process)"""
+        return len(self._workers)
+    
+    @property
+    def position_count(self) -> int:
+        """Number of positions in use (see RecipeStore.position_count)"""
+        return self.store.position_count
+    
+    def materialize(self, position: int, matched_terms: tuple) -> Recipe:
+        """Build a result recipe (see RecipeStore.materialize)"""
+        return self.store.materialize(position, matched_terms)
+    
+    def top_candidates(self, user_ingredients: List[str], max_results: int = 10, diet: str = None,
+                       max_minutes: int = None, sort_by: str = "relevance", exclude: List[str] = None,
+                       max_missing: Optional[int] = None, query: Optional[str] = None) -> tuple:
+        """
+        Score all shards without building Recipe objects (see RecipeStore.top_candidates).
+        
+        Returns:
+            Tuple of (top candidate tuples, matched terms for materialize)
+        """
+        self.start()
+        if not self._workers:
+            return self.store.top_candidates(user_ingredients, max_results, diet, max_minutes, sort_by, exclude,
+                                             max_missing, query)
+        
+        index = self.store.index
+        matched_terms = self.store.match(user_ingredients)
+        excluded = sorted(index.matching_terms(exclude)) if exclude else []
+        deleted = self.store.deleted_positions()
+        text_matches = self.store.text_matches(query) if query else None
+        allowed = None if text_matches is None else sorted(p for p in text_matches if p < index.n_recipes)
+        request = (sorted(matched_terms[0]), max_results, sort_by, diet, max_minutes, excluded, deleted, max_missing,
+                   allowed)
+        
+        # Scatter, then gather in shard (= position) order
+        with self._lock:
+            for _, conn in self._workers:
+                conn.send(request)
+            replies = [conn.recv() for _, conn in self._workers]
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+        
+        # Merge the per-shard top k (and the recipes added at runtime,
+        # positioned after every shard) into the global top k
+        replies.append(self.store.delta_matches(matched_terms, max_results, sort_by, diet, max_minutes, exclude,
+                                                max_missing, text_matches))
+        return merge_top(max_results, sort_by, replies), matched_terms
+    
+    def search(self, user_ingredients: List[str], max_results: int = 10, diet: str = None, max_minutes: int = None,
+               sort_by: str = "relevance", exclude: List[str] = None, max_missing: Optional[int] = None,
+               query: Optional[str] = None) -> List[Recipe]:
+        """
+        Search all shards (same arguments and results as RecipeStore.search).
+        
+        Returns:
+            List of matching recipes
+        """
+        top, matched_terms = self.top_candidates(user_ingredients, max_results, diet, max_minutes, sort_by, exclude,
+                                                 max_missing, query)
+        return [self.store.materialize(position, matched_terms) for position, *_ in top]
@@ -0,0 +1,1499 @@
+"""
+Prebuilt inverted ingredient index for local recipe data
+
+The index maps each normalized ingredient to a sorted posting list of
+recipe positions (the recipe's line number in the data file, header
+excluded). It is built offline into a flat binary file that is
+memory-mapped at search time, so cold CLI runs skip the build and forked
+workers share the same pages.
+
+Static per-recipe attributes (time, servings, cuisine, categories) are
+stored alongside as columns, so searches can filter recipes with masks
+before scoring them or touching the recipe data.
+
+Binary layout (little-endian, 4-byte aligned), version 4:
+    magic      4 bytes   b"RFIX"
+    version    u32
+    n_recipes  u32
+    n_terms    u32
+    vocab_len  u32       bytes of UTF-8 vocabulary
+    source     32 bytes  SHA-256 of the recipe data file it was built from
+    vocab      UTF-8 terms (sorted) joined by "\\n", zero-padded to 4 bytes
+    offsets    u32[n_terms + 1]  start of each posting list
+    postings   u32[offsets[-1]]  recipe positions, ascending
+    columns    u32[4]    n_cuisines, cuisine vocab bytes, n_categories,
+                         category vocab bytes
+    cuisines   UTF-8 names joined by "\n", zero-padded to 4 bytes
+    categories UTF-8 lowercased names joined by "\n", zero-padded
+    time       i32[n_recipes]  minutes, -1 if unknown
+    servings   i32[n_recipes]  -1 if unknown
+    cuisine    i32[n_recipes]  cuisine code, -1 if unknown
+    category   u32[n_recipes * ceil(n_categories / 32)]  bitmask words
+    n_rows     u32       n_recipes, or 0 if not built from a data file
+    rows       u64[n_rows]  byte offset of each recipe line in the data
+                         file, after zero padding to an 8-byte boundary
+    ids        u32[2]    n_ids (n_recipes), id bytes
+    id_order   u32[n_ids]  recipe positions sorted by id (UTF-8 bytes)
+    id_offsets u32[n_ids + 1]  start of each recipe's id in id_data
+    id_data    UTF-8 recipe ids concatenated, zero-padded to 4 bytes
+
+Usage:
+    python -m providers.recipe_index build [DATA_FILE] [INDEX_FILE]
+"""
+import hashlib
+import heapq
+import importlib.util
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+from core.normalize import normalize_ingredient_name
+
+# NumPy is optional: it vectorizes scoring, pure Python is used otherwise.
+# It is only imported by the first vectorized search (see _numpy), so
+# starting the app or searching an API provider never loads it
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# Set to False to force the pure-Python scoring path
+VECTORIZE = HAS_NUMPY
+
+# The numpy module, once _numpy() has imported it
+_np_module = None
+
+# Candidate tuples built per step when streaming ranked results
+RANKED_CHUNK_SIZE = 256
+
+INDEX_MAGIC = b"RFIX"
+INDEX_VERSION = 4
+_HEADER = struct.Struct("<4sIIII32s")
+_COLUMNS_HEADER = struct.Struct("<IIII")
+_ROWS_HEADER = struct.Struct("<I")
+_IDS_HEADER = struct.Struct("<II")
+
+# Native 32-bit array typecodes ("I"/"i" on all supported platforms)
+_U32 = "I" if array("I").itemsize == 4 else "L"
+_I32 = "i" if array("i").itemsize == 4 else "l"
+
+
+def file_digest(path: str) -> bytes:
+    """
+    Compute the SHA-256 digest of a file.
+    
+    Args:
+        path: File to hash
+    
+    Returns:
+        32-byte digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _pack_vocab(names: List[str]) -> bytes:
+    """Encode names joined by newlines (unpadded)"""
+    return "\n".join(names).encode("utf-8")
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b"\0" * (_pad4(len(data)) - len(data))
+
+
+def _unpack_vocab(buffer, offset: int, length: int, count: int) -> List[str]:
+    return buffer[offset:offset + length].decode("utf-8").split("\n") if count else []
+
+
+def candidate_sort_key(sort_by: str):
+    """
+    Get the sort key for scored candidates (position, used, total, match %, time).
+    
+    Mirrors core.sorters.get_sort_key for the supported sort_by modes.
+    
+    Returns:
+        Key function, or None to keep candidates in corpus order
+    """
+    def time_key(c):
+        return c[4] if c[4] is not None else 999999
+    
+    if sort_by == "relevance" or sort_by == "match-desc":
+        # Smart sort: match % → used count → cooking time
+        return lambda c: (-c[3], -c[1], time_key(c))
+    elif sort_by == "used-desc":
+        return lambda c: (-c[1], -c[3])
+    elif sort_by == "missing-asc":
+        return lambda c: (c[2] - c[1], -c[3])
+    elif sort_by == "time-asc":
+        return lambda c: (time_key(c), -c[3])
+    return None
+
+
+def merge_top(k: int, sort_by: str, candidate_lists: Iterable[List[tuple]]) -> List[tuple]:
+    """
+    Merge per-segment (or per-shard) top-k candidates into the overall top k.
+    
+    Args:
+        k: Number of results
+        sort_by: Sort mode (see candidate_sort_key)
+        candidate_lists: Candidate lists, in ascending position order of
+                         the segments they come from
+    
+    Returns:
+        Best k candidates; ties keep position order
+    """
+    candidates = [candidate for candidate_list in candidate_lists for candidate in candidate_list]
+    sort_key = candidate_sort_key(sort_by)
+    if sort_key is None:
+        return candidates[:k]
+    return heapq.nsmallest(k, candidates, key=sort_key)
+
+
+class MatchScores(NamedTuple):
+    """Per-recipe match counts for one query (parallel lists, ascending position)"""
+    positions: List[int]
+    used: List[int]
+    totals: List[int]
+
+
+class IngredientMatchIndex:
+    """
+    Answers "which vocabulary terms match X" without scanning the vocabulary.
+    
+    Uses the same rules as core.normalize.ingredients_match:
+        - exact: looked up directly in the term table
+        - term contained in X: every substring of X is looked up
+        - X contained in term: n-gram (1-3 character) posting sets are
+          intersected, then candidates are verified with a substring check
+        - trailing-'s' plural: a table keyed by term.rstrip('s')
+    """
+    
+    GRAM_SIZE = 3
+    
+    def __init__(self, terms: List[str]):
+        self.terms = terms
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.stems: Dict[str, List[int]] = {}
+        self.grams: Dict[str, Set[int]] = {}
+        self._cache: Dict[str, frozenset] = {}
+        for term_id, term in enumerate(terms):
+            self._add_term(term_id, term)
+    
+    def add_term(self, term: str) -> int:
+        """
+        Add a term to the vocabulary (cached matches are dropped).
+        
+        Args:
+            term: Normalized term
+        
+        Returns:
+            The new term id
+        """
+        term_id = len(self.terms)
+        self.terms.append(term)
+        self.term_ids[term] = term_id
+        self._add_term(term_id, term)
+        self._cache.clear()
+        return term_id
+    
+    def _add_term(self, term_id: int, term: str) -> None:
+        self.stems.setdefault(term.rstrip('s'), []).append(term_id)
+        for size in range(1, self.GRAM_SIZE + 1):
+            for start in range(len(term) - size + 1):
+                self.grams.setdefault(term[start:start + size], set()).add(term_id)
+    
+    def match(self, ingredient: str) -> frozenset:
+        """
+        Find all terms matching an ingredient.
+        
+        Args:
+            ingredient: Raw ingredient name
+        
+        Returns:
+            Frozen set of matching term ids
+        """
+        query = normalize_ingredient_name(ingredient)
+        cached = self._cache.get(query)
+        if cached is not None:
+            return cached
+        
+        if not query:
+            # The empty string is contained in every term
+            result = frozenset(range(len(self.terms)))
+            self._cache[query] = result
+            return result
+        
+        matches = set(self.stems.get(query.rstrip('s'), ()))
+        
+        # Terms that are substrings of the query (includes the exact match)
+        term_ids = self.term_ids
+        n = len(query)
+        for start in range(n):
+            for end in range(start + 1, n + 1):
+                term_id = term_ids.get(query[start:end])
+                if term_id is not None:
+                    matches.add(term_id)
+        
+        # Terms containing the query
+        size = min(self.GRAM_SIZE, n)
+        gram_sets = []
+        for start in range(n - size + 1):
+            gram_set = self.grams.get(query[start:start + size])
+            if not gram_set:
+                gram_sets = None
+                break
+            gram_sets.append(gram_set)
+        if gram_sets:
+            gram_sets.sort(key=len)
+            candidates = gram_sets[0].intersection(*gram_sets[1:])
+            terms = self.terms
+            matches.update(t for t in candidates if query in terms[t])
+        
+        result = frozenset(matches)
+        self._cache[query] = result
+        return result
+
+
+class RecipeColumns:
+    """
+    Static recipe attributes in columnar arrays, indexed by recipe position.
+    
+    Unknown values are stored as -1. Categories are matched
+    case-insensitively and kept as one bitmask per recipe (WORD_BITS bits
+    per word, words_per_recipe words per recipe).
+    """
+    
+    UNKNOWN = -1
+    WORD_BITS = 32
+    
+    def __init__(self, time: Sequence[int], servings: Sequence[int], cuisine: Sequence[int],
+                 cuisines: List[str], category_words: Sequence[int], categories: List[str]):
+        self.time = time
+        self.servings = servings
+        self.cuisine = cuisine
+        self.cuisines = cuisines
+        self.category_words = category_words
+        self.categories = categories
+        self.category_bits: Dict[str, int] = {name: bit for bit, name in enumerate(categories)}
+        self.words_per_recipe = (len(categories) + self.WORD_BITS - 1) // self.WORD_BITS
+        self._np_columns = None
+    
+    @classmethod
+    def build(cls, recipes: Iterable[dict]) -> "RecipeColumns":
+        """
+        Build columns from recipe dicts.
+        
+        Args:
+            recipes: Recipes in data file order
+        
+        Returns:
+            In-memory RecipeColumns
+        """
+        def value(v):
+            return v if isinstance(v, int) and v >= 0 else cls.UNKNOWN
+        
+        # Single pass (recipes may be a stream): category sets are interned
+        # as combinations, and codes are assigned once the vocabularies are known
+        time = array(_I32)
+        servings = array(_I32)
+        cuisine_names: List[Optional[str]] = []
+        combo_ids: Dict[frozenset, int] = {}
+        recipe_combos = array(_U32)
+        for recipe in recipes:
+            time.append(value(recipe.get("time")))
+            servings.append(value(recipe.get("servings")))
+            cuisine_names.append(recipe.get("cuisine") or None)
+            combo = frozenset(c.lower() for c in recipe.get("category", []))
+            recipe_combos.append(combo_ids.setdefault(combo, len(combo_ids)))
+        
+        cuisines = sorted({name for name in cuisine_names if name})
+        cuisine_codes = {name: code for code, name in enumerate(cuisines)}
+        cuisine = array(_I32, (cuisine_codes.get(name, cls.UNKNOWN) for name in cuisine_names))
+        
+        categories = sorted(set().union(*combo_ids))
+        category_bits = {name: bit for bit, name in enumerate(categories)}
+        words_per_recipe = (len(categories) + cls.WORD_BITS - 1) // cls.WORD_BITS
+        combo_words = [None] * len(combo_ids)
+        for combo, combo_id in combo_ids.items():
+            combo_mask = sum(1 << category_bits[name] for name in combo)
+            combo_words[combo_id] = [(combo_mask >> (cls.WORD_BITS * w)) & 0xFFFFFFFF
+                                     for w in range(words_per_recipe)]
+        words = array(_U32)
+        for combo_id in recipe_combos:
+            words.extend(combo_words[combo_id])
+        
+        return cls(time, servings, cuisine, cuisines, words, categories)
+    
+    def __len__(self) -> int:
+        return len(self.time)
+    
+    def time_of(self, position: int) -> Optional[int]:
+        """Cooking time in minutes of a recipe, or None if unknown"""
+        minutes = self.time[position]
+        return None if minutes == self.UNKNOWN else minutes
+    
+    def has_category(self, position: int, category: str) -> bool:
+        """Check whether a recipe has a category/diet (case-insensitive)"""
+        bit = self.category_bits.get(category.lower())
+        if bit is None:
+            return False
+        word = self.category_words[position * self.words_per_recipe + bit // self.WORD_BITS]
+        return bool(word >> (bit % self.WORD_BITS) & 1)
+    
+    def mask(self, diet: str = None, max_minutes: int = None, start: int = 0, stop: Optional[int] = None):
+        """
+        Compute which recipes pass the search filters.
+        
+        Same semantics as filtering recipe dicts: diet must be one of the
+        recipe's categories (case-insensitive), and the recipe must have a
+        known, non-zero time of at most max_minutes.
+        
+        Args:
+            diet: Required category/diet (None for any)
+            max_minutes: Maximum cooking time (None for any)
+            start: First recipe position covered by the mask
+            stop: End of the covered positions (default: all recipes)
+        
+        Returns:
+            None if no filter applies, otherwise a boolean NumPy array (if
+            vectorizing) or a bytearray of 0/1 flags, indexed by position - start
+        """
+        if not diet and max_minutes is None:
+            return None
+        
+        stop = len(self) if stop is None else stop
+        size = stop - start
+        bit = self.category_bits.get(diet.lower()) if diet else None
+        if VECTORIZE:
+            np = _numpy()
+            time, words = self._np_arrays()
+            keep = np.ones(size, dtype=bool)
+            if diet:
+                if bit is None:
+                    return np.zeros(size, dtype=bool)
+                keep &= (words[start:stop, bit // self.WORD_BITS] >> np.uint32(bit % self.WORD_BITS)) & 1 == 1
+            if max_minutes is not None:
+                time = time[start:stop]
+                keep &= (time > 0) & (time <= max_minutes)
+            return keep
+        
+        keep = bytearray(b"\1") * size
+        if diet:
+            if bit is None:
+                return bytearray(size)
+            stride = self.words_per_recipe
+            word, shift = bit // self.WORD_BITS, bit % self.WORD_BITS
+            words = self.category_words
+            for position in range(start, stop):
+                if not words[position * stride + word] >> shift & 1:
+                    keep[position - start] = 0
+        if max_minutes is not None:
+            time = self.time
+            for position in range(start, stop):
+                if not 0 < time[position] <= max_minutes:
+                    keep[position - start] = 0
+        return keep
+    
+    def _np_arrays(self):
+        """Zero-copy NumPy views of the time column and the (n, words) category bitmasks"""
+        if self._np_columns is None:
+            np = _numpy()
+            time = np.frombuffer(self.time, dtype=np.int32)
+            words = np.frombuffer(self.category_words, dtype=np.uint32)
+            self._np_columns = (time, words.reshape(len(self), self.words_per_recipe))
+        return self._np_columns
+    
+    def _to_bytes(self) -> bytes:
+        """Serialize as the columns section of the index file"""
+        cuisines = _pack_vocab(self.cuisines)
+        categories = _pack_vocab(self.categories)
+        header = _COLUMNS_HEADER.pack(len(self.cuisines), len(cuisines), len(self.categories), len(categories))
+        arrays = [array(_I32, self.time), array(_I32, self.servings),
+                  array(_I32, self.cuisine), array(_U32, self.category_words)]
+        if sys.byteorder != "little":
+            for values in arrays:
+                values.byteswap()
+        return header + _padded(cuisines) + _padded(categories) + b"".join(values.tobytes() for values in arrays)
+    
+    @classmethod
+    def _from_buffer(cls, buffer, offset: int, n_recipes: int) -> tuple:
+        """Map the columns section of an index file (zero-copy); returns (columns, end offset)"""
+        n_cuisines, cuisines_len, n_categories, categories_len = _COLUMNS_HEADER.unpack_from(buffer, offset)
+        pos = offset + _COLUMNS_HEADER.size
+        cuisines = _unpack_vocab(buffer, pos, cuisines_len, n_cuisines)
+        pos += _pad4(cuisines_len)
+        categories = _unpack_vocab(buffer, pos, categories_len, n_categories)
+        pos += _pad4(categories_len)
+        
+        columns = []
+        for _ in range(3):
+            columns.append(_int_view(buffer, pos, n_recipes, _I32))
+            pos += 4 * n_recipes
+        words_per_recipe = (n_categories + cls.WORD_BITS - 1) // cls.WORD_BITS
+        words = _int_view(buffer, pos, n_recipes * words_per_recipe)
+        pos += 4 * n_recipes * words_per_recipe
+        return cls(*columns, cuisines, words, categories), pos
+
+
+class RecipeIds:
+    """
+    Recipe ids by position, with a sorted permutation for id -> position
+    lookups by binary search (O(log n), without reading the data file).
+    """
+    
+    def __init__(self, order: Sequence[int], offsets: Sequence[int], data):
+        self.order = order
+        self.offsets = offsets
+        self.data = data
+    
+    @classmethod
+    def build(cls, ids: Iterable[str]) -> "RecipeIds":
+        """
+        Build the id table.
+        
+        Args:
+            ids: Recipe ids in data file order
+        
+        Returns:
+            In-memory RecipeIds
+        """
+        encoded = [str(recipe_id).encode("utf-8") for recipe_id in ids]
+        offsets = array(_U32, [0])
+        for recipe_id in encoded:
+            offsets.append(offsets[-1] + len(recipe_id))
+        order = array(_U32, sorted(range(len(encoded)), key=encoded.__getitem__))
+        return cls(order, offsets, b"".join(encoded))
+    
+    def __len__(self) -> int:
+        return len(self.order)
+    
+    def _key(self, position: int) -> bytes:
+        return bytes(self.data[self.offsets[position]:self.offsets[position + 1]])
+    
+    def __getitem__(self, position: int) -> str:
+        """Id of the recipe at a position"""
+        return self._key(position).decode("utf-8")
+    
+    def position(self, recipe_id: str) -> Optional[int]:
+        """
+        Find a recipe by id.
+        
+        Args:
+            recipe_id: Recipe id
+        
+        Returns:
+            Position of the first recipe (in id order) with that id, or None
+        """
+        key = str(recipe_id).encode("utf-8")
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(self.order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.order) and self._key(self.order[lo]) == key:
+            return self.order[lo]
+        return None
+    
+    def _to_bytes(self) -> bytes:
+        """Serialize as the ids section of the index file"""
+        data = bytes(self.data)
+        arrays = [array(_U32, self.order), array(_U32, self.offsets)]
+        if sys.byteorder != "little":
+            for values in arrays:
+                values.byteswap()
+        return _IDS_HEADER.pack(len(self), len(data)) + b"".join(values.tobytes() for values in arrays) + _padded(data)
+    
+    @classmethod
+    def _from_buffer(cls, buffer, offset: int) -> tuple:
+        """Map the ids section of an index file (zero-copy); returns (ids, end offset)"""
+        n_ids, data_len = _IDS_HEADER.unpack_from(buffer, offset)
+        pos = offset + _IDS_HEADER.size
+        order = _int_view(buffer, pos, n_ids)
+        pos += 4 * n_ids
+        offsets = _int_view(buffer, pos, n_ids + 1)
+        pos += 4 * (n_ids + 1)
+        data = memoryview(buffer)[pos:pos + data_len]
+        if len(data) != data_len:
+            raise ValueError("Truncated index file")
+        return cls(order, offsets, data), pos + _pad4(data_len)
+
+
+class IngredientIndex:
+    """
+    Inverted index from normalized ingredient to recipe positions.
+    
+    Posting lists are arrays (built in memory) or zero-copy memoryview
+    slices of a memory-mapped index file (loaded with IngredientIndex.load).
+    """
+    
+    def __init__(self, terms: List[str], offsets: Sequence[int], postings: Sequence[int], n_recipes: int,
+                 columns: RecipeColumns, row_offsets: Optional[Sequence[int]] = None,
+                 ids: Optional[RecipeIds] = None):
+        self.terms = terms
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.offsets = offsets
+        self.postings_data = postings
+        self.n_recipes = n_recipes
+        self.columns = columns
+        self.row_offsets = row_offsets
+        self.ids = ids
+        self._mmap = None
+        self._match_index = None
+        self._totals = None
+        self._np_offsets = None
+        self._np_postings = None
+        self._np_terms = None
+    
+    @classmethod
+    def build(cls, recipes: Iterable[dict], row_offsets: Optional[Sequence[int]] = None) -> "IngredientIndex":
+        """
+        Build an index from recipe dicts (in one pass, so recipes may be
+        streamed from a large data file).
+        
+        Args:
+            recipes: Recipes in data file order
+            row_offsets: Byte offset of each recipe's line in the data file,
+                         if the index is for a data file (see recipe_store)
+        
+        Returns:
+            In-memory IngredientIndex
+        """
+        by_term: Dict[str, array] = {}
+        recipe_ids: List[str] = []
+        n_recipes = 0
+        
+        def add_postings():
+            nonlocal n_recipes
+            for position, recipe in enumerate(recipes):
+                n_recipes = position + 1
+                recipe_ids.append(recipe.get("id", ""))
+                for ingredient in recipe["ingredients"]:
+                    term = normalize_ingredient_name(ingredient)
+                    posting = by_term.get(term)
+                    if posting is None:
+                        posting = by_term[term] = array(_U32)
+                    posting.append(position)
+                yield recipe
+        
+        columns = RecipeColumns.build(add_postings())
+        
+        terms = sorted(by_term)
+        offsets = array(_U32, [0])
+        postings = array(_U32)
+        for term in terms:
+            postings.extend(by_term.pop(term))
+            offsets.append(len(postings))
+        
+        return cls(terms, offsets, postings, n_recipes, columns, row_offsets, RecipeIds.build(recipe_ids))
+    
+    @classmethod
+    def load(cls, path: str, source_digest: Optional[bytes] = None) -> Optional["IngredientIndex"]:
+        """
+        Memory-map an index file.
+        
+        Args:
+            path: Index file path
+            source_digest: Expected SHA-256 of the data file (None to skip the check)
+        
+        Returns:
+            IngredientIndex backed by the mapped file, or None if the file
+            is missing, corrupt, from another format version, or stale
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        
+        try:
+            magic, version, n_recipes, n_terms, vocab_len, digest = _HEADER.unpack_from(mapped, 0)
+        except struct.error:
+            mapped.close()
+            return None
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or \
+           (source_digest is not None and digest != source_digest):
+            mapped.close()
+            return None
+        
+        try:
+            pos = _HEADER.size
+            terms = _unpack_vocab(mapped, pos, vocab_len, n_terms)
+            pos += _pad4(vocab_len)
+            
+            offsets = _int_view(mapped, pos, n_terms + 1)
+            pos += 4 * (n_terms + 1)
+            postings = _int_view(mapped, pos, offsets[-1])
+            pos += 4 * offsets[-1]
+            columns, pos = RecipeColumns._from_buffer(mapped, pos, n_recipes)
+            (n_rows,) = _ROWS_HEADER.unpack_from(mapped, pos)
+            pos = _pad8(pos + _ROWS_HEADER.size)
+            row_offsets = _int_view(mapped, pos, n_rows, "Q") if n_rows else None
+            pos += 8 * n_rows
+            ids, pos = RecipeIds._from_buffer(mapped, pos)
+            if len(ids) != n_recipes:
+                raise ValueError("Recipe id table does not match the index")
+        except (struct.error, ValueError, TypeError, IndexError):
+            mapped.close()
+            return None
+        
+        index = cls(terms, offsets, postings, n_recipes, columns, row_offsets, ids)
+        index._mmap = mapped
+        return index
+    
+    def save(self, path: str, source_digest: bytes) -> None:
+        """
+        Write the index in the binary format (atomically replaces path).
+        
+        Args:
+            path: Output file path
+            source_digest: SHA-256 of the data file this index was built from
+        """
+        vocab = _pack_vocab(self.terms)
+        offsets = array(_U32, self.offsets)
+        postings = array(_U32, self.postings_data)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            postings.byteswap()
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.n_recipes,
+                                 len(self.terms), len(vocab), source_digest))
+            f.write(_padded(vocab))
+            f.write(offsets.tobytes())
+            f.write(postings.tobytes())
+            f.write(self.columns._to_bytes())
+            rows = array("Q", self.row_offsets or ())
+            if sys.byteorder != "little":
+                rows.byteswap()
+            f.write(_ROWS_HEADER.pack(len(rows)))
+            f.write(b"\0" * (_pad8(f.tell()) - f.tell()))
+            f.write(rows.tobytes())
+            f.write(self.ids._to_bytes())
+        os.replace(tmp_path, path)
+    
+    def close(self) -> None:
+        """
+        Release the mapped index file, so it can be replaced (required on
+        Windows). The index must not be used afterwards.
+        """
+        mapped, self._mmap = self._mmap, None
+        if mapped is None:
+            return
+        # Drop every view into the mapping before closing it
+        self.offsets = self.postings_data = self.row_offsets = None
+        self.columns = self.ids = None
+        self._totals = self._np_offsets = self._np_postings = self._np_terms = None
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # Views are still referenced elsewhere; unmapped once collected
+    
+    def position_of(self, recipe_id: str) -> Optional[int]:
+        """
+        Find a recipe's position by id without reading the data file.
+        
+        Args:
+            recipe_id: Recipe id
+        
+        Returns:
+            Recipe position, or None if no indexed recipe has that id
+        """
+        return self.ids.position(recipe_id)
+    
+    def postings(self, term_id: int) -> Sequence[int]:
+        """
+        Get the posting list (ascending recipe positions) for a term.
+        
+        Args:
+            term_id: Term number (see term_ids)
+        
+        Returns:
+            Sequence of recipe positions, one per occurrence
+        """
+        return self.postings_data[self.offsets[term_id]:self.offsets[term_id + 1]]
+    
+    def items(self):
+        """Iterate over (term, posting list) pairs"""
+        for term_id, term in enumerate(self.terms):
+            yield term, self.postings(term_id)
+    
+    def match_index(self) -> IngredientMatchIndex:
+        """Get the fuzzy term matcher for this index (built on first use)"""
+        if self._match_index is None:
+            self._match_index = IngredientMatchIndex(self.terms)
+        return self._match_index
+    
+    def matching_terms(self, ingredients: Iterable[str]) -> Set[int]:
+        """
+        Find every term matching any of the given ingredients.
+        
+        Args:
+            ingredients: Raw ingredient names
+        
+        Returns:
+            Set of term ids
+        """
+        match = self.match_index().match
+        terms: Set[int] = set()
+        for ingredient in ingredients:
+            terms.update(match(ingredient))
+        return terms
+    
+    def exclude_terms(self, term_ids: Iterable[int], keep=None, start: int = 0, stop: Optional[int] = None):
+        """
+        Drop every recipe containing any of the given terms from a filter mask.
+        
+        Each term's posting list is its recipe set, so this is the set
+        difference keep - (postings of term_ids). With NumPy the postings
+        are scattered into the boolean mask in one step; the pure-Python
+        path clears one flag per excluded posting.
+        
+        Args:
+            term_ids: Term ids to exclude (e.g. from matching_terms)
+            keep: Filter mask from RecipeColumns.mask, or None for all recipes
+            start: First recipe position covered by the mask
+            stop: End of the covered positions (default: all recipes)
+        
+        Returns:
+            New filter mask of the same kind (keep is not modified)
+        """
+        stop = self.n_recipes if stop is None else stop
+        term_ids = sorted(term_ids)
+        if VECTORIZE:
+            np = _numpy()
+            keep = np.ones(stop - start, dtype=bool) if keep is None else keep.copy()
+            if term_ids:
+                keep[self._np_hits(term_ids, start, stop) - start] = False
+            return keep
+        
+        keep = bytearray(b"\1") * (stop - start) if keep is None else bytearray(keep)
+        for term_id in term_ids:
+            for position in self._span_postings(term_id, start, stop):
+                keep[position - start] = 0
+        return keep
+    
+    def without_positions(self, positions: Iterable[int], keep=None, start: int = 0, stop: Optional[int] = None):
+        """
+        Drop specific recipes (e.g. tombstoned ones) from a filter mask.
+        
+        Args:
+            positions: Recipe positions to drop
+            keep: Filter mask, or None for all recipes
+            start: First recipe position covered by the mask
+            stop: End of the covered positions (default: all recipes)
+        
+        Returns:
+            New filter mask of the same kind (keep is not modified)
+        """
+        stop = self.n_recipes if stop is None else stop
+        positions = [p - start for p in positions if start <= p < stop]
+        if VECTORIZE:
+            np = _numpy()
+            keep = np.ones(stop - start, dtype=bool) if keep is None else keep.copy()
+            keep[positions] = False
+            return keep
+        
+        keep = bytearray(b"\1") * (stop - start) if keep is None else bytearray(keep)
+        for position in positions:
+            keep[position] = 0
+        return keep
+    
+    def only_positions(self, positions: Iterable[int], keep=None, start: int = 0, stop: Optional[int] = None):
+        """
+        Restrict a filter mask to specific recipes (e.g. full-text matches).
+        
+        Args:
+            positions: Recipe positions to keep
+            keep: Filter mask, or None for all recipes
+            start: First recipe position covered by the mask
+            stop: End of the covered positions (default: all recipes)
+        
+        Returns:
+            New filter mask of the same kind (keep is not modified)
+        """
+        stop = self.n_recipes if stop is None else stop
+        positions = [p - start for p in positions if start <= p < stop]
+        if VECTORIZE:
+            np = _numpy()
+            allowed = np.zeros(stop - start, dtype=bool)
+            allowed[positions] = True
+            return allowed if keep is None else allowed & keep
+        
+        allowed = bytearray(stop - start)
+        for position in positions:
+            if keep is None or keep[position]:
+                allowed[position] = 1
+        return allowed
+    
+    def recipe_sizes(self) -> Sequence[int]:
+        """
+        Get the number of ingredients of every recipe (row sums of the
+        recipe x ingredient incidence matrix).
+        
+        Returns:
+            Sequence indexed by recipe position
+        """
+        if self._totals is None:
+            if VECTORIZE:
+                np = _numpy()
+                self._totals = np.bincount(self._np_arrays()[1], minlength=self.n_recipes)
+            else:
+                totals = array(_U32, bytes(4 * self.n_recipes))
+                for position in self.postings_data:
+                    totals[position] += 1
+                self._totals = totals
+        return self._totals
+    
+    def unlock_counts(self, term_ids: Iterable[int], keep=None) -> Dict[int, int]:
+        """
+        Count, for every ingredient not owned, the recipes it would complete.
+        
+        A recipe missing exactly one ingredient (size - matched count == 1)
+        is completed by that ingredient alone, so grouping those recipes by
+        their missing ingredient answers "what should I buy next" for the
+        whole vocabulary at once. With NumPy the grouping is a single
+        bincount over the postings of the recipes missing one ingredient.
+        
+        Args:
+            term_ids: Owned (matched) term ids
+            keep: Optional filter mask over all recipes (see RecipeColumns.mask)
+        
+        Returns:
+            Dict of term id -> number of recipes it completes (terms
+            completing none are left out)
+        """
+        owned = set(term_ids)
+        totals = self.recipe_sizes()
+        
+        if VECTORIZE:
+            np = _numpy()
+            offsets, postings = self._np_arrays()
+            if owned:
+                used = np.bincount(self._np_hits(sorted(owned), 0, self.n_recipes), minlength=self.n_recipes)
+            else:
+                used = np.zeros(self.n_recipes, dtype=np.int64)
+            missing_one = totals - used == 1
+            if keep is not None:
+                missing_one &= keep
+            counts = np.bincount(self._np_posting_terms()[missing_one[postings]], minlength=len(self.terms))
+            counts[sorted(owned)] = 0
+            unlocking = np.flatnonzero(counts)
+            return dict(zip(unlocking.tolist(), counts[unlocking].tolist()))
+        
+        used: Dict[int, int] = {}
+        for term_id in owned:
+            for position in self.postings(term_id):
+                used[position] = used.get(position, 0) + 1
+        counts = {}
+        for term_id in range(len(self.terms)):
+            if term_id in owned:
+                continue
+            count = sum(1 for position in self.postings(term_id)
+                        if totals[position] - used.get(position, 0) == 1 and (keep is None or keep[position]))
+            if count:
+                counts[term_id] = count
+        return counts
+    
+    def missing_sets(self, term_ids: Iterable[int], max_missing: int, keep=None) -> Dict[Tuple[int, ...], int]:
+        """
+        Group the recipes missing between 1 and max_missing ingredients by
+        the exact ingredients they miss.
+        
+        This generalizes unlock_counts to buying several ingredients: the
+        recipes completed by buying a set of ingredients are exactly those
+        whose missing set is a subset of it. With NumPy the missing terms
+        are one masked selection over the postings of the qualifying recipes.
+        
+        Args:
+            term_ids: Owned (matched) term ids
+            max_missing: Largest number of missing ingredients to consider
+            keep: Optional filter mask over all recipes (see RecipeColumns.mask)
+        
+        Returns:
+            Dict of sorted tuple of missing term ids -> number of recipes
+            missing exactly those
+        """
+        owned = set(term_ids)
+        totals = self.recipe_sizes()
+        groups: Dict[Tuple[int, ...], int] = {}
+        
+        if VECTORIZE:
+            np = _numpy()
+            offsets, postings = self._np_arrays()
+            if owned:
+                used = np.bincount(self._np_hits(sorted(owned), 0, self.n_recipes), minlength=self.n_recipes)
+            else:
+                used = np.zeros(self.n_recipes, dtype=np.int64)
+            missing = totals - used
+            near = (missing >= 1) & (missing <= max_missing)
+            if keep is not None:
+                near &= keep
+            terms = self._np_posting_terms()
+            selected = near[postings]
+            if owned:
+                owned_mask = np.zeros(len(self.terms), dtype=bool)
+                owned_mask[sorted(owned)] = True
+                selected &= ~owned_mask[terms]
+            positions, terms = postings[selected], terms[selected]
+            # Postings are grouped by term, so a stable sort by position
+            # leaves each recipe's missing terms in ascending order
+            order = np.argsort(positions, kind="stable")
+            positions, terms = positions[order].tolist(), terms[order].tolist()
+            start = 0
+            for end in range(1, len(positions) + 1):
+                if end == len(positions) or positions[end] != positions[start]:
+                    key = tuple(terms[start:end])
+                    groups[key] = groups.get(key, 0) + 1
+                    start = end
+            return groups
+        
+        used: Dict[int, int] = {}
+        for term_id in owned:
+            for position in self.postings(term_id):
+                used[position] = used.get(position, 0) + 1
+        missing_terms: Dict[int, List[int]] = {}
+        for term_id in range(len(self.terms)):
+            if term_id in owned:
+                continue
+            for position in self.postings(term_id):
+                if 1 <= totals[position] - used.get(position, 0) <= max_missing and (keep is None or keep[position]):
+                    missing_terms.setdefault(position, []).append(term_id)
+        for terms in missing_terms.values():
+            key = tuple(terms)
+            groups[key] = groups.get(key, 0) + 1
+        return groups
+    
+    def score(self, term_ids: Iterable[int], keep=None, start: int = 0, stop: Optional[int] = None) -> MatchScores:
+        """
+        Count, for every recipe, how many of its ingredients are matched.
+        
+        The postings are the columns of the recipe x ingredient incidence
+        matrix, so multiplying it by the query's 0/1 term vector amounts to
+        counting recipe positions over the matched columns. With NumPy this
+        is a single bincount over the concatenated postings.
+        
+        Args:
+            term_ids: Matched term ids (the query vector)
+            keep: Optional filter mask from RecipeColumns.mask; recipes
+                  outside it are dropped before they are scored
+            start: First recipe position to score (a shard's range)
+            stop: End of the positions to score (default: all recipes)
+        
+        Returns:
+            MatchScores for recipes with at least one matched ingredient
+        """
+        stop = self.n_recipes if stop is None else stop
+        term_ids = sorted(term_ids)
+        if not term_ids:
+            return MatchScores([], [], [])
+        
+        totals = self.recipe_sizes()
+        
+        if VECTORIZE:
+            positions, used = self._np_scores(term_ids, keep, start, stop)
+            return MatchScores(positions.tolist(), used.tolist(), totals[positions].tolist())
+        
+        counts: Dict[int, int] = {}
+        for term_id in term_ids:
+            for position in self._span_postings(term_id, start, stop):
+                if keep is None or keep[position - start]:
+                    counts[position] = counts.get(position, 0) + 1
+        positions = sorted(counts)
+        return MatchScores(positions, [counts[p] for p in positions], [totals[p] for p in positions])
+    
+    def top_matches(self, term_ids: Iterable[int], k: int, sort_by: str = "relevance", keep=None,
+                    start: int = 0, stop: Optional[int] = None, max_missing: Optional[int] = None) -> List[tuple]:
+        """
+        Score recipes and select the best k for sort_by.
+        
+        With NumPy, scores, match percentages and sort keys stay in arrays:
+        the k-th best primary key is found with a partial sort, and only the
+        recipes at least that good are fully ordered. No per-candidate
+        Python objects are created, which keeps large corpora fast.
+        Ties are broken by position, exactly as in the pure-Python path.
+        
+        Args:
+            term_ids: Matched term ids (the query vector)
+            k: Number of results
+            sort_by: Sort mode (see candidate_sort_key)
+            keep: Optional filter mask (see score)
+            start: First recipe position to consider (a shard's range)
+            stop: End of the positions to consider (default: all recipes)
+            max_missing: Only keep recipes missing at most this many
+                         ingredients (recipe size - matched count), if given
+        
+        Returns:
+            Candidate tuples (position, used, total, match %, time or None),
+            best first
+        """
+        if k <= 0:
+            return []
+        if not VECTORIZE:
+            times = self.columns.time
+            candidates = []
+            for position, used_count, total in zip(*self.score(term_ids, keep, start, stop)):
+                if max_missing is not None and total - used_count > max_missing:
+                    continue
+                time = times[position]
+                candidates.append((position, used_count, total, (used_count / total) * 100,
+                                   time if time >= 0 else None))
+            sort_key = candidate_sort_key(sort_by)
+            if sort_key is None:
+                return candidates[:k]
+            return heapq.nsmallest(k, candidates, key=sort_key)
+        
+        ranked = self._np_ranked(term_ids, k, sort_by, keep, start, stop, max_missing)
+        return self._np_candidates(*ranked) if ranked is not None else []
+    
+    def ranked_matches(self, term_ids: Iterable[int], sort_by: str = "relevance", keep=None, start: int = 0,
+                       stop: Optional[int] = None, max_missing: Optional[int] = None,
+                       chunk_size: int = RANKED_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Yield every matching recipe in ranked order (an unbounded top_matches).
+        
+        Recipes are scored once. With NumPy the scores stay in arrays and
+        are ranked a window at a time: the best chunk_size recipes are
+        partitioned off and sorted, then the next window (twice as large)
+        from the rest, and so on, so a caller paging through the results
+        pays for the pages it reads rather than for sorting every match.
+        
+        Args:
+            term_ids: Matched term ids (the query vector)
+            sort_by: Sort mode (see candidate_sort_key)
+            keep: Optional filter mask (see score)
+            start: First recipe position to consider
+            stop: End of the positions to consider (default: all recipes)
+            max_missing: Only keep recipes missing at most this many ingredients
+            chunk_size: Candidate tuples built per step (NumPy path)
+        
+        Yields:
+            Candidate tuples (position, used, total, match %, time or None),
+            best first
+        """
+        if not VECTORIZE:
+            yield from self.top_matches(term_ids, self.n_recipes, sort_by, keep, start, stop, max_missing)
+            return
+        scored = self._np_sort_keys(term_ids, sort_by, keep, start, stop, max_missing)
+        if scored is None:
+            return
+        columns, keys = scored
+        np = _numpy()
+        remaining = np.arange(len(columns[0]))
+        window = chunk_size
+        while len(remaining):
+            order, remaining = _np_best(keys, window, remaining)
+            for offset in range(0, len(order), chunk_size):
+                yield from self._np_candidates(*(column[order[offset:offset + chunk_size]] for column in columns))
+            window *= 2
+    
+    def _np_ranked(self, term_ids: Iterable[int], k: int, sort_by: str, keep, start: int,
+                   stop: Optional[int], max_missing: Optional[int]):
+        """
+        Ranked candidate columns of the best k recipes, for top_matches.
+        
+        Returns:
+            (positions, used, totals, pct, times) arrays in ranked order, or
+            None if nothing matches
+        """
+        scored = self._np_sort_keys(term_ids, sort_by, keep, start, stop, max_missing)
+        if scored is None:
+            return None
+        columns, keys = scored
+        order = _np_best(keys, k, _numpy().arange(len(columns[0])))[0][:k]
+        return tuple(column[order] for column in columns)
+    
+    def _np_sort_keys(self, term_ids: Iterable[int], sort_by: str, keep, start: int, stop: Optional[int],
+                      max_missing: Optional[int]):
+        """
+        Score recipes into arrays, with their np.lexsort keys for sort_by.
+        
+        Returns:
+            Tuple of ((positions, used, totals, pct, times) in position
+            order, sort keys least significant first), or None if nothing
+            matches
+        """
+        np = _numpy()
+        stop = self.n_recipes if stop is None else stop
+        term_ids = sorted(term_ids)
+        if not term_ids:
+            return None
+        positions, used = self._np_scores(term_ids, keep, start, stop)
+        totals = self.recipe_sizes()[positions]
+        if max_missing is not None:
+            # Recipe size minus matched count: drop recipes missing too much
+            # before any sort key is computed
+            qualifying = np.flatnonzero(totals - used <= max_missing)
+            positions, used, totals = positions[qualifying], used[qualifying], totals[qualifying]
+        times = self.columns._np_arrays()[0][positions]
+        pct = used / totals * 100
+        time_key = np.where(times < 0, 999999, times)
+        
+        # np.lexsort keys, least significant first (see candidate_sort_key)
+        if sort_by == "relevance" or sort_by == "match-desc":
+            keys = (time_key, -used, -pct)
+        elif sort_by == "used-desc":
+            keys = (-pct, -used)
+        elif sort_by == "missing-asc":
+            keys = (-pct, totals - used)
+        elif sort_by == "time-asc":
+            keys = (-pct, time_key)
+        else:
+            keys = ()
+        return (positions, used, totals, pct, times), keys
+    
+    @staticmethod
+    def _np_candidates(positions, used, totals, pct, times) -> List[tuple]:
+        """Candidate tuples from ranked columns (see _np_ranked)"""
+        return [
+            (position, used_count, total, percentage, time if time >= 0 else None)
+            for position, used_count, total, percentage, time in zip(
+                positions.tolist(), used.tolist(), totals.tolist(), pct.tolist(), times.tolist())
+        ]
+    
+    def _span_postings(self, term_id: int, start: int, stop: int) -> Sequence[int]:
+        """Posting list of a term restricted to positions in [start, stop)"""
+        postings = self.postings(term_id)
+        if start == 0 and stop >= self.n_recipes:
+            return postings
+        return postings[bisect_left(postings, start):bisect_left(postings, stop)]
+    
+    def _np_hits(self, term_ids: List[int], start: int, stop: int):
+        """Concatenated postings of the terms, restricted to positions in [start, stop)"""
+        np = _numpy()
+        offsets, postings = self._np_arrays()
+        slices = [postings[offsets[t]:offsets[t + 1]] for t in term_ids]
+        if start > 0 or stop < self.n_recipes:
+            slices = [p[np.searchsorted(p, start):np.searchsorted(p, stop)] for p in slices]
+        return np.concatenate(slices)
+    
+    def _np_scores(self, term_ids: List[int], keep, start: int, stop: int):
+        """Positions with at least one matched ingredient (and in keep) and their counts"""
+        np = _numpy()
+        hits = self._np_hits(term_ids, start, stop)
+        if start:
+            hits = hits - np.uint32(start)
+        used = np.bincount(hits, minlength=stop - start)
+        local = np.flatnonzero(used if keep is None else (used > 0) & keep)
+        return local + start, used[local]
+    
+    def _np_posting_terms(self):
+        """Term id of every posting (parallel to the postings array)"""
+        if self._np_terms is None:
+            np = _numpy()
+            offsets, _ = self._np_arrays()
+            self._np_terms = np.repeat(np.arange(len(self.terms)), np.diff(offsets))
+        return self._np_terms
+    
+    def _np_arrays(self):
+        """Zero-copy NumPy views of the offsets and postings"""
+        if self._np_offsets is None:
+            np = _numpy()
+            self._np_offsets = np.frombuffer(self.offsets, dtype=np.uint32).astype(np.int64)
+            self._np_postings = np.frombuffer(self.postings_data, dtype=np.uint32)
+        return self._np_offsets, self._np_postings
+    
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+class DeltaSegment:
+    """
+    Recipes added after the base index was built, indexed in memory.
+    
+    Adding a recipe appends to its terms' posting lists and to the metadata
+    columns, and removing one sets a tombstone, so both are O(recipe size).
+    Positions are local (0, 1, ...) and never reused; searches see only
+    live recipes. Scoring is pure Python over the posting lists, which is
+    fine for the small number of recipes a segment holds between
+    compactions.
+    """
+    
+    def __init__(self):
+        self.recipes: List[dict] = []
+        self.recipe_terms: List[tuple] = []
+        self.postings: Dict[int, List[int]] = {}
+        self.time: List[Optional[int]] = []
+        self.categories: List[frozenset] = []
+        self.live: List[bool] = []
+        self.live_count = 0
+        self._match_index = IngredientMatchIndex([])
+    
+    @property
+    def terms(self) -> List[str]:
+        return self._match_index.terms
+    
+    @property
+    def term_ids(self) -> Dict[str, int]:
+        return self._match_index.term_ids
+    
+    def __len__(self) -> int:
+        return len(self.recipes)
+    
+    def add(self, recipe: dict) -> int:
+        """
+        Index a recipe.
+        
+        Args:
+            recipe: Recipe dict (kept by the segment - do not modify)
+        
+        Returns:
+            Local position of the recipe
+        """
+        position = len(self.recipes)
+        term_ids = []
+        for ingredient in recipe["ingredients"]:
+            term = normalize_ingredient_name(ingredient)
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                term_id = self._match_index.add_term(term)
+            self.postings.setdefault(term_id, []).append(position)
+            term_ids.append(term_id)
+        
+        minutes = recipe.get("time")
+        self.recipes.append(recipe)
+        self.recipe_terms.append(tuple(term_ids))
+        self.time.append(minutes if isinstance(minutes, int) and minutes >= 0 else None)
+        self.categories.append(frozenset(c.lower() for c in recipe.get("category", [])))
+        self.live.append(True)
+        self.live_count += 1
+        return position
+    
+    def remove(self, position: int) -> None:
+        """Tombstone a recipe (its postings are skipped from now on)"""
+        if self.live[position]:
+            self.live[position] = False
+            self.live_count -= 1
+    
+    def matching_terms(self, ingredients: Iterable[str]) -> Set[int]:
+        """Find every segment term matching any of the ingredients (see IngredientIndex)"""
+        terms: Set[int] = set()
+        for ingredient in ingredients:
+            terms.update(self._match_index.match(ingredient))
+        return terms
+    
+    def _passes(self, position: int, diet: Optional[str], max_minutes: Optional[int]) -> bool:
+        """Same filter semantics as RecipeColumns.mask (diet lowercased)"""
+        time = self.time[position]
+        if diet and diet not in self.categories[position]:
+            return False
+        return max_minutes is None or bool(time and time <= max_minutes)
+    
+    def filter_positions(self, positions: Iterable[int], diet: str = None, max_minutes: int = None,
+                         exclude_term_ids: Iterable[int] = ()) -> List[int]:
+        """
+        Keep the live local positions passing the search filters.
+        
+        Args:
+            positions: Local positions
+            diet: Required category/diet (None for any)
+            max_minutes: Maximum cooking time (None for any)
+            exclude_term_ids: Segment term ids whose recipes are dropped
+        
+        Returns:
+            Passing positions, in the given order
+        """
+        excluded = set()
+        for term_id in exclude_term_ids:
+            excluded.update(self.postings.get(term_id, ()))
+        diet = diet.lower() if diet else None
+        return [position for position in positions if self.live[position] and position not in excluded and
+                self._passes(position, diet, max_minutes)]
+    
+    def unlock_counts(self, term_ids: Iterable[int], diet: str = None, max_minutes: int = None) -> Dict[int, int]:
+        """Count the live recipes each non-owned term would complete (see IngredientIndex)"""
+        owned = set(term_ids)
+        diet = diet.lower() if diet else None
+        counts: Dict[int, int] = {}
+        for position, recipe_terms in enumerate(self.recipe_terms):
+            if not self.live[position] or not self._passes(position, diet, max_minutes):
+                continue
+            missing = [term_id for term_id in recipe_terms if term_id not in owned]
+            if len(missing) == 1:
+                counts[missing[0]] = counts.get(missing[0], 0) + 1
+        return counts
+    
+    def missing_sets(self, term_ids: Iterable[int], max_missing: int, diet: str = None,
+                     max_minutes: int = None) -> Dict[Tuple[int, ...], int]:
+        """Group live recipes by the non-owned terms they miss (see IngredientIndex)"""
+        owned = set(term_ids)
+        diet = diet.lower() if diet else None
+        groups: Dict[Tuple[int, ...], int] = {}
+        for position, recipe_terms in enumerate(self.recipe_terms):
+            if not self.live[position] or not self._passes(position, diet, max_minutes):
+                continue
+            missing = tuple(sorted({term_id for term_id in recipe_terms if term_id not in owned}))
+            if 1 <= len(missing) <= max_missing:
+                groups[missing] = groups.get(missing, 0) + 1
+        return groups
+    
+    def top_matches(self, term_ids: Iterable[int], k: int, sort_by: str = "relevance", diet: str = None,
+                    max_minutes: int = None, exclude_term_ids: Iterable[int] = (), offset: int = 0,
+                    max_missing: Optional[int] = None, allowed: Optional[Set[int]] = None) -> List[tuple]:
+        """
+        Score live recipes and select the best k (see IngredientIndex.top_matches).
+        
+        Args:
+            term_ids: Matched segment term ids
+            k: Number of results
+            sort_by: Sort mode
+            diet: Required category/diet (None for any)
+            max_minutes: Maximum cooking time (None for any)
+            exclude_term_ids: Segment term ids whose recipes are skipped
+            offset: Added to local positions (the segment's first global position)
+            max_missing: Only keep recipes missing at most this many ingredients
+            allowed: Only consider these local positions (None for all)
+        
+        Returns:
+            Candidate tuples (position + offset, used, total, match %, time or None)
+        """
+        if k <= 0 or not self.live_count:
+            return []
+        excluded = set()
+        for term_id in exclude_term_ids:
+            excluded.update(self.postings.get(term_id, ()))
+        diet = diet.lower() if diet else None
+        
+        counts: Dict[int, int] = {}
+        for term_id in term_ids:
+            for position in self.postings.get(term_id, ()):
+                counts[position] = counts.get(position, 0) + 1
+        
+        candidates = []
+        for position in sorted(counts):
+            if not self.live[position] or position in excluded or not self._passes(position, diet, max_minutes):
+                continue
+            if allowed is not None and position not in allowed:
+                continue
+            time = self.time[position]
+            used_count = counts[position]
+            total = len(self.recipe_terms[position])
+            if max_missing is not None and total - used_count > max_missing:
+                continue
+            candidates.append((position + offset, used_count, total, (used_count / total) * 100, time))
+        return merge_top(k, sort_by, [candidates])
+
+
+def _numpy():
+    """Import NumPy on first use (only the vectorized paths need it)"""
+    global _np_module
+    if _np_module is None:
+        import numpy
+        _np_module = numpy
+    return _np_module
+
+
+def _np_best(keys: tuple, k: int, candidates):
+    """
+    Split candidates into those ranked among the best k, sorted, and the rest.
+    
+    Args:
+        keys: np.lexsort keys over all recipes (empty to keep position order)
+        k: Number of results wanted
+        candidates: Ascending indexes into the keys
+    
+    Returns:
+        Tuple of (ranked indexes - at least k of them if available, more
+        when the k-th primary key is tied; every one ranks before the rest,
+        remaining candidates, still ascending)
+    """
+    np = _numpy()
+    if not keys:
+        return candidates[:k], candidates[k:]
+    primary = keys[-1][candidates]
+    if len(candidates) > k:
+        # Everything at least as good as the k-th best primary key
+        kth = np.partition(primary, k - 1)[k - 1]
+        better = primary <= kth
+        selected, rest = candidates[better], candidates[~better]
+    else:
+        selected, rest = candidates, candidates[:0]
+    # lexsort is stable and selected is ascending, so ties keep position order
+    return selected[np.lexsort(tuple(key[selected] for key in keys))], rest
+
+
+def _int_view(buffer, offset: int, count: int, typecode: str = _U32) -> Sequence[int]:
+    """Zero-copy integer array view into a little-endian buffer (copies on big-endian hosts)"""
+    size = count * array(typecode).itemsize
+    view = memoryview(buffer)[offset:offset + size]
+    if len(view) != size:
+        raise ValueError("Truncated index file")
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    values = array(typecode, view.tobytes())
+    values.byteswap()
+    return values
+
+
+def load_or_build(data_path: str, index_path: str, builder: Callable[[], "IngredientIndex"],
+                  loader: Optional[Callable] = None) -> IngredientIndex:
+    """
+    Load the prebuilt index for a data file, rebuilding it if stale.
+    
+    A rebuilt index is written back to index_path when possible so the
+    next process can map it; write failures are ignored.
+    
+    Args:
+        data_path: Recipe data file the index describes
+        index_path: Prebuilt index file
+        builder: Callable building a fresh index (used only if stale)
+        loader: Callable (path, digest) mapping an index file, or None if
+                stale (default: IngredientIndex.load; e.g. TextIndex.load)
+    
+    Returns:
+        IngredientIndex (or whatever loader and builder return)
+    """
+    digest = file_digest(data_path)
+    index = (loader or IngredientIndex.load)(index_path, digest)
+    if index is not None:
+        return index
+    
+    index = builder()
+    try:
+        index.save(index_path, digest)
+    except OSError:
+        pass  # Read-only install - keep the in-memory index
+    return index
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point: build an index file"""
+    from providers.fallback_recipes import RECIPES_PATH
+    from providers.recipe_store import build_index, build_text_index, index_path_for, text_index_path_for
+    
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "build":
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 1
+    
+    data_path = argv[1] if len(argv) > 1 else RECIPES_PATH
+    index_path = argv[2] if len(argv) > 2 else index_path_for(data_path)
+    
+    index = build_index(data_path)
+    digest = file_digest(data_path)
+    index.save(index_path, digest)
+    print(f"✓ Indexed {index.n_recipes} recipes ({len(index)} ingredients) -> {index_path}")
+    
+    # The full-text index is built alongside, next to the ingredient index
+    text_path = text_index_path_for(index_path)
+    text_index = build_text_index(data_path)
+    text_index.save(text_path, digest)
+    print(f"✓ Indexed {text_index.n_docs} recipes ({len(text_index)} words) -> {text_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,928 @@
+"""
+Searchable local recipe data files
+
+A recipe data file is JSON Lines: a header line
+({"format": "recipe-finder-recipes", "version": 1, "count": N}) followed by
+one JSON recipe per line. A RecipeStore pairs a data file with its
+prebuilt index (see providers/recipe_index.py) and answers searches from
+the index alone; only the recipes actually returned are read and parsed,
+so a store can hold far more recipes than fit comfortably in memory as
+dicts. Free-text queries use a second prebuilt index of the recipes' words
+(see providers/text_index.py).
+
+Usage:
+    python -m providers.recipe_store check [DATA_FILE] [INDEX_FILE]
+"""
+
+import heapq
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from core.model import Recipe, Provider, IngredientItem
+from core.normalize import normalize_ingredient_name, parse_text_query
+from core.performance import LRUCache, json_dumps, json_loads
+from core.similarity import LSHIndex, MinHasher, ingredient_tokens, jaccard
+from providers.recipe_index import (
+    DeltaSegment,
+    IngredientIndex,
+    candidate_sort_key,
+    file_digest,
+    load_or_build,
+    merge_top
+)
+from providers.text_index import TextIndex, recipe_tokens
+
+DATA_FORMAT = "recipe-finder-recipes"
+DATA_VERSION = 1
+
+# Shared recipe templates kept per store (see RecipeStore._template)
+TEMPLATE_CACHE_SIZE = 4096
+
+# One hash family for every store, so signatures are comparable
+_MINHASHER = MinHasher()
+
+
+def read_header(line: str) -> dict:
+    """Parse and validate a recipe file header line"""
+    header = json_loads(line)
+    if header.get("format") != DATA_FORMAT:
+        raise ValueError(f"Not a recipe data file (format={header.get('format')!r})")
+    if header.get("version", 0) > DATA_VERSION:
+        raise ValueError(f"Unsupported recipe data version {header['version']} (max {DATA_VERSION})")
+    return header
+
+
+def read_recipe_file(path: str) -> List[dict]:
+    """
+    Read recipes from a JSON Lines recipe data file.
+    
+    Args:
+        path: Path to the data file
+    
+    Returns:
+        List of recipe dicts in file order
+    
+    Raises:
+        ValueError: If the file header is missing or has an unsupported version
+    """
+    with open(path, "rb") as f:
+        read_header(f.readline())
+        return [json_loads(line) for line in f if line.strip()]
+
+
+def iter_recipe_rows(path: str) -> Iterator[Tuple[int, dict]]:
+    """
+    Stream recipes from a data file with the byte offset of each line.
+    
+    Args:
+        path: Path to the data file
+    
+    Yields:
+        (byte offset, recipe dict) in file order
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        read_header(header)
+        offset = len(header)
+        for line in f:
+            if line.strip():
+                yield offset, json_loads(line)
+            offset += len(line)
+
+
+def write_recipe_file(path: str, recipes: Iterable[dict], count: Optional[int] = None) -> None:
+    """
+    Write recipes as a JSON Lines data file (atomically replaces path).
+    
+    Args:
+        path: Output file path
+        recipes: Recipe dicts in order (may be a stream if count is given)
+        count: Number of recipes, required up front for the header
+    """
+    if count is None:
+        recipes = list(recipes)
+        count = len(recipes)
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(json_dumps({"format": DATA_FORMAT, "version": DATA_VERSION, "count": count}) + "\n")
+        for recipe in recipes:
+            f.write(json_dumps(recipe) + "\n")
+    os.replace(tmp_path, path)
+
+
+def index_path_for(data_path: str) -> str:
+    """Default index file location for a data file (same name, .idx)"""
+    return os.path.splitext(data_path)[0] + ".idx"
+
+
+def text_index_path_for(path: str) -> str:
+    """Default full-text index location for a data (or index) file (same name, .tidx)"""
+    return os.path.splitext(path)[0] + ".tidx"
+
+
+def build_index(data_path: str) -> IngredientIndex:
+    """
+    Build the index for a data file, streaming it in one pass.
+    
+    Args:
+        data_path: Recipe data file
+    
+    Returns:
+        In-memory IngredientIndex including the line offset of every recipe
+    """
+    row_offsets = array("Q")
+    
+    def recipes():
+        for offset, recipe in iter_recipe_rows(data_path):
+            row_offsets.append(offset)
+            yield recipe
+    
+    return IngredientIndex.build(recipes(), row_offsets)
+
+
+def build_text_index(data_path: str) -> TextIndex:
+    """
+    Build the full-text index for a data file, streaming it in one pass.
+    
+    Args:
+        data_path: Recipe data file
+    
+    Returns:
+        In-memory TextIndex
+    """
+    return TextIndex.build(recipe for _, recipe in iter_recipe_rows(data_path))
+
+
+class RecipeStore:
+    """
+    A recipe data file and its index, searchable without loading every recipe.
+    
+    Recipes can be added, removed and updated at runtime without rebuilding
+    the index: additions go to an in-memory DeltaSegment (positions after
+    the data file's), removals tombstone a position. Both cost
+    O(recipe size). compact() writes the live recipes back to the data
+    file and rebuilds the index.
+    """
+    
+    def __init__(self, data_path: str, index_path: Optional[str] = None, provider: Provider = Provider.THEMEALDB):
+        """
+        Args:
+            data_path: JSON Lines recipe data file
+            index_path: Prebuilt index file (default: data_path with .idx)
+            provider: Provider reported on search results
+        """
+        self.data_path = data_path
+        self.index_path = index_path or index_path_for(data_path)
+        self.text_index_path = text_index_path_for(self.index_path)
+        self.provider = provider
+        self._index = None
+        self._text_index = None
+        self._recipes = None
+        self._data_map = None
+        self._templates = LRUCache(TEMPLATE_CACHE_SIZE)
+        self._delta = DeltaSegment()
+        self._deleted: Set[int] = set()
+        self._added_ids: Dict[str, int] = {}
+        self._lsh: Optional[LSHIndex] = None
+    
+    @property
+    def index(self) -> IngredientIndex:
+        """The prebuilt index, mapped on first use (rebuilt if the data changed)"""
+        if self._index is None:
+            self._index = load_or_build(self.data_path, self.index_path, lambda: build_index(self.data_path))
+        return self._index
+    
+    @property
+    def text_index(self) -> TextIndex:
+        """The prebuilt full-text index, mapped on first use (rebuilt if the data changed)"""
+        if self._text_index is None:
+            self._text_index = load_or_build(self.data_path, self.text_index_path,
+                                             lambda: build_text_index(self.data_path), TextIndex.load)
+        return self._text_index
+    
+    @property
+    def modified(self) -> bool:
+        """True if recipes were added or removed since the data file was written"""
+        return bool(self._deleted or len(self._delta))
+    
+    def _file_recipes(self) -> List[dict]:
+        if self._recipes is None:
+            self._recipes = read_recipe_file(self.data_path)
+        return self._recipes
+    
+    def recipes(self) -> List[dict]:
+        """
+        Get every live recipe, loading the whole data file on first call.
+        
+        Returns:
+            List of recipe dicts (shared - do not modify)
+        """
+        recipes = self._file_recipes()
+        if not self.modified:
+            return recipes
+        live = [recipe for position, recipe in enumerate(recipes) if position not in self._deleted]
+        live.extend(recipe for recipe, alive in zip(self._delta.recipes, self._delta.live) if alive)
+        return live
+    
+    def count(self) -> int:
+        """
+        Get the number of live recipes without loading them.
+        
+        Returns:
+            Recipe count (data file header, adjusted for runtime changes)
+        """
+        if self._recipes is not None:
+            base = len(self._recipes)
+        else:
+            with open(self.data_path, "rb") as f:
+                base = read_header(f.readline())["count"]
+        return base - len(self._deleted) + self._delta.live_count
+    
+    def recipe_data(self, position: int) -> dict:
+        """
+        Get one recipe dict, parsing only its line of the data file.
+        
+        Args:
+            position: Recipe position (data file recipes first, then added ones)
+        
+        Returns:
+            Recipe dict
+        """
+        n_base = self.index.n_recipes
+        if position >= n_base:
+            return self._delta.recipes[position - n_base]
+        if self._recipes is not None:
+            return self._recipes[position]
+        rows = self.index.row_offsets
+        if rows is None:
+            return self._file_recipes()[position]
+        if self._data_map is None:
+            with open(self.data_path, "rb") as f:
+                self._data_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = rows[position]
+        end = self._data_map.find(b"\n", start)
+        return json_loads(self._data_map[start:end if end >= 0 else len(self._data_map)])
+    
+    def _template(self, position: int) -> tuple:
+        """
+        Get the static, query-independent part of a recipe.
+        
+        The template Recipe holds everything except used/missing ingredients
+        (ingredient items, source URL, categories, ...) and is shared by every
+        search result for that recipe, so each result only allocates its own
+        used/missing lists. Treat the shared fields as read-only.
+        
+        Args:
+            position: Recipe position
+        
+        Returns:
+            Tuple of (template Recipe, tuple of ingredient term ids of the
+            recipe's segment)
+        """
+        entry = self._templates.get(position)
+        if entry is None:
+            recipe_data = self.recipe_data(position)
+            recipe_ings = recipe_data["ingredients"]
+            in_delta = position >= self.index.n_recipes
+            term_ids = self._delta.term_ids if in_delta else self.index.term_ids
+            
+            template = Recipe(
+                id=recipe_data["id"],
+                provider=self.provider,
+                title=recipe_data["title"],
+                image_url=None,
+                source_url=f"https://www.google.com/search?q={recipe_data['title'].replace(' ', '+')}+recipe",
+                ingredients=[IngredientItem(name=ing) for ing in recipe_ings],
+                instructions=recipe_data["instructions"],
+                servings=recipe_data.get("servings"),
+                ready_in_minutes=recipe_data.get("time"),
+                cuisine=recipe_data.get("cuisine"),
+                category_or_diet=recipe_data.get("category", []),
+                cost_per_serving_usd=None,
+                source=self.data_path
+            )
+            entry = (template, tuple(term_ids[normalize_ingredient_name(ing)] for ing in recipe_ings))
+            self._templates.put(position, entry)
+        return entry
+    
+    def match(self, ingredients: Iterable[str]) -> tuple:
+        """
+        Find the indexed terms matching ingredients, in every segment.
+        
+        Returns:
+            Tuple of (data file index term ids, added recipes' term ids)
+        """
+        ingredients = list(ingredients)
+        return self.index.matching_terms(ingredients), self._delta.matching_terms(ingredients)
+    
+    def materialize(self, position: int, matched_terms: tuple) -> Recipe:
+        """Overlay a query's used/missing ingredients (see match) on a shared recipe template"""
+        template, recipe_terms = self._template(position)
+        matched = matched_terms[position >= self.index.n_recipes]
+        used = []
+        missing = []
+        for item, term_id in zip(template.ingredients, recipe_terms):
+            if term_id in matched:
+                used.append(item.name)
+            else:
+                missing.append(item.name)
+        return replace(template, used_ingredients=used, missing_ingredients=missing)
+    
+    def delta_matches(self, matched_terms: tuple, k: int, sort_by: str, diet: str = None, max_minutes: int = None,
+                      exclude: List[str] = None, max_missing: Optional[int] = None,
+                      text_matches: Optional[Dict[int, float]] = None) -> List[tuple]:
+        """Top-k candidates among recipes added at runtime (global positions; only
+        text_matches' positions if given)"""
+        if not self._delta.live_count:
+            return []
+        n_base = self.index.n_recipes
+        excluded = self._delta.matching_terms(exclude) if exclude else ()
+        allowed = None if text_matches is None else {p - n_base for p in text_matches if p >= n_base}
+        return self._delta.top_matches(matched_terms[1], k, sort_by, diet, max_minutes, excluded,
+                                       offset=n_base, max_missing=max_missing, allowed=allowed)
+    
+    def text_matches(self, query: str) -> Dict[int, float]:
+        """
+        Find the live recipes containing every word of a free-text query.
+        
+        Data file recipes are scored from the full-text index's posting
+        lists; recipes added at runtime are scored against its statistics.
+        
+        Args:
+            query: Free-text query (a trailing * makes a word a prefix)
+        
+        Returns:
+            Dict of position -> BM25 score
+        """
+        text_index = self.text_index
+        matches = text_index.search(query)
+        for position in self._deleted:
+            matches.pop(position, None)
+        n_base = self.index.n_recipes
+        for position, recipe in enumerate(self._delta.recipes):
+            if self._delta.live[position]:
+                score = text_index.score_tokens(query, recipe_tokens(recipe))
+                if score is not None:
+                    matches[n_base + position] = score
+        return matches
+    
+    def text_search(self, query: str, k: Optional[int] = 10, diet: str = None, max_minutes: int = None,
+                    exclude: List[str] = None) -> List[Tuple[float, int]]:
+        """
+        Rank recipes by BM25 relevance to a free-text query.
+        
+        Only the posting lists of the query's words are read; the filters
+        are checked for the matching recipes alone.
+        
+        Args:
+            query: Free-text query
+            k: Number of results (None for every match)
+            diet: Dietary filter
+            max_minutes: Maximum cooking time in minutes
+            exclude: Ingredients to exclude
+        
+        Returns:
+            List of (score, position), best first (ties by position)
+        """
+        matches = self.text_matches(query)
+        if not matches or (k is not None and k <= 0):
+            return []
+        index = self.index
+        n_base = index.n_recipes
+        base = [position for position in matches if position < n_base]
+        if base and (diet or max_minutes is not None or exclude):
+            keep = index.columns.mask(diet, max_minutes)
+            if exclude:
+                keep = index.exclude_terms(index.matching_terms(exclude), keep)
+            base = [position for position in base if keep is None or keep[position]]
+        added = [position - n_base for position in matches if position >= n_base]
+        if added:
+            excluded = self._delta.matching_terms(exclude) if exclude else ()
+            base += [n_base + position for position in self._delta.filter_positions(added, diet, max_minutes, excluded)]
+        scored = ((matches[position], position) for position in base)
+        if k is None:
+            return sorted(scored, key=lambda item: (-item[0], item[1]))
+        return heapq.nsmallest(k, scored, key=lambda item: (-item[0], item[1]))
+    
+    def deleted_positions(self) -> List[int]:
+        """Data file positions of removed recipes"""
+        return sorted(self._deleted)
+    
+    @property
+    def position_count(self) -> int:
+        """Number of positions in use: data file recipes, then added ones (removed ones included)"""
+        return self.index.n_recipes + len(self._delta)
+    
+    def top_candidates(self, user_ingredients: List[str], max_results: int = 10, diet: str = None,
+                       max_minutes: int = None, sort_by: str = "relevance", exclude: List[str] = None,
+                       max_missing: Optional[int] = None, query: Optional[str] = None) -> tuple:
+        """
+        Score the store's recipes for a query without building Recipe objects.
+        
+        Args:
+            Same as search
+        
+        Returns:
+            Tuple of (top candidate tuples (position, used, total, match %,
+            time or None), matched terms for materialize)
+        """
+        index = self.index
+        
+        # Use the match index to find every indexed ingredient the user's
+        # ingredients match (exact, containment or plural) without a vocabulary scan
+        matched_terms = self.match(user_ingredients)
+        keep, text_matches = self._search_mask(diet, max_minutes, exclude, query)
+        
+        # Score the remaining recipes and select the top results for sort_by,
+        # merged with the best recipes added at runtime
+        # (only recipes missing at most max_missing ingredients, if given)
+        top = index.top_matches(matched_terms[0], max_results, sort_by, keep, max_missing=max_missing)
+        if self._delta.live_count:
+            delta_top = self.delta_matches(matched_terms, max_results, sort_by, diet, max_minutes, exclude,
+                                           max_missing, text_matches)
+            top = merge_top(max_results, sort_by, [top, delta_top])
+        return top, matched_terms
+    
+    def ranked_candidates(self, user_ingredients: List[str], diet: str = None, max_minutes: int = None,
+                          sort_by: str = "relevance", exclude: List[str] = None, max_missing: Optional[int] = None,
+                          query: Optional[str] = None) -> tuple:
+        """
+        Rank every matching recipe, lazily (see IngredientIndex.ranked_matches).
+        
+        The data file recipes are ranked once up front; the returned
+        iterator holds that ranking, so consuming it page by page never
+        scores the query again.
+        
+        Args:
+            Same as search, without max_results
+        
+        Returns:
+            Tuple of (iterator of candidate tuples, best first, matched
+            terms for materialize)
+        """
+        matched_terms = self.match(user_ingredients)
+        keep, text_matches = self._search_mask(diet, max_minutes, exclude, query)
+        ranked = self.index.ranked_matches(matched_terms[0], sort_by, keep, max_missing=max_missing)
+        if self._delta.live_count:
+            delta_ranked = self.delta_matches(matched_terms, self._delta.live_count, sort_by, diet, max_minutes,
+                                              exclude, max_missing, text_matches)
+            ranked = heapq.merge(ranked, delta_ranked, key=candidate_sort_key(sort_by) or (lambda c: c[0]))
+        return ranked, matched_terms
+    
+    def _search_mask(self, diet: Optional[str], max_minutes: Optional[int], exclude: Optional[List[str]],
+                     query: Optional[str]) -> tuple:
+        """
+        Filter mask over the data file recipes for a search.
+        
+        Returns:
+            Tuple of (filter mask, free-text matches or None without a
+            query, or with a query of only stopwords)
+        """
+        index = self.index
+        
+        # Apply the diet and max time filters up front, as a mask over the
+        # metadata columns, so filtered-out recipes are never scored
+        keep = index.columns.mask(diet, max_minutes)
+        
+        # Remove recipes containing excluded ingredients (posting list difference)
+        if exclude:
+            keep = index.exclude_terms(index.matching_terms(exclude), keep)
+        
+        # Skip recipes removed at runtime
+        if self._deleted:
+            keep = index.without_positions(self._deleted, keep)
+        
+        # Only consider recipes matching the free-text query (full-text index
+        # lookup); a query of only stopwords has no words to match
+        text_matches = None
+        if parse_text_query(query):
+            text_matches = self.text_matches(query)
+            keep = index.only_positions(text_matches, keep)
+        return keep, text_matches
+    
+    def search(self, user_ingredients: List[str], max_results: int = 10, diet: str = None, max_minutes: int = None,
+               sort_by: str = "relevance", exclude: List[str] = None, max_missing: Optional[int] = None,
+               query: Optional[str] = None) -> List[Recipe]:
+        """
+        Search the store (see providers.fallback_recipes.search_fallback_recipes).
+        
+        Args:
+            user_ingredients: List of ingredients user has
+            max_results: Maximum results to return
+            diet: Dietary filter (vegetarian, vegan, etc.)
+            max_minutes: Maximum cooking time in minutes
+            sort_by: Sort method (relevance, match-desc, used-desc, missing-asc, time-asc)
+            exclude: Ingredients to exclude
+            max_missing: Only return recipes missing at most this many ingredients
+            query: Only return recipes containing every word of this free-text query
+        
+        Returns:
+            List of matching recipes
+        """
+        top, matched_terms = self.top_candidates(user_ingredients, max_results, diet, max_minutes, sort_by, exclude,
+                                                 max_missing, query)
+        
+        # Build recipe objects only for the results returned
+        return [self.materialize(position, matched_terms) for position, *_ in top]
+    
+    def unlock_counts(self, pantry: List[str], diet: str = None, max_minutes: int = None) -> Dict[str, int]:
+        """
+        Count, per ingredient not in the pantry, the recipes buying it would
+        make fully makeable (see IngredientIndex.unlock_counts).
+        
+        Args:
+            pantry: Ingredients the user has (matched like search ingredients)
+            diet: Only count recipes with this category/diet
+            max_minutes: Only count recipes taking at most this long
+        
+        Returns:
+            Dict of normalized ingredient name -> number of recipes completed
+        """
+        index = self.index
+        matched_terms = self.match(pantry)
+        keep = index.columns.mask(diet, max_minutes)
+        if self._deleted:
+            keep = index.without_positions(self._deleted, keep)
+        
+        counts = {index.terms[term_id]: count for term_id, count in index.unlock_counts(matched_terms[0], keep).items()}
+        if self._delta.live_count:
+            delta_terms = self._delta.terms
+            for term_id, count in self._delta.unlock_counts(matched_terms[1], diet, max_minutes).items():
+                counts[delta_terms[term_id]] = counts.get(delta_terms[term_id], 0) + count
+        return counts
+    
+    def missing_sets(self, pantry: List[str], max_missing: int, diet: str = None,
+                     max_minutes: int = None) -> Dict[Tuple[str, ...], int]:
+        """
+        Group the recipes missing between 1 and max_missing ingredients by
+        the ingredients they miss (see IngredientIndex.missing_sets).
+        
+        Args:
+            pantry: Ingredients the user has (matched like search ingredients)
+            max_missing: Largest number of missing ingredients to consider
+            diet: Only count recipes with this category/diet
+            max_minutes: Only count recipes taking at most this long
+        
+        Returns:
+            Dict of sorted tuple of normalized ingredient names -> number of
+            recipes missing exactly those
+        """
+        index = self.index
+        matched_terms = self.match(pantry)
+        keep = index.columns.mask(diet, max_minutes)
+        if self._deleted:
+            keep = index.without_positions(self._deleted, keep)
+        
+        groups: Dict[Tuple[str, ...], int] = {}
+        segments = [(index.missing_sets(matched_terms[0], max_missing, keep), index.terms)]
+        if self._delta.live_count:
+            segments.append((self._delta.missing_sets(matched_terms[1], max_missing, diet, max_minutes),
+                             self._delta.terms))
+        for segment_groups, terms in segments:
+            for term_ids, count in segment_groups.items():
+                names = tuple(sorted(terms[term_id] for term_id in term_ids))
+                groups[names] = groups.get(names, 0) + count
+        return groups
+    
+    def _is_live(self, position: int) -> bool:
+        n_base = self.index.n_recipes
+        if position >= n_base:
+            return self._delta.live[position - n_base]
+        return position not in self._deleted
+    
+    def _similarity_index(self) -> LSHIndex:
+        """
+        LSH buckets of every recipe's ingredient MinHash, built on first use.
+        
+        The data file recipes are hashed straight from the index's posting
+        lists (no recipe is parsed); recipes added later join incrementally
+        and removed ones are skipped when querying.
+        """
+        if self._lsh is None:
+            index = self.index
+            signatures = _MINHASHER.signatures(
+                index.n_recipes, ((term, index.postings(term_id)) for term_id, term in enumerate(index.terms)))
+            lsh = LSHIndex.build(signatures, keep=index.recipe_sizes())
+            for position, recipe in enumerate(self._delta.recipes):
+                tokens = ingredient_tokens(recipe["ingredients"])
+                if tokens:
+                    lsh.add(index.n_recipes + position, _MINHASHER.signature(tokens))
+            self._lsh = lsh
+        return self._lsh
+    
+    def similar(self, ingredients: Iterable[str], k: int = 10) -> List[Tuple[float, int]]:
+        """
+        Find the recipes whose ingredient sets are most similar to the given ones.
+        
+        Only recipes sharing an LSH bucket with the query are compared
+        (exact Jaccard similarity of normalized ingredient names), so the
+        cost depends on the bucket sizes rather than on the number of recipes.
+        Recipes below roughly 25% similarity are usually not found.
+        
+        Args:
+            ingredients: Ingredient names (e.g. of the recipe to match)
+            k: Number of results
+        
+        Returns:
+            List of (similarity 0-1, position), most similar first
+        """
+        tokens = ingredient_tokens(ingredients)
+        if not tokens or k <= 0:
+            return []
+        scored = []
+        for position in self._similarity_index().candidates(_MINHASHER.signature(tokens)):
+            if self._is_live(position):
+                template = self._template(position)[0]
+                scored.append((jaccard(tokens, ingredient_tokens(item.name for item in template.ingredients)),
+                               position))
+        return heapq.nsmallest(k, scored, key=lambda item: (-item[0], item[1]))
+    
+    def _position_of(self, recipe_id: str) -> Optional[int]:
+        """Live position of a recipe by id (index lookup, no data file scan), or None"""
+        position = self._added_ids.get(recipe_id)
+        if position is None:
+            position = self.index.position_of(recipe_id)
+            if position in self._deleted:
+                return None
+        return position
+    
+    def add_recipe(self, recipe: dict) -> int:
+        """
+        Add a recipe; it is searchable immediately.
+        
+        Args:
+            recipe: Recipe dict in the data file schema (needs a unique "id",
+                    "title", "ingredients" and "instructions")
+        
+        Returns:
+            Position of the new recipe
+        
+        Raises:
+            ValueError: If required fields are missing or the id is taken
+        """
+        missing = [field for field in ("id", "title", "ingredients", "instructions") if field not in recipe]
+        if missing:
+            raise ValueError(f"Recipe is missing {', '.join(missing)}")
+        if self._position_of(recipe["id"]) is not None:
+            raise ValueError(f"Recipe id {recipe['id']!r} already exists")
+        
+        position = self.index.n_recipes + self._delta.add(dict(recipe))
+        self._added_ids[recipe["id"]] = position
+        if self._lsh is not None:
+            tokens = ingredient_tokens(recipe["ingredients"])
+            if tokens:
+                self._lsh.add(position, _MINHASHER.signature(tokens))
+        return position
+    
+    def remove_recipe(self, recipe_id: str) -> bool:
+        """
+        Remove a recipe by id.
+        
+        Args:
+            recipe_id: Recipe id
+        
+        Returns:
+            True if it was removed, False if there is no such recipe
+        """
+        position = self._position_of(recipe_id)
+        if position is None:
+            return False
+        n_base = self.index.n_recipes
+        if position >= n_base:
+            self._delta.remove(position - n_base)
+            del self._added_ids[recipe_id]
+        else:
+            self._deleted.add(position)
+        self._templates.pop(position)
+        return True
+    
+    def update_recipe(self, recipe: dict) -> int:
+        """
+        Replace the recipe with the same id (it moves after all other recipes,
+        so it loses ties against recipes it used to precede).
+        
+        Args:
+            recipe: New recipe dict
+        
+        Returns:
+            New position of the recipe
+        
+        Raises:
+            KeyError: If there is no recipe with that id
+            ValueError: If required fields are missing
+        """
+        if self._position_of(recipe.get("id")) is None:
+            raise KeyError(recipe.get("id"))
+        self.remove_recipe(recipe["id"])
+        return self.add_recipe(recipe)
+    
+    def compact(self) -> None:
+        """Write the live recipes to the data file and rebuild its index"""
+        recipes = self.recipes()
+        self.close()
+        write_recipe_file(self.data_path, recipes)
+        index = build_index(self.data_path)
+        digest = file_digest(self.data_path)
+        index.save(self.index_path, digest)
+        build_text_index(self.data_path).save(self.text_index_path, digest)
+        self._index = index
+        self._recipes = None
+        self._delta = DeltaSegment()
+        self._deleted = set()
+        self._added_ids = {}
+        self._templates.clear()
+        self._lsh = None
+    
+    def close(self) -> None:
+        """Release the mapped data and index files (the store reopens them when needed)"""
+        if self._data_map is not None:
+            self._data_map.close()
+            self._data_map = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        if self._text_index is not None:
+            self._text_index.close()
+            self._text_index = None
+        self._lsh = None
+    
+    def check(self) -> List[str]:
+        """
+        Verify the index and the runtime changes against the recipes.
+        
+        Checks the data file header, id uniqueness, that the index and the
+        full-text index match a fresh build of the data file (postings,
+        metadata columns, line offsets, word statistics), and that the added recipes' postings, tombstones and id
+        lookup are consistent.
+        
+        Returns:
+            List of problems found (empty if consistent)
+        """
+        problems = []
+        file_recipes = read_recipe_file(self.data_path)
+        with open(self.data_path, "rb") as f:
+            header = read_header(f.readline())
+        if header.get("count") != len(file_recipes):
+            problems.append(f"header count {header.get('count')} != {len(file_recipes)} recipes")
+        
+        id_counts = Counter(recipe.get("id") for recipe in file_recipes)
+        duplicates = sorted(str(recipe_id) for recipe_id, count in id_counts.items() if count > 1)
+        if duplicates:
+            problems.append(f"duplicate ids in data file: {', '.join(map(str, duplicates))}")
+        
+        index = self.index
+        fresh = build_index(self.data_path)
+        if index.n_recipes != fresh.n_recipes:
+            problems.append(f"index has {index.n_recipes} recipes, data file has {fresh.n_recipes}")
+        if list(index.terms) != list(fresh.terms):
+            problems.append("index vocabulary differs from the data file")
+        else:
+            for term_id, term in enumerate(fresh.terms):
+                if list(index.postings(term_id)) != list(fresh.postings(term_id)):
+                    problems.append(f"postings of {term!r} differ from the data file")
+        for column in ("time", "servings", "cuisine", "category_words"):
+            if list(getattr(index.columns, column)) != list(getattr(fresh.columns, column)):
+                problems.append(f"{column} column differs from the data file")
+        if index.row_offsets is not None and list(index.row_offsets) != list(fresh.row_offsets):
+            problems.append("recipe line offsets differ from the data file")
+        if [index.ids[p] for p in range(index.n_recipes)] != [fresh.ids[p] for p in range(fresh.n_recipes)] or \
+           list(index.ids.order) != list(fresh.ids.order):
+            problems.append("recipe id table differs from the data file")
+        
+        text_index = self.text_index
+        fresh_text = build_text_index(self.data_path)
+        if list(text_index.terms) != list(fresh_text.terms) or \
+           any(list(getattr(text_index, column)) != list(getattr(fresh_text, column))
+               for column in ("offsets", "postings_data", "freqs", "lengths")):
+            problems.append("full-text index differs from the data file")
+        
+        delta = self._delta
+        for term_id, postings in delta.postings.items():
+            expected = [p for p, terms in enumerate(delta.recipe_terms) for t in terms if t == term_id]
+            if postings != expected:
+                problems.append(f"postings of added ingredient {delta.terms[term_id]!r} are inconsistent")
+        if delta.live_count != sum(delta.live):
+            problems.append("added recipe count is out of sync")
+        
+        live_ids = [recipe["id"] for recipe in self.recipes()]
+        if len(set(live_ids)) != len(live_ids):
+            problems.append("duplicate ids among live recipes")
+        for recipe_id in live_ids:
+            position = self._position_of(recipe_id)
+            if position is None or self.recipe_data(position).get("id") != recipe_id:
+                problems.append(f"id lookup for {recipe_id!r} does not find the live recipe")
+        for position in self._deleted:
+            recipe_id = file_recipes[position].get("id")
+            if self._position_of(recipe_id) == position:
+                problems.append(f"removed recipe {recipe_id!r} is still found by id")
+        return problems
+
+
+def search_stores(searchers: List, user_ingredients: List[str], max_results: int = 10, diet: str = None,
+                  max_minutes: int = None, sort_by: str = "relevance", exclude: List[str] = None,
+                  max_missing: Optional[int] = None, query: Optional[str] = None) -> List[Recipe]:
+    """
+    Search several stores as one corpus, without combining their data.
+    
+    Each store selects its own top candidates; they are merged with the
+    same sort keys, ties going to earlier stores (then earlier recipes),
+    so results equal a search over the stores' recipes concatenated.
+    
+    Args:
+        searchers: RecipeStores (or searchers with the same top_candidates,
+                   materialize and position_count), in priority order
+        Other arguments: Same as RecipeStore.search
+    
+    Returns:
+        List of matching recipes
+    """
+    offsets = []
+    candidate_lists = []
+    matched = []
+    offset = 0
+    for searcher in searchers:
+        top, matched_terms = searcher.top_candidates(user_ingredients, max_results, diet, max_minutes, sort_by,
+                                                     exclude, max_missing, query)
+        # Shift positions so they are unique and ordered across stores
+        offsets.append(offset)
+        candidate_lists.append([(position + offset, *rest) for position, *rest in top])
+        matched.append(matched_terms)
+        offset += searcher.position_count
+    
+    results = []
+    for position, *_ in merge_top(max_results, sort_by, candidate_lists):
+        store_no = bisect_right(offsets, position) - 1
+        results.append(searchers[store_no].materialize(position - offsets[store_no], matched[store_no]))
+    return results
+
+
+def iter_stores(stores: List[RecipeStore], user_ingredients: List[str], diet: str = None, max_minutes: int = None,
+                sort_by: str = "relevance", exclude: List[str] = None, max_missing: Optional[int] = None,
+                query: Optional[str] = None) -> Iterator[Recipe]:
+    """
+    Stream every matching recipe of several stores in ranked order.
+    
+    The lazy counterpart of search_stores: each store ranks its matches
+    once (see RecipeStore.ranked_candidates), the rankings are merged
+    lazily with the same sort keys and tie order, and Recipe objects are
+    only built as results are consumed.
+    
+    Args:
+        stores: RecipeStores, in priority order
+        Other arguments: Same as RecipeStore.search
+    
+    Yields:
+        Matching recipes, best first
+    """
+    offsets = []
+    streams = []
+    matched = []
+    offset = 0
+    for store in stores:
+        ranked, matched_terms = store.ranked_candidates(user_ingredients, diet, max_minutes, sort_by, exclude,
+                                                        max_missing, query)
+        offsets.append(offset)
+        streams.append(_shifted(ranked, offset))
+        matched.append(matched_terms)
+        offset += store.position_count
+    
+    for position, *_ in heapq.merge(*streams, key=candidate_sort_key(sort_by) or (lambda c: c[0])):
+        store_no = bisect_right(offsets, position) - 1
+        yield stores[store_no].materialize(position - offsets[store_no], matched[store_no])
+
+
+def _shifted(candidates: Iterable[tuple], offset: int) -> Iterator[tuple]:
+    """Candidate tuples with positions shifted by offset (see search_stores)"""
+    for position, *rest in candidates:
+        yield (position + offset, *rest)
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point: check a data file and its index"""
+    import sys
+    from providers.fallback_recipes import RECIPES_PATH
+    
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "check":
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 1
+    
+    data_path = argv[1] if len(argv) > 1 else RECIPES_PATH
+    store = RecipeStore(data_path, argv[2] if len(argv) > 2 else None)
+    problems = store.check()
+    for problem in problems:
+        print(f"✗ {problem}")
+    if problems:
+        return 1
+    print(f"✓ {store.count()} recipes, index consistent -> {store.index_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
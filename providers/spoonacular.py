@@ -4,10 +4,14 @@ import time
 from typing import List, Optional
 from core.model import Recipe, Provider, IngredientItem
 from core.normalize import normalize_ingredient_name
+from core.performance import get_http_session, decode_json_response
 
 # Spoonacular API base URL
 BASE_URL = "https://api.spoonacular.com"
 
+# Cheap URL used to pre-warm pooled connections (HEAD, no API key needed)
+WARMUP_URL = BASE_URL
+
 # Rate limiting
 RATE_LIMIT_DELAY = 0.1  # seconds between requests
 
@@ -23,10 +27,8 @@ class SpoonacularProvider:
             api_key: Spoonacular API key
         """
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'RecipeFinder/1.0'
-        })
+        # Use shared session pool for better performance
+        self.session = get_http_session("spoonacular")
         self.last_request_time = 0
     
     def _rate_limit(self):
@@ -62,8 +64,8 @@ class SpoonacularProvider:
         try:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return decode_json_response(response)
+        except (requests.exceptions.RequestException, ValueError) as e:
             raise Exception(f"Spoonacular API request failed: {e}")
     
     def search_by_ingredients(
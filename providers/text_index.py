@@ -0,0 +1,335 @@
+"""
+Prebuilt BM25 full-text index for local recipe data
+
+Maps each word of a recipe's title, instructions, cuisine and categories
+to a posting list of (recipe position, term frequency), with every
+recipe's token count for BM25 length normalization. Title words are
+counted TITLE_WEIGHT times, so a query word in the title outweighs the
+same word in the instructions. Like the ingredient index it is built
+offline into a flat binary file next to the data file and memory-mapped
+at search time; a query only walks the posting lists of its own words.
+
+Binary layout (little-endian, 4-byte aligned), version 1:
+    magic      4 bytes   b"RFTX"
+    version    u32
+    n_docs     u32       recipes
+    n_terms    u32
+    vocab_len  u32       bytes of UTF-8 vocabulary
+    source     32 bytes  SHA-256 of the recipe data file it was built from
+    vocab      UTF-8 terms (sorted) joined by "\\n", zero-padded to 4 bytes
+    offsets    u32[n_terms + 1]  start of each posting list
+    postings   u32[offsets[-1]]  recipe positions, ascending
+    freqs      u32[offsets[-1]]  term frequency of each posting
+    lengths    u32[n_docs]  tokens per recipe (title counted TITLE_WEIGHT times)
+"""
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from core.normalize import parse_text_query, tokenize_text
+from providers import recipe_index
+from providers.recipe_index import _U32, _int_view, _numpy, _pack_vocab, _pad4, _padded, _unpack_vocab
+
+TEXT_INDEX_MAGIC = b"RFTX"
+TEXT_INDEX_VERSION = 1
+_HEADER = struct.Struct("<4sIIII32s")
+
+# BM25 parameters (the usual defaults) and the title boost
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 3
+
+
+def recipe_tokens(recipe: dict) -> List[str]:
+    """
+    Tokens a recipe is indexed under.
+    
+    Args:
+        recipe: Recipe dict in the data file schema
+    
+    Returns:
+        Title tokens (TITLE_WEIGHT times), then cuisine, categories and
+        instruction tokens
+    """
+    tokens = tokenize_text(recipe.get("title", "")) * TITLE_WEIGHT
+    tokens += tokenize_text(recipe.get("cuisine") or "")
+    tokens += tokenize_text(" ".join(recipe.get("category", [])))
+    tokens += tokenize_text(recipe.get("instructions") or "")
+    return tokens
+
+
+class TextIndex:
+    """Inverted word index with BM25 scoring over a fixed recipe list"""
+    
+    def __init__(self, terms: List[str], offsets: Sequence[int], postings: Sequence[int],
+                 freqs: Sequence[int], lengths: Sequence[int]):
+        """
+        Args:
+            terms: Sorted vocabulary
+            offsets: Start of each term's postings (len(terms) + 1 entries)
+            postings: Recipe positions, ascending per term
+            freqs: Term frequency of each posting
+            lengths: Token count of every recipe
+        """
+        self.terms = terms
+        self.offsets = offsets
+        self.postings_data = postings
+        self.freqs = freqs
+        self.lengths = lengths
+        self.n_docs = len(lengths)
+        self.avg_length = (sum(lengths) / self.n_docs) if self.n_docs else 0.0
+        self._mmap = None
+        self._np = None
+    
+    @classmethod
+    def build(cls, recipes: Iterable[dict]) -> "TextIndex":
+        """
+        Build an index from recipe dicts (streamed, in data file order).
+        
+        Args:
+            recipes: Recipes in data file order
+        
+        Returns:
+            In-memory TextIndex
+        """
+        by_term: Dict[str, Tuple[array, array]] = {}
+        lengths = array(_U32)
+        for position, recipe in enumerate(recipes):
+            tokens = recipe_tokens(recipe)
+            lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                entry = by_term.get(term)
+                if entry is None:
+                    entry = by_term[term] = (array(_U32), array(_U32))
+                entry[0].append(position)
+                entry[1].append(count)
+        
+        terms = sorted(by_term)
+        offsets = array(_U32, [0])
+        postings = array(_U32)
+        freqs = array(_U32)
+        for term in terms:
+            term_postings, term_freqs = by_term.pop(term)
+            postings.extend(term_postings)
+            freqs.extend(term_freqs)
+            offsets.append(len(postings))
+        return cls(terms, offsets, postings, freqs, lengths)
+    
+    @classmethod
+    def load(cls, path: str, source_digest: Optional[bytes] = None) -> Optional["TextIndex"]:
+        """
+        Memory-map an index file.
+        
+        Args:
+            path: Index file path
+            source_digest: Expected SHA-256 of the data file (None to skip the check)
+        
+        Returns:
+            TextIndex backed by the mapped file, or None if the file is
+            missing, corrupt, from another format version, or stale
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        
+        try:
+            magic, version, n_docs, n_terms, vocab_len, digest = _HEADER.unpack_from(mapped, 0)
+            if magic != TEXT_INDEX_MAGIC or version != TEXT_INDEX_VERSION or \
+               (source_digest is not None and digest != source_digest):
+                raise ValueError("Not a current text index")
+            pos = _HEADER.size
+            terms = _unpack_vocab(mapped, pos, vocab_len, n_terms)
+            pos += _pad4(vocab_len)
+            offsets = _int_view(mapped, pos, n_terms + 1)
+            pos += 4 * (n_terms + 1)
+            postings = _int_view(mapped, pos, offsets[-1])
+            pos += 4 * offsets[-1]
+            freqs = _int_view(mapped, pos, offsets[-1])
+            pos += 4 * offsets[-1]
+            lengths = _int_view(mapped, pos, n_docs)
+        except (struct.error, ValueError, TypeError, IndexError):
+            mapped.close()
+            return None
+        
+        index = cls(terms, offsets, postings, freqs, lengths)
+        index._mmap = mapped
+        return index
+    
+    def save(self, path: str, source_digest: bytes) -> None:
+        """
+        Write the index in the binary format (atomically replaces path).
+        
+        Args:
+            path: Output file path
+            source_digest: SHA-256 of the data file this index was built from
+        """
+        vocab = _pack_vocab(self.terms)
+        arrays = [array(_U32, values) for values in (self.offsets, self.postings_data, self.freqs, self.lengths)]
+        if sys.byteorder != "little":
+            for values in arrays:
+                values.byteswap()
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(TEXT_INDEX_MAGIC, TEXT_INDEX_VERSION, self.n_docs,
+                                 len(self.terms), len(vocab), source_digest))
+            f.write(_padded(vocab))
+            for values in arrays:
+                f.write(values.tobytes())
+        os.replace(tmp_path, path)
+    
+    def close(self) -> None:
+        """Release the mapped index file (see IngredientIndex.close)"""
+        mapped, self._mmap = self._mmap, None
+        if mapped is None:
+            return
+        self.offsets = self.postings_data = self.freqs = self.lengths = None
+        self._np = None
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # Views are still referenced elsewhere; unmapped once collected
+    
+    def term_ids(self, token: str, prefix: bool = False) -> range:
+        """
+        Find the vocabulary entries for a query token (binary search).
+        
+        Args:
+            token: Query token
+            prefix: Match every term starting with token
+        
+        Returns:
+            Range of term ids (terms are sorted, so prefix matches are contiguous)
+        """
+        start = bisect_left(self.terms, token)
+        if prefix:
+            return range(start, bisect_left(self.terms, token + "￿"))
+        if start < len(self.terms) and self.terms[start] == token:
+            return range(start, start + 1)
+        return range(start, start)
+    
+    def idf(self, document_frequency: int) -> float:
+        """BM25 inverse document frequency (always positive)"""
+        return math.log(1 + (self.n_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+    
+    def term_score(self, idf: float, freq: int, length: int) -> float:
+        """BM25 contribution of one term occurring freq times in a recipe of the given length"""
+        norm = 1 - BM25_B + BM25_B * length / self.avg_length if self.avg_length else 1.0
+        return idf * freq * (BM25_K1 + 1) / (freq + BM25_K1 * norm)
+    
+    def search(self, query: str, prefix: bool = False) -> Dict[int, float]:
+        """
+        Score the recipes matching every word of a query.
+        
+        Only the posting lists of the query's words are read, so the cost
+        depends on how common the words are, not on the number of recipes.
+        
+        Args:
+            query: Free-text query ("curr*" matches words starting with "curr")
+            prefix: Match every query word as a prefix
+        
+        Returns:
+            Dict of recipe position -> BM25 score (empty for an empty query)
+        """
+        terms = parse_text_query(query)
+        if not terms or not self.n_docs:
+            return {}
+        if recipe_index.VECTORIZE:
+            return self._np_search(terms, prefix)
+        
+        matches = None
+        for token, is_prefix in terms:
+            token_scores: Dict[int, float] = {}
+            for term_id in self.term_ids(token, prefix or is_prefix):
+                start, stop = self.offsets[term_id], self.offsets[term_id + 1]
+                idf = self.idf(stop - start)
+                for position, freq in zip(self.postings_data[start:stop], self.freqs[start:stop]):
+                    if matches is not None and position not in matches:
+                        continue
+                    score = self.term_score(idf, freq, self.lengths[position])
+                    token_scores[position] = token_scores.get(position, 0.0) + score
+            if matches is None:
+                matches = token_scores
+            else:
+                matches = {position: matches[position] + score for position, score in token_scores.items()}
+            if not matches:
+                break
+        return matches
+    
+    def _np_arrays(self):
+        """NumPy views of the postings, frequencies and recipe lengths (zero-copy when mapped)"""
+        if self._np is None:
+            np = _numpy()
+            self._np = (np.asarray(self.postings_data, dtype=np.uint32), np.asarray(self.freqs, dtype=np.uint32),
+                        np.asarray(self.lengths, dtype=np.uint32))
+        return self._np
+    
+    def _np_search(self, terms: List[Tuple[str, bool]], prefix: bool) -> Dict[int, float]:
+        """search with vectorized scoring: one array operation per query word"""
+        np = _numpy()
+        postings, freqs, lengths = self._np_arrays()
+        positions = scores = None
+        for token, is_prefix in terms:
+            parts = []
+            for term_id in self.term_ids(token, prefix or is_prefix):
+                start, stop = self.offsets[term_id], self.offsets[term_id + 1]
+                term_positions = postings[start:stop]
+                freq = freqs[start:stop].astype(np.float64)
+                norm = 1 - BM25_B + BM25_B * lengths[term_positions] / self.avg_length
+                parts.append((term_positions, self.idf(stop - start) * freq * (BM25_K1 + 1) / (freq + BM25_K1 * norm)))
+            if not parts:
+                return {}
+            token_positions = np.concatenate([part[0] for part in parts])
+            token_scores = np.concatenate([part[1] for part in parts])
+            if len(parts) > 1:
+                # A recipe containing several words with the prefix scores each of them
+                token_positions, inverse = np.unique(token_positions, return_inverse=True)
+                token_scores = np.bincount(inverse, weights=token_scores)
+            if positions is None:
+                positions, scores = token_positions, token_scores
+            else:
+                positions, ours, theirs = np.intersect1d(positions, token_positions, assume_unique=True,
+                                                         return_indices=True)
+                scores = scores[ours] + token_scores[theirs]
+            if not len(positions):
+                return {}
+        return dict(zip(positions.tolist(), scores.tolist()))
+    
+    def score_tokens(self, query: str, tokens: List[str], prefix: bool = False) -> Optional[float]:
+        """
+        Score a recipe that is not in the index (e.g. added at runtime) with
+        the index's statistics.
+        
+        Args:
+            query: Free-text query
+            tokens: The recipe's tokens (see recipe_tokens)
+            prefix: Match every query word as a prefix
+        
+        Returns:
+            BM25 score, or None if the recipe does not contain every query word
+        """
+        terms = parse_text_query(query)
+        if not terms:
+            return None
+        counts = Counter(tokens)
+        total = 0.0
+        for token, is_prefix in terms:
+            matched = [word for word in counts if word.startswith(token)] if prefix or is_prefix else \
+                [token] if token in counts else []
+            if not matched:
+                return None
+            for word in matched:
+                term_id = self.term_ids(word)
+                frequency = sum(self.offsets[t + 1] - self.offsets[t] for t in term_id)
+                total += self.term_score(self.idf(frequency), counts[word], len(tokens))
+        return total
+    
+    def __len__(self) -> int:
+        return len(self.terms)
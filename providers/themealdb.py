@@ -1,18 +1,21 @@
 """TheMealDB API provider - Free tier with no authentication required"""
 import time
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 from core.model import Recipe, Provider, IngredientItem
 from core.normalize import (
     normalize_for_themealdb,
     normalize_ingredient_name,
     ingredients_match,
-    find_matching_ingredients
+    IngredientMatcher
 )
-from core.performance import cached, get_http_session
+from core.performance import cached, get_http_session, decode_json_response
 
 # TheMealDB API base URL
 BASE_URL = "https://www.themealdb.com/api/json/v1/1"
 
+# Cheap endpoint used to pre-warm pooled connections at startup
+WARMUP_URL = f"{BASE_URL}/list.php?a=list"
+
 # Test/development key (free tier)
 API_KEY = "1"
 
@@ -20,6 +23,91 @@ API_KEY = "1"
 RATE_LIMIT_DELAY = 0.1  # seconds between requests (reduced from 0.5)
 REQUEST_TIMEOUT = 3  # seconds (reduced from 10)
 
+# Precomputed (ingredient, measure) field names: strIngredient1..20 / strMeasure1..20
+MEAL_INGREDIENT_FIELDS = tuple(
+    (f"strIngredient{i}", f"strMeasure{i}") for i in range(1, 21)
+)
+
+
+class MealParser:
+    """
+    Single-pass converter from TheMealDB meal data to Recipe objects.
+    
+    Built once per search: user ingredients are compiled into an
+    IngredientMatcher, so ingredients shared between meals are only
+    matched once, and each meal's ingredient fields are walked one time
+    to produce names, measures and used/missing lists together.
+    """
+    
+    def __init__(self, user_ingredients: List[str]):
+        self.matcher = IngredientMatcher(user_ingredients)
+    
+    def parse(self, meal: dict) -> Recipe:
+        """
+        Convert TheMealDB meal data to our Recipe model.
+        
+        Args:
+            meal: Meal data from API
+        
+        Returns:
+            Recipe object
+        """
+        items = []
+        used = []
+        missing = []
+        matches = self.matcher.matches
+        get = meal.get
+        
+        for ingredient_field, measure_field in MEAL_INGREDIENT_FIELDS:
+            ingredient = get(ingredient_field)
+            if not ingredient:
+                continue
+            ingredient = ingredient.strip()
+            if not ingredient:
+                continue
+            
+            measure = get(measure_field)
+            if measure:
+                measure = measure.strip() or None
+            else:
+                measure = None
+            
+            items.append(IngredientItem(name=ingredient, quantity=measure))
+            if matches(ingredient):
+                used.append(ingredient)
+            else:
+                missing.append(ingredient)
+        
+        # Build category/diet list
+        categories = []
+        category = get("strCategory")
+        area = get("strArea")
+        tags = get("strTags")
+        if category:
+            categories.append(category)
+        if area:
+            categories.append(f"{area} cuisine")
+        if tags:
+            # Tags are comma-separated
+            categories.extend(t.strip() for t in tags.split(",") if t.strip())
+        
+        return Recipe(
+            id=meal["idMeal"],
+            provider=Provider.THEMEALDB,
+            title=get("strMeal", "Unknown"),
+            image_url=get("strMealThumb"),
+            source_url=get("strSource") or get("strYoutube"),
+            ingredients=items,
+            used_ingredients=used,
+            missing_ingredients=missing,
+            instructions=get("strInstructions"),
+            servings=None,  # TheMealDB doesn't provide this
+            ready_in_minutes=None,  # TheMealDB doesn't provide this
+            cuisine=area,
+            category_or_diet=categories,
+            cost_per_serving_usd=None  # TheMealDB doesn't provide this
+        )
+
 
 class TheMealDBProvider:
     """Provider for TheMealDB API"""
@@ -29,6 +117,7 @@ class TheMealDBProvider:
         self.session = get_http_session("themealdb")
         self.last_request_time = 0
         self.api_available = True  # Track if API is available
+        self.last_fetch_stats = {"candidates": 0, "lookups": 0}
     
     def _rate_limit(self):
         """Ensure we don't exceed rate limits (only if API is working)"""
@@ -62,7 +151,7 @@ class TheMealDBProvider:
             response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             self.api_available = True  # Mark as available on success
-            return response.json()
+            return decode_json_response(response)
         except Exception as e:
             self.api_available = False  # Mark as unavailable on failure
             raise Exception(f"TheMealDB API request failed: {e}")
@@ -128,8 +217,8 @@ class TheMealDBProvider:
         """
         ingredients = []
         
-        for i in range(1, 21):
-            ingredient = meal.get(f"strIngredient{i}", "")
+        for ingredient_field, _ in MEAL_INGREDIENT_FIELDS:
+            ingredient = meal.get(ingredient_field, "")
             if ingredient and ingredient.strip():
                 ingredients.append(ingredient.strip())
         
@@ -147,9 +236,9 @@ class TheMealDBProvider:
         """
         items = []
         
-        for i in range(1, 21):
-            ingredient = meal.get(f"strIngredient{i}", "")
-            measure = meal.get(f"strMeasure{i}", "")
+        for ingredient_field, measure_field in MEAL_INGREDIENT_FIELDS:
+            ingredient = meal.get(ingredient_field, "")
+            measure = meal.get(measure_field, "")
             
             if ingredient and ingredient.strip():
                 items.append(IngredientItem(
@@ -204,40 +293,7 @@ class TheMealDBProvider:
         Returns:
             Recipe object
         """
-        # Extract all ingredients
-        recipe_ingredients = self.extract_ingredients_from_meal(meal)
-        ingredient_items = self.extract_ingredient_items_from_meal(meal)
-        
-        # Determine used vs missing
-        used, missing = find_matching_ingredients(user_ingredients, recipe_ingredients)
-        
-        # Build category/diet list
-        categories = []
-        if meal.get("strCategory"):
-            categories.append(meal["strCategory"])
-        if meal.get("strArea"):
-            categories.append(f"{meal['strArea']} cuisine")
-        if meal.get("strTags"):
-            # Tags are comma-separated
-            tags = [t.strip() for t in meal["strTags"].split(",") if t.strip()]
-            categories.extend(tags)
-        
-        return Recipe(
-            id=meal["idMeal"],
-            provider=Provider.THEMEALDB,
-            title=meal.get("strMeal", "Unknown"),
-            image_url=meal.get("strMealThumb"),
-            source_url=meal.get("strSource") or meal.get("strYoutube"),
-            ingredients=ingredient_items,
-            used_ingredients=used,
-            missing_ingredients=missing,
-            instructions=meal.get("strInstructions"),
-            servings=None,  # TheMealDB doesn't provide this
-            ready_in_minutes=None,  # TheMealDB doesn't provide this
-            cuisine=meal.get("strArea"),
-            category_or_diet=categories,
-            cost_per_serving_usd=None  # TheMealDB doesn't provide this
-        )
+        return MealParser(user_ingredients).parse(meal)
     
     def search_by_ingredients(
         self,
@@ -303,24 +359,67 @@ class TheMealDBProvider:
             reverse=True
         )
         
-        # Step 3: Fetch details for top recipes
-        recipes = []
+        # Step 3: Fetch details for the top recipes, ranked by verified matches
+        recipes = self.fetch_top_meals(sorted_meal_ids, meal_id_counts, ingredients, max_results)
+        
+        print(f"  ✓ Fetched {len(recipes)} recipes ({self.last_fetch_stats['lookups']} lookups)")
+        
+        return recipes
+    
+    def fetch_top_meals(
+        self,
+        sorted_meal_ids: List[str],
+        meal_id_counts: Dict[str, int],
+        ingredients: List[str],
+        max_results: int
+    ) -> List[Recipe]:
+        """
+        Fetch details for the best candidates and rank them by verified score.
+        
+        Candidates are looked up in descending filter count order until
+        max_results meals were fetched (at most max_results * 2 lookups, to
+        make up for failed ones), so no more lookups are issued than
+        needed to fill the results. A meal's filter count (how many user
+        ingredients returned it from filter.php) is only an upper bound on
+        its verified score - the number of those ingredients its details
+        actually match - so the fetched meals are ordered by verified
+        score, ties keeping filter count order.
+        
+        Args:
+            sorted_meal_ids: Candidate IDs sorted by filter count (descending)
+            meal_id_counts: Filter count per meal ID
+            ingredients: User's ingredients
+            max_results: Number of recipes wanted (k)
         
-        for meal_id in sorted_meal_ids[:max_results * 2]:  # Fetch extra in case some fail
+        Returns:
+            Recipes ordered by verified score, best first
+        """
+        parser = MealParser(ingredients)
+        user_matchers = [IngredientMatcher([ing]) for ing in ingredients]
+        
+        fetched = []  # (score, rank, recipe)
+        lookups = 0
+        
+        for rank, meal_id in enumerate(sorted_meal_ids[:max_results * 2]):  # Fetch extra in case some fail
+            lookups += 1
             meal = self.lookup_meal(meal_id)
-            
             if not meal:
                 continue
             
-            recipe = self.meal_to_recipe(meal, ingredients)
-            recipes.append(recipe)
+            recipe = parser.parse(meal)
+            names = [item.name for item in recipe.ingredients]
+            verified = sum(1 for m in user_matchers if any(m.matches(n) for n in names))
+            fetched.append((min(meal_id_counts.get(meal_id, 0), verified), rank, recipe))
             
-            if len(recipes) >= max_results:
+            if len(fetched) >= max_results:
                 break
         
-        print(f"  ✓ Fetched {len(recipes)} recipes")
+        self.last_fetch_stats = {
+            "candidates": len(sorted_meal_ids),
+            "lookups": lookups
+        }
         
-        return recipes
+        return [entry[2] for entry in sorted(fetched, key=lambda e: (-e[0], e[1]))]
 
 
 def search_recipes(
@@ -0,0 +1,170 @@
+"""Tests for near-duplicate recipe detection"""
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest import mock
+from core import config
+from core.dedup import DIET_MARKERS, deduplicate_recipes, iter_unique_recipes, title_tokens
+from core.model import IngredientItem, Provider, Recipe
+from core.orchestrator import RecipeOrchestrator
+from providers import fallback_recipes
+from providers.fallback_recipes import load_fallback_recipes
+from providers.recipe_store import write_recipe_file
+
+def make_recipe(recipe_id, title, ingredients, provider=Provider.THEMEALDB, **fields):
+    return Recipe(
+        id=recipe_id,
+        provider=provider,
+        title=title,
+        ingredients=[IngredientItem(name=name) for name in ingredients],
+        **fields
+    )
+
+class TestDeduplicateRecipes(unittest.TestCase):
+    """Test collapsing the same dish from different providers"""
+    
+    def setUp(self):
+        self.mealdb = make_recipe("1", "Chicken Tikka Masala",
+                                  ["chicken", "yogurt", "tomato", "cream", "garam masala", "garlic"])
+        self.spoonacular = make_recipe("s1", "Easy Chicken Tikka Masala!",
+                                       ["chicken breasts", "tomatoes", "heavy cream", "garam masala", "ginger"],
+                                       Provider.SPOONACULAR, image_url="https://example.com/tikka.jpg",
+                                       ready_in_minutes=40, servings=4, cost_per_serving_usd=2.5)
+        self.other = make_recipe("2", "Chicken Curry", ["chicken", "curry powder", "onion", "coconut milk"])
+    
+    def test_title_tokens(self):
+        """Test titles are compared by significant, singular words"""
+        self.assertEqual(title_tokens("Easy Chicken Tikka Masala!"), ("chicken", "masala", "tikka"))
+        self.assertEqual(title_tokens("The Best Tomatoes"), ("tomato",))
+    
+    def test_keeps_best_ranked_record(self):
+        """Test duplicates collapse into the first, best ranked record"""
+        result = deduplicate_recipes([self.mealdb, self.other, self.spoonacular])
+        
+        self.assertEqual([r.id for r in result], ["1", "2"])
+        self.assertEqual([r.id for r in deduplicate_recipes([self.spoonacular, self.mealdb])], ["s1"])
+    
+    def test_same_source_never_merged(self):
+        """Test identical recipes are only merged when they come from different sources"""
+        pack = replace(self.mealdb, id="p1", source="pack.jsonl")
+        again = replace(self.mealdb, id="1b")
+        
+        self.assertEqual([r.id for r in deduplicate_recipes([self.mealdb, again])], ["1", "1b"])
+        self.assertEqual([r.id for r in deduplicate_recipes([self.mealdb, pack, again])], ["1", "1b"])
+        self.assertEqual([r.id for r in deduplicate_recipes([pack, replace(pack, id="p2")])], ["p1", "p2"])
+    
+    def test_diet_variants_kept(self):
+        """Test titles differing by a diet or category word are never merged"""
+        curry = make_recipe("1", "Thai Green Curry", ["green curry paste", "coconut milk", "tofu", "basil"])
+        vegan = make_recipe("s1", "Vegan Thai Green Curry", ["green curry paste", "coconut milk", "tofu", "basil"],
+                            Provider.SPOONACULAR)
+        burrito = make_recipe("2", "Burrito", ["tortilla", "eggs", "beans", "cheese"])
+        breakfast = make_recipe("s2", "Breakfast Burrito", ["tortilla", "eggs", "beans", "cheese"],
+                                Provider.SPOONACULAR, category_or_diet=["Breakfast"])
+        
+        recipes = [curry, vegan, burrito, breakfast]
+        
+        self.assertEqual(deduplicate_recipes(recipes), recipes)
+    
+    def test_builtin_diet_variants_kept(self):
+        """Test no built-in diet variant is merged into its plain dish, even across sources"""
+        recipes = [make_recipe(r["id"], r["title"], r["ingredients"], source=r["id"], category_or_diet=r["category"])
+                   for r in load_fallback_recipes()]
+        
+        kept = {r.title for r in deduplicate_recipes(recipes)}
+        
+        self.assertTrue({"Thai Green Curry", "Vegan Thai Green Curry"} <= kept)
+        for recipe in recipes:
+            words = set(title_tokens(recipe.title))
+            if words & DIET_MARKERS:
+                with self.subTest(title=recipe.title):
+                    self.assertIn(recipe.title, kept)
+    
+    def test_different_dishes_kept(self):
+        """Test similar titles with different ingredients, and different titles, are kept"""
+        dal = make_recipe("3", "Chicken Tikka Masala", ["lentils", "rice", "cumin", "salt"], Provider.SPOONACULAR)
+        soup = make_recipe("4", "Chicken Noodle Soup", ["chicken", "noodles", "carrot"])
+        zoodles = make_recipe("5", "Chicken Zoodle Soup", ["chicken", "zucchini", "carrot"], Provider.SPOONACULAR)
+        
+        recipes = [self.mealdb, dal, self.other, soup, zoodles]
+        
+        self.assertEqual(deduplicate_recipes(recipes), recipes)
+    
+    def test_without_ingredients(self):
+        """Test recipes without ingredient lists only match identical titles"""
+        bare = make_recipe("6", "chicken tikka masala", [], Provider.SPOONACULAR)
+        variant = make_recipe("7", "Chicken Tikka Masala Pie", [], Provider.SPOONACULAR)
+        
+        self.assertEqual([r.id for r in deduplicate_recipes([bare, self.mealdb, variant])], ["6", "7"])
+    
+    def test_transitive_groups(self):
+        """Test chains of duplicates end up in one group"""
+        copies = [make_recipe(str(i), "Fried Rice", ["rice", "egg", "soy sauce", f"extra {i}"], source=f"pack{i}")
+                  for i in range(5)]
+        
+        self.assertEqual(len(deduplicate_recipes(copies)), 1)
+    
+    def test_streaming(self):
+        """Test streamed dedup keeps the first, better ranked copy and reads recipes lazily"""
+        dal = make_recipe("3", "Chicken Tikka Masala", ["lentils", "rice", "cumin", "salt"], Provider.SPOONACULAR)
+        stream = iter([self.mealdb, self.other, self.spoonacular, dal])
+        unique = iter_unique_recipes(stream)
+        
+        self.assertEqual(next(unique).id, "1")
+        self.assertEqual(next(unique).id, "2")
+        self.assertEqual(next(stream).id, "s1")
+        self.assertEqual([r.id for r in iter_unique_recipes([self.mealdb, self.other, self.spoonacular, dal])],
+                         ["1", "2", "3"])
+    
+    def test_builtin_recipes_never_merged(self):
+        """Test local searches without recipe packs are not changed by deduplication"""
+        orchestrator = RecipeOrchestrator()
+        with mock.patch.object(config, "DEDUPLICATE_RESULTS", False):
+            raw = orchestrator.search(["rice", "eggs", "onion"], max_results=40)
+        
+        results = orchestrator.search(["rice", "eggs", "onion"], max_results=40)
+        
+        self.assertEqual([r.id for r in results], [r.id for r in raw])
+
+class TestDuplicatePacks(unittest.TestCase):
+    """Test searches over recipe packs that copy the built-in recipes"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for name in ("copy_a", "copy_b"):
+            pack = [dict(recipe, id=f"{name}_{recipe['id']}") for recipe in load_fallback_recipes()]
+            write_recipe_file(os.path.join(self.tmp.name, f"{name}.jsonl"), pack)
+        patcher = mock.patch("core.config.RECIPE_PACK_DIRS", [self.tmp.name])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with mock.patch("builtins.print"):
+            fallback_recipes.reload_recipe_packs()
+        self.orchestrator = RecipeOrchestrator()
+    
+    def tearDown(self):
+        fallback_recipes.reload_recipe_packs()
+        self.tmp.cleanup()
+    
+    def test_search_fills_results(self):
+        """Test local searches keep fetching until they have the requested number of distinct dishes"""
+        with mock.patch.object(config, "DEDUPLICATE_RESULTS", False):
+            raw = self.orchestrator.search(["rice", "eggs", "onion"], max_results=40)
+        
+        results = self.orchestrator.search(["rice", "eggs", "onion"], max_results=40)
+        
+        self.assertEqual(len(results), 40)
+        self.assertEqual(deduplicate_recipes(results), results)
+        self.assertLess(len(deduplicate_recipes(raw)), len(raw))
+    
+    def test_search_matches_stream(self):
+        """Test search and the streamed search keep the same copy of each dish"""
+        for sort_by in ("relevance", "used-desc", "time-asc"):
+            expected = self.orchestrator.search(["chicken", "garlic"], max_results=30, sort_by=sort_by)
+            
+            results = list(self.orchestrator.iter_search(["chicken", "garlic"], sort_by=sort_by, max_results=30))
+            
+            self.assertEqual([r.id for r in results], [r.id for r in expected], sort_by)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,301 @@
+"""Tests for the local fallback recipe database"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+from core.normalize import ingredients_match
+from core.similarity import jaccard
+from core.sorters import filter_by_query
+from providers import fallback_recipes
+from providers.fallback_recipes import (
+    best_ingredients_to_buy,
+    best_next_ingredients,
+    load_fallback_recipes,
+    fallback_recipe_count,
+    find_similar_recipes,
+    iter_fallback_recipes,
+    search_fallback_recipes
+)
+from providers.recipe_store import RecipeStore, write_recipe_file
+
+class TestRecipeData(unittest.TestCase):
+    """Test the recipe data file and lazy loading"""
+    
+    def test_count_matches_header(self):
+        """Test the header count agrees with the recipes on disk"""
+        self.assertEqual(fallback_recipe_count(), len(load_fallback_recipes()))
+    
+    def test_ids_unique(self):
+        """Test every recipe has a unique id"""
+        ids = [r["id"] for r in load_fallback_recipes()]
+        self.assertEqual(len(ids), len(set(ids)))
+    
+    def test_legacy_attribute(self):
+        """Test FALLBACK_RECIPES is still importable"""
+        from providers.fallback_recipes import FALLBACK_RECIPES
+        self.assertIs(FALLBACK_RECIPES, load_fallback_recipes())
+    
+    def test_unknown_attribute(self):
+        """Test other missing attributes still raise"""
+        with self.assertRaises(AttributeError):
+            fallback_recipes.NOT_A_THING
+
+class TestSearchFallbackRecipes(unittest.TestCase):
+    """Test searching the local database"""
+    
+    def test_results_use_ingredients(self):
+        """Test every result uses at least one user ingredient"""
+        results = search_fallback_recipes(["eggs", "onion"], max_results=20)
+        
+        self.assertTrue(results)
+        for recipe in results:
+            self.assertTrue(recipe.used_ingredients)
+    
+    def test_filters(self):
+        """Test diet and time filters"""
+        results = search_fallback_recipes(["rice"], max_results=50, diet="vegetarian", max_minutes=20)
+        
+        self.assertTrue(results)
+        for recipe in results:
+            self.assertIn("vegetarian", [c.lower() for c in recipe.category_or_diet])
+            self.assertLessEqual(recipe.ready_in_minutes, 20)
+    
+    def test_exclude(self):
+        """Test recipes with an excluded ingredient are skipped, with fuzzy matching"""
+        results = search_fallback_recipes(["rice", "onion"], max_results=500, exclude=["egg", "GARLIC"])
+        unfiltered = search_fallback_recipes(["rice", "onion"], max_results=500)
+        
+        self.assertTrue(results)
+        self.assertLess(len(results), len(unfiltered))
+        for recipe in results:
+            for ingredient in recipe.ingredients:
+                self.assertFalse(ingredients_match("egg", ingredient.name), recipe.title)
+                self.assertFalse(ingredients_match("garlic", ingredient.name), recipe.title)
+        kept = {r.id for r in results}
+        self.assertEqual(kept, {r.id for r in unfiltered if not any(
+            ingredients_match(excl, i.name) for excl in ("egg", "garlic") for i in r.ingredients)})
+    
+    def test_max_missing(self):
+        """Test "cook now" mode returns exactly the recipes missing at most k ingredients"""
+        # Everything but one ingredient of a recipe, plus staples
+        recipe = load_fallback_recipes()[0]
+        pantry = recipe["ingredients"][:-1] + ["eggs", "onion", "garlic", "salt"]
+        everything = search_fallback_recipes(pantry, max_results=500)
+        for k in (0, 1, 2):
+            results = search_fallback_recipes(pantry, max_results=500, max_missing=k)
+            
+            self.assertEqual([r.id for r in results], [r.id for r in everything if len(r.missing_ingredients) <= k])
+        self.assertIn(recipe["id"], [r.id for r in search_fallback_recipes(pantry, max_results=500, max_missing=1)])
+    
+    def test_query_filters_ingredient_search(self):
+        """Test a text query keeps the ingredient ranking of the recipes containing every word"""
+        everything = search_fallback_recipes(["chicken", "rice"], max_results=500)
+        for query in ("curry", "spicy curr*", "thai"):
+            results = search_fallback_recipes(["chicken", "rice"], max_results=500, query=query)
+            
+            self.assertTrue(results, query)
+            self.assertEqual([r.id for r in results], [r.id for r in filter_by_query(everything, query)])
+    
+    def test_stopword_query(self):
+        """Test a query of only stopwords is ignored, locally as on the provider path"""
+        everything = search_fallback_recipes(["chicken", "rice"], max_results=500)
+        fallback_recipes.clear_query_cache()
+        
+        results = search_fallback_recipes(["chicken", "rice"], max_results=500, query="the")
+        
+        self.assertTrue(results)
+        self.assertEqual([r.id for r in results], [r.id for r in filter_by_query(everything, "the")])
+        self.assertEqual([r.id for r in iter_fallback_recipes(["chicken", "rice"], query="the")][:500],
+                         [r.id for r in results])
+        self.assertEqual(search_fallback_recipes([], query="the of"), [])
+    
+    def test_query_without_ingredients(self):
+        """Test a text query alone ranks recipes by relevance, with filters"""
+        results = search_fallback_recipes([], max_results=5, query="curry")
+        
+        self.assertEqual(len(results), 5)
+        self.assertIn("curry", results[0].title.lower())
+        self.assertEqual(results, filter_by_query(results, "curry"))
+        for recipe in search_fallback_recipes([], max_results=50, max_minutes=30, query="curr*"):
+            self.assertLessEqual(recipe.ready_in_minutes, 30)
+        self.assertEqual(search_fallback_recipes([], query="zzzz"), [])
+    
+    def test_streaming(self):
+        """Test streamed results equal a capped search, for ingredient and text searches"""
+        for ingredients, query, sort_by in ((["eggs", "onion", "rice"], None, "relevance"),
+                                            (["chicken"], None, "time-asc"),
+                                            (["rice"], "fried", "missing-asc"),
+                                            ([], "curr*", "relevance")):
+            expected = search_fallback_recipes(ingredients, max_results=500, sort_by=sort_by, query=query)
+            
+            results = list(iter_fallback_recipes(ingredients, sort_by=sort_by, query=query))
+            
+            self.assertEqual([r.id for r in results[:500]], [r.id for r in expected], (ingredients, query))
+    
+    def test_streaming_stops_when_corpus_changes(self):
+        """Test a stream raises instead of reading stale positions after the corpus changed"""
+        results = iter_fallback_recipes(["rice"])
+        next(results)
+        fallback_recipes._corpus_changed()
+        
+        with self.assertRaises(RuntimeError):
+            next(results)
+    
+    def test_best_next_ingredients(self):
+        """Test suggestions count the recipes each ingredient makes fully makeable"""
+        recipe = load_fallback_recipes()[0]
+        pantry = recipe["ingredients"][:-1]
+        cook_now = len(search_fallback_recipes(pantry, max_results=500, max_missing=0))
+        
+        suggestions = best_next_ingredients(pantry, limit=500)
+        
+        self.assertIn(recipe["ingredients"][-1].lower(), [ingredient for ingredient, _ in suggestions])
+        self.assertEqual(suggestions, sorted(suggestions, key=lambda item: (-item[1], item[0])))
+        ingredient, count = suggestions[0]
+        after = len(search_fallback_recipes(pantry + [ingredient], max_results=500, max_missing=0))
+        self.assertGreaterEqual(after - cook_now, count)
+    
+    def test_best_ingredients_to_buy(self):
+        """Test picks never repeat and unlock at least the recipes they report"""
+        pantry = ["eggs", "rice", "onion", "garlic", "salt", "butter"]
+        cook_now = len(search_fallback_recipes(pantry, max_results=500, max_missing=0))
+        
+        picks = best_ingredients_to_buy(pantry, 3)
+        
+        self.assertEqual(picks[0], best_next_ingredients(pantry, 1)[0])
+        self.assertEqual(len({ingredient for ingredient, _ in picks}), len(picks))
+        after = len(search_fallback_recipes(pantry + [i for i, _ in picks], max_results=500, max_missing=0))
+        self.assertGreaterEqual(after - cook_now, sum(count for _, count in picks))
+    
+    def test_best_ingredients_to_buy_together(self):
+        """Test ingredients that only complete recipes together are found when none is one away"""
+        pantry = ["egg", "rice", "onion", "garlic"]
+        self.assertEqual(best_next_ingredients(pantry), [])
+        
+        picks = best_ingredients_to_buy(pantry, 3)
+        
+        self.assertEqual(len(picks), 3)
+        self.assertGreater(sum(count for _, count in picks), 0)
+        self.assertTrue(search_fallback_recipes(pantry + [i for i, _ in picks], max_results=5, max_missing=0))
+        self.assertEqual(best_ingredients_to_buy(pantry, 2), [])
+        self.assertEqual(best_ingredients_to_buy(pantry, 0), [])
+    
+    def test_find_similar_recipes(self):
+        """Test similar recipes leave out the recipe itself and come most similar first"""
+        recipe = search_fallback_recipes(["lentils", "onion", "tomato"], max_results=1)[0]
+        names = {i.name for i in recipe.ingredients}
+        
+        results = find_similar_recipes(recipe, limit=5, user_ingredients=["onion"])
+        
+        self.assertTrue(results)
+        self.assertNotIn(recipe.id, [r.id for r in results])
+        overlaps = [jaccard(names, {i.name for i in r.ingredients}) for r in results]
+        self.assertEqual(overlaps, sorted(overlaps, reverse=True))
+        self.assertGreater(overlaps[0], 0.25)
+        for r in results:
+            self.assertEqual(r.used_ingredients, [i.name for i in r.ingredients if ingredients_match("onion", i.name)])
+    
+    def test_results_share_static_data(self):
+        """Test per-query results overlay used/missing on shared recipe data"""
+        first = {r.id: r for r in search_fallback_recipes(["eggs"], max_results=500)}
+        second = {r.id: r for r in search_fallback_recipes(["onion"], max_results=500)}
+        shared = set(first) & set(second)
+        
+        self.assertTrue(shared)
+        for recipe_id in shared:
+            self.assertIs(first[recipe_id].ingredients, second[recipe_id].ingredients)
+            self.assertNotEqual(first[recipe_id].used_ingredients, second[recipe_id].used_ingredients)
+
+class TestQueryCache(unittest.TestCase):
+    """Test the canonical-query result cache"""
+    
+    def setUp(self):
+        fallback_recipes.clear_query_cache()
+    
+    def test_canonical_query_hits(self):
+        """Test ingredient order, case and duplicates share one entry"""
+        first = search_fallback_recipes(["eggs", "onion"], max_results=10)
+        second = search_fallback_recipes(["Onion", "eggs", "eggs"], max_results=10)
+        
+        self.assertEqual([r.id for r in first], [r.id for r in second])
+        self.assertEqual(fallback_recipes.query_cache_stats()["hits"], 1)
+    
+    def test_superset_k(self):
+        """Test a cached top-20 answers a top-10 request with the same prefix"""
+        top20 = search_fallback_recipes(["rice"], max_results=20)
+        top10 = search_fallback_recipes(["rice"], max_results=10)
+        
+        self.assertEqual([r.id for r in top10], [r.id for r in top20[:10]])
+        self.assertEqual(fallback_recipes.query_cache_stats()["hits"], 1)
+        
+        search_fallback_recipes(["rice"], max_results=30)
+        self.assertEqual(fallback_recipes.query_cache_stats()["misses"], 2)
+    
+    def test_filters_are_part_of_key(self):
+        """Test different filters are not served from each other's entries"""
+        search_fallback_recipes(["rice"], max_results=10)
+        search_fallback_recipes(["rice"], max_results=10, diet="vegan")
+        search_fallback_recipes(["rice"], max_results=10, exclude=["egg"])
+        search_fallback_recipes(["rice"], max_results=10, query="curry")
+        
+        self.assertEqual(fallback_recipes.query_cache_stats()["hits"], 0)
+    
+    def test_corpus_change_invalidates(self):
+        """Test cached results are dropped when the corpus changes"""
+        search_fallback_recipes(["rice"], max_results=10)
+        fallback_recipes._corpus_changed()
+        search_fallback_recipes(["rice"], max_results=10)
+        
+        self.assertEqual(fallback_recipes.query_cache_stats()["hits"], 0)
+
+class TestRecipePacks(unittest.TestCase):
+    """Test user recipe packs searched with the built-in recipes"""
+    
+    PACK = [
+        {"id": "pack_1", "title": "Nordic Egg Rice", "cuisine": "Nordic", "category": ["Quick"],
+         "ingredients": ["eggs", "rice"], "time": 10, "servings": 2, "instructions": "Cook."},
+        {"id": "pack_2", "title": "Lingonberry Porridge", "cuisine": "Nordic", "category": ["Vegan"],
+         "ingredients": ["oats", "lingonberries"], "time": 10, "servings": 2, "instructions": "Simmer."},
+    ]
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pack_path = os.path.join(self.tmp.name, "nordic.jsonl")
+        write_recipe_file(self.pack_path, self.PACK)
+        with open(os.path.join(self.tmp.name, "notes.jsonl"), "w") as f:
+            f.write('{"not": "a pack"}\n')
+        patcher = mock.patch("core.config.RECIPE_PACK_DIRS", [self.tmp.name])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with mock.patch("builtins.print"):
+            fallback_recipes.reload_recipe_packs()
+    
+    def tearDown(self):
+        fallback_recipes.reload_recipe_packs()
+        self.tmp.cleanup()
+    
+    def test_discovery(self):
+        """Test data files are found and other files skipped"""
+        with mock.patch("builtins.print"):
+            self.assertEqual(fallback_recipes.find_recipe_packs([self.tmp.name, "/no/such/dir"]), [self.pack_path])
+    
+    def test_searched_with_builtin(self):
+        """Test pack recipes are merged into results as if appended to the built-in recipes"""
+        results = search_fallback_recipes(["lingonberries", "oats"], max_results=5)
+        self.assertEqual(results[0].id, "pack_2")
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "nordic.idx")))
+        
+        for sort_by in ("relevance", "used-desc", "missing-asc", "time-asc"):
+            with self.subTest(sort_by=sort_by):
+                combined = os.path.join(self.tmp.name, "combined")
+                os.makedirs(combined, exist_ok=True)
+                path = os.path.join(combined, "all.jsonl")
+                write_recipe_file(path, load_fallback_recipes() + self.PACK)
+                expected = RecipeStore(path).search(["eggs", "rice"], 15, sort_by=sort_by)
+                
+                results = search_fallback_recipes(["eggs", "rice"], max_results=15, sort_by=sort_by)
+                
+                self.assertEqual([r.id for r in results], [r.id for r in expected])
+
+if __name__ == '__main__':
+    unittest.main()
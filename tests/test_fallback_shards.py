@@ -0,0 +1,70 @@
+"""Tests for multi-process sharded search"""
+import os
+import tempfile
+import unittest
+from providers.fallback_recipes import _store
+from providers.recipe_store import RecipeStore, write_recipe_file
+from providers.fallback_shards import ShardedSearcher, shard_ranges, workers_supported
+
+QUERIES = [
+    {"user_ingredients": ["eggs", "onion"], "max_results": 10},
+    {"user_ingredients": ["rice", "garlic", "tomato"], "max_results": 25, "sort_by": "time-asc"},
+    {"user_ingredients": ["chicken"], "max_results": 5, "sort_by": "missing-asc", "diet": "gluten-free"},
+    {"user_ingredients": ["potato", "cheese"], "max_results": 50, "sort_by": "used-desc", "max_minutes": 30},
+    {"user_ingredients": ["onion"], "max_results": 20, "exclude": ["garlic"]},
+    {"user_ingredients": ["salt"], "max_results": 10, "sort_by": "unknown"},
+    {"user_ingredients": ["chicken", "rice"], "max_results": 10, "query": "curr*"},
+    {"user_ingredients": ["eggs", "onion"], "max_results": 10, "query": "mix"},
+]
+
+class TestShardRanges(unittest.TestCase):
+    """Test partitioning recipe positions"""
+    
+    def test_contiguous_and_balanced(self):
+        """Test ranges cover every position once, sizes differing by at most one"""
+        ranges = shard_ranges(10, 3)
+        
+        self.assertEqual(ranges, [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(shard_ranges(2, 5), [(0, 1), (1, 2)])
+
+@unittest.skipUnless(workers_supported(), "worker processes are only forked on Linux")
+class TestShardedSearcher(unittest.TestCase):
+    """Test scatter/gather search gives the same results as in-process search"""
+    
+    def test_same_results_as_store(self):
+        """Test merged per-shard top-k equals the unsharded top-k, in order"""
+        with ShardedSearcher(_store, shards=3) as searcher:
+            self.assertEqual(searcher.worker_count, 3)
+            for query in QUERIES:
+                expected = _store.search(**query)
+                results = searcher.search(**query)
+                
+                self.assertEqual([r.id for r in results], [r.id for r in expected], query)
+                self.assertEqual([r.used_ingredients for r in results], [r.used_ingredients for r in expected])
+        
+        self.assertEqual(searcher.worker_count, 0)
+    
+    def test_runtime_changes(self):
+        """Test recipes added and removed at runtime are merged across shards"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recipes.jsonl")
+            write_recipe_file(path, _store.recipes())
+            store = RecipeStore(path)
+            store.remove_recipe(_store.recipes()[0]["id"])
+            store.add_recipe({"id": "new", "title": "Egg Onion Mix", "category": ["Quick"],
+                              "ingredients": ["eggs", "onion"], "time": 5, "instructions": "Mix."})
+            
+            with ShardedSearcher(store, shards=3) as searcher:
+                for query in QUERIES:
+                    self.assertEqual([r.id for r in searcher.search(**query)],
+                                     [r.id for r in store.search(**query)], query)
+            store.close()
+    
+    def test_single_shard_in_process(self):
+        """Test one shard searches without worker processes"""
+        with ShardedSearcher(_store, shards=1) as searcher:
+            self.assertEqual(searcher.worker_count, 0)
+            self.assertTrue(searcher.search(["eggs"]))
+
+if __name__ == '__main__':
+    unittest.main()
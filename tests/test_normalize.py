@@ -6,7 +6,10 @@ from core.normalize import (
     normalize_ingredient_name,
     ingredients_match,
     find_matching_ingredients,
-    deduplicate_ingredients
+    deduplicate_ingredients,
+    IngredientMatcher,
+    parse_text_query,
+    tokenize_text
 )
 
 class TestParseIngredients(unittest.TestCase):
@@ -107,6 +110,24 @@ class TestFindMatchingIngredients(unittest.TestCase):
         self.assertEqual(len(used), 1)
         self.assertIn("eggs", used)
 
+class TestIngredientMatcher(unittest.TestCase):
+    """Test the pre-compiled ingredient matcher"""
+    
+    def test_agrees_with_find_matching_ingredients(self):
+        """Test matcher gives the same split as find_matching_ingredients"""
+        user = ["Egg", "tomato ", "chicken breast"]
+        recipe = ["eggs", "Tomatoes", "chicken", "onion", "breast", "rice"]
+        matcher = IngredientMatcher(user)
+        
+        self.assertEqual(matcher.split(recipe), find_matching_ingredients(user, recipe))
+    
+    def test_reuses_results(self):
+        """Test matcher can be reused across recipes"""
+        matcher = IngredientMatcher(["egg"])
+        
+        self.assertEqual(matcher.split(["eggs", "flour"]), (["eggs"], ["flour"]))
+        self.assertEqual(matcher.split(["milk", "eggs"]), (["eggs"], ["milk"]))
+
 class TestDeduplicateIngredients(unittest.TestCase):
     """Test ingredient deduplication"""
     
@@ -125,5 +146,20 @@ class TestDeduplicateIngredients(unittest.TestCase):
         result = deduplicate_ingredients([])
         self.assertEqual(result, [])
 
+class TestTextTokens(unittest.TestCase):
+    """Test full-text tokenization and query parsing"""
+    
+    def test_tokenize_text(self):
+        """Test words are lowercased, split on punctuation and stopwords dropped"""
+        self.assertEqual(tokenize_text("Simmer the CURRY, then add chilli_flakes!"),
+                         ["simmer", "curry", "add", "chilli", "flakes"])
+        self.assertEqual(tokenize_text("Crème brûlée"), ["crème", "brûlée"])
+        self.assertEqual(tokenize_text(None), [])
+    
+    def test_parse_text_query(self):
+        """Test a trailing * marks a prefix and repeated words are dropped"""
+        self.assertEqual(parse_text_query("Spicy curr* and spicy"), [("spicy", False), ("curr", True)])
+        self.assertEqual(parse_text_query("the *"), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for cursor-based paging of search results"""
+import unittest
+from unittest import mock
+from core import config, pagination
+from core.orchestrator import RecipeOrchestrator
+from core.pagination import SearchCursor, close_cursor, open_cursor, resume_cursor
+
+class TestSearchCursor(unittest.TestCase):
+    """Test pages read lazily from a result stream"""
+    
+    def test_pages_read_lazily(self):
+        """Test a page reads only one result past its end, and earlier pages are not read again"""
+        stream = iter(range(25))
+        cursor = SearchCursor(stream)
+        
+        page = cursor.page(0, 10)
+        self.assertEqual(page.recipes, list(range(10)))
+        self.assertEqual(next(stream), 11)
+        self.assertTrue(page.has_more)
+        self.assertEqual(cursor.page(0, 10).recipes, list(range(10)))
+    
+    def test_last_page(self):
+        """Test the last page has no cursor, including when it is exactly full"""
+        self.assertEqual(SearchCursor(iter(range(25))).page(20, 10).recipes, list(range(20, 25)))
+        self.assertFalse(SearchCursor(iter(range(20))).page(10, 10).has_more)
+        self.assertTrue(SearchCursor(iter(range(21))).page(10, 10).has_more)
+        self.assertEqual(SearchCursor(iter([])).page(0, 10).recipes, [])
+    
+    def test_resume(self):
+        """Test tokens find their cursor and offset, and bad or expired tokens are rejected"""
+        cursor = open_cursor(iter(range(25)))
+        token = cursor.page(0, 10).cursor
+        
+        self.assertEqual(resume_cursor(token), (cursor, 10))
+        for bad in (None, "", "nonsense", f"{cursor.id}:x"):
+            with self.assertRaises(ValueError):
+                resume_cursor(bad)
+        close_cursor(token)
+        with self.assertRaises(ValueError):
+            resume_cursor(token)
+    
+    def test_oldest_cursor_expires(self):
+        """Test only the most recently used cursors are kept"""
+        first = open_cursor(iter(range(5))).token(0)
+        for _ in range(pagination.CURSOR_CACHE_SIZE):
+            open_cursor(iter(range(5)))
+        
+        with self.assertRaises(ValueError):
+            resume_cursor(first)
+
+class TestSearchPages(unittest.TestCase):
+    """Test paging through orchestrator searches"""
+    
+    def setUp(self):
+        self.orchestrator = RecipeOrchestrator()
+    
+    def pages(self, page_size, **kwargs):
+        page = self.orchestrator.search_page(page_size=page_size, **kwargs)
+        recipes = list(page.recipes)
+        while page.has_more:
+            page = self.orchestrator.search_page(cursor=page.cursor, page_size=page_size)
+            recipes.extend(page.recipes)
+        return recipes
+    
+    def test_pages_concatenate_to_stream(self):
+        """Test consecutive pages are the streamed results, without repeats"""
+        expected = list(self.orchestrator.iter_search(["eggs", "onion", "rice"], max_missing=4))
+        
+        recipes = self.pages(7, ingredients=["eggs", "onion", "rice"], max_missing=4)
+        
+        self.assertGreater(len(expected), 7)
+        self.assertEqual([r.id for r in recipes], [r.id for r in expected])
+        self.assertEqual(len({r.id for r in recipes}), len(recipes))
+    
+    def test_matches_search_without_dedup(self):
+        """Test streamed results are ranked exactly like search"""
+        with mock.patch.object(config, "DEDUPLICATE_RESULTS", False):
+            for sort_by in ("used-desc", "missing-asc", "time-asc"):
+                expected = self.orchestrator.search(["chicken", "garlic"], max_results=60, sort_by=sort_by)
+                
+                results = list(self.orchestrator.iter_search(["chicken", "garlic"], sort_by=sort_by, max_results=60))
+                
+                self.assertEqual([r.id for r in results], [r.id for r in expected], sort_by)
+    
+    def test_cursor_keeps_filters(self):
+        """Test later pages keep the filters and sort order of the first request"""
+        recipes = self.pages(5, ingredients=["rice"], max_minutes=20, sort_by="time-asc")
+        
+        self.assertTrue(recipes)
+        self.assertTrue(all(r.ready_in_minutes <= 20 for r in recipes))
+        self.assertEqual([r.ready_in_minutes for r in recipes], sorted(r.ready_in_minutes for r in recipes))
+    
+    def test_page_token_reuse(self):
+        """Test a token can be used again and gives the same page"""
+        first = self.orchestrator.search_page(["eggs"], page_size=5)
+        second = self.orchestrator.search_page(cursor=first.cursor, page_size=5)
+        
+        again = self.orchestrator.search_page(cursor=first.cursor, page_size=5)
+        
+        self.assertEqual([r.id for r in again.recipes], [r.id for r in second.recipes])
+        self.assertEqual(again.cursor, second.cursor)
+    
+    def test_empty_search(self):
+        """Test a search without ingredients or query has a single empty page"""
+        page = self.orchestrator.search_page([])
+        
+        self.assertEqual(page.recipes, [])
+        self.assertFalse(page.has_more)
+
+if __name__ == '__main__':
+    unittest.main()
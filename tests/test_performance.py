@@ -0,0 +1,133 @@
+"""Tests for performance utilities"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from core import performance
+from core.export import export_to_json
+from core.model import IngredientItem, Provider, Recipe
+from core.performance import (
+    available_json_backends,
+    get_json_backend,
+    set_json_backend,
+    json_loads,
+    json_dumps,
+    prewarm_connections,
+    LRUCache
+)
+
+class TestJsonCodecs(unittest.TestCase):
+    """Test the pluggable JSON codec layer"""
+    
+    def setUp(self):
+        self.default_backend = get_json_backend()
+    
+    def tearDown(self):
+        set_json_backend(self.default_backend)
+    
+    def test_stdlib_always_available(self):
+        """Test stdlib json is always registered"""
+        self.assertIn("json", available_json_backends())
+    
+    def test_round_trip_all_backends(self):
+        """Test every installed codec decodes what it encodes"""
+        doc = {"meals": [{"idMeal": "52772", "strMeal": "Crème brûlée", "n": 3}]}
+        for backend in available_json_backends():
+            set_json_backend(backend)
+            self.assertEqual(json_loads(json_dumps(doc, indent=2)), doc)
+            self.assertEqual(json_loads(json_dumps(doc).encode("utf-8")), doc)
+            self.assertIn("Crème", json_dumps(doc))
+    
+    def test_export_same_across_backends(self):
+        """Test exported JSON matches the stdlib output for every codec (URLs unescaped)"""
+        recipe = Recipe(id="52772", provider=Provider.THEMEALDB, title="Crème brûlée",
+                        image_url="https://www.themealdb.com/images/media/meals/1.jpg",
+                        source_url="https://example.com/a/b", ingredients=[IngredientItem("eggs", "2")])
+        outputs = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recipes.json")
+            for backend in available_json_backends():
+                set_json_backend(backend)
+                with mock.patch("builtins.print"):
+                    export_to_json([recipe], path)
+                with open(path, encoding="utf-8") as f:
+                    outputs[backend] = f.read()
+        
+        for backend, text in outputs.items():
+            self.assertEqual(json.loads(text), json.loads(outputs["json"]), backend)
+            self.assertIn('"https://example.com/a/b"', text, backend)
+            self.assertIn("Crème brûlée", text, backend)
+    
+    def test_invalid_json_raises_value_error(self):
+        """Test decode errors surface as ValueError for every codec"""
+        for backend in available_json_backends():
+            set_json_backend(backend)
+            with self.assertRaises(ValueError):
+                json_loads(b"{not json")
+    
+    def test_unknown_backend(self):
+        """Test selecting a missing codec fails"""
+        with self.assertRaises(ValueError):
+            set_json_backend("no-such-codec")
+
+class TestPrewarmConnections(unittest.TestCase):
+    """Test background connection warmup"""
+    
+    def test_warms_pooled_session(self):
+        """Test warmup issues a request through the provider's pooled session"""
+        session = mock.Mock()
+        with mock.patch.dict(performance._http_session_pool, {"testprovider": session}):
+            prewarm_connections({"testprovider": "https://example.invalid/"}).join(timeout=5)
+        
+        session.head.assert_called_once()
+        self.assertEqual(session.head.call_args[0][0], "https://example.invalid/")
+    
+    def test_failures_are_ignored(self):
+        """Test warmup errors don't escape the background thread"""
+        session = mock.Mock()
+        session.head.side_effect = OSError("no network")
+        with mock.patch.dict(performance._http_session_pool, {"testprovider": session}):
+            thread = prewarm_connections({"testprovider": "https://example.invalid/"})
+            thread.join(timeout=5)
+        
+        self.assertFalse(thread.is_alive())
+
+class TestLRUCache(unittest.TestCase):
+    """Test the bounded LRU cache"""
+    
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted first"""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+    
+    def test_stats(self):
+        """Test hit/miss counting"""
+        cache = LRUCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hit_rate"], "50.0%")
+    
+    def test_pop(self):
+        """Test removed entries are gone and removal does not count as a lookup"""
+        cache = LRUCache()
+        cache.put("a", 1)
+        
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertIsNone(cache.pop("a"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats()["hits"] + cache.stats()["misses"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
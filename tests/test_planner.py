@@ -0,0 +1,85 @@
+"""Tests for meal planning"""
+import time
+import unittest
+from core.model import Recipe, Provider
+from core.planner import plan_meals, plan_week, shopping_list
+
+def make_recipe(recipe_id, missing, title=None):
+    return Recipe(
+        id=recipe_id,
+        provider=Provider.THEMEALDB,
+        title=title or f"Recipe {recipe_id}",
+        used_ingredients=["egg"],
+        missing_ingredients=missing
+    )
+
+class TestPlanMeals(unittest.TestCase):
+    """Test choosing recipes with the shortest combined shopping list"""
+    
+    def setUp(self):
+        self.recipes = [
+            make_recipe("a", ["apple"]),
+            make_recipe("b", ["bread", "cheese"]),
+            make_recipe("c", ["Bread", "cheese "]),
+            make_recipe("d", ["dill", "eel"]),
+        ]
+    
+    def test_beam_beats_greedy(self):
+        """Test two recipes sharing both missing ingredients beat the single best recipe"""
+        greedy = plan_meals(self.recipes, 2, beam_width=1)
+        plan = plan_meals(self.recipes, 2)
+        
+        self.assertEqual(greedy.missing_count, 3)
+        self.assertEqual([r.id for r in plan.recipes], ["b", "c"])
+        self.assertEqual(plan.shopping_list, [("bread", 2), ("cheese", 2)])
+    
+    def test_optimal_on_small_input(self):
+        """Test the plan matches an exhaustive search on a small pool"""
+        from itertools import combinations
+        recipes = [make_recipe(str(i), [f"item{(i * 7 + j * 3) % 11}" for j in range(i % 4)]) for i in range(12)]
+        for count in (1, 3, 5):
+            best = min(len({m for r in combo for m in r.missing_ingredients})
+                       for combo in combinations(recipes, count))
+            
+            self.assertEqual(plan_meals(recipes, count).missing_count, best, count)
+    
+    def test_repeated_titles_used_once(self):
+        """Test the same dish is not planned twice"""
+        recipes = [make_recipe("1", [], "Soup"), make_recipe("2", [], "soup"), make_recipe("3", ["salt"])]
+        
+        plan = plan_meals(recipes, 2)
+        
+        self.assertEqual([r.id for r in plan.recipes], ["1", "3"])
+    
+    def test_fewer_candidates_than_days(self):
+        """Test a short pool plans every recipe and an empty pool plans none"""
+        self.assertEqual(len(plan_meals(self.recipes, 10).recipes), 4)
+        self.assertEqual(plan_meals([], 7).recipes, [])
+    
+    def test_shopping_list(self):
+        """Test missing ingredients are merged case-insensitively and counted per recipe"""
+        recipes = [make_recipe("1", ["Salt", "salt", "rice"]), make_recipe("2", ["salt"])]
+        
+        self.assertEqual(shopping_list(recipes), [("Salt", 2), ("rice", 1)])
+
+class TestPlanWeek(unittest.TestCase):
+    """Test planning from the local recipes"""
+    
+    def test_filters_and_speed(self):
+        """Test a filtered weekly plan is fast and only uses matching recipes"""
+        pantry = ["eggs", "rice", "onion", "garlic", "salt", "butter"]
+        plan_week(pantry, 1)
+        
+        start = time.perf_counter()
+        plan = plan_week(pantry, 7, diet="vegetarian", max_minutes=45)
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(len(plan.recipes), 7)
+        self.assertLess(elapsed, 1.0)
+        for recipe in plan.recipes:
+            self.assertIn("vegetarian", [c.lower() for c in recipe.category_or_diet])
+            self.assertLessEqual(recipe.ready_in_minutes, 45)
+        self.assertEqual(plan.shopping_list, shopping_list(plan.recipes))
+
+if __name__ == '__main__':
+    unittest.main()
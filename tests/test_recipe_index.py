@@ -0,0 +1,354 @@
+"""Tests for the prebuilt ingredient index"""
+import os
+import tempfile
+import unittest
+from core.normalize import ingredients_match
+from providers import recipe_index
+from providers.recipe_index import IngredientIndex, IngredientMatchIndex, RecipeColumns, file_digest, load_or_build
+from providers.fallback_recipes import RECIPES_PATH, INDEX_PATH, load_fallback_recipes
+
+RECIPES = [
+    {"id": "a", "ingredients": ["Eggs", "onion"]},
+    {"id": "b", "ingredients": ["onion", "rice"]},
+    {"id": "c", "ingredients": ["rice", "salt", "salt"]},
+]
+
+class TestIngredientIndex(unittest.TestCase):
+    """Test building, saving and mapping the index"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "test.idx")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_build(self):
+        """Test posting lists hold ascending recipe positions"""
+        index = IngredientIndex.build(RECIPES)
+        
+        self.assertEqual(index.terms, ["eggs", "onion", "rice", "salt"])
+        self.assertEqual(list(index.postings(index.term_ids["onion"])), [0, 1])
+        self.assertEqual(list(index.postings(index.term_ids["salt"])), [2, 2])
+        self.assertEqual(index.n_recipes, 3)
+    
+    def test_save_and_load(self):
+        """Test a mapped index matches the built one"""
+        built = IngredientIndex.build(RECIPES)
+        built.save(self.path, b"x" * 32)
+        loaded = IngredientIndex.load(self.path, b"x" * 32)
+        
+        self.assertEqual(loaded.terms, built.terms)
+        self.assertEqual(loaded.n_recipes, 3)
+        for (term, posting), (term2, posting2) in zip(built.items(), loaded.items()):
+            self.assertEqual(term, term2)
+            self.assertEqual(list(posting), list(posting2))
+    
+    def test_id_lookup(self):
+        """Test recipes are found by id in built and mapped indexes"""
+        built = IngredientIndex.build(RECIPES)
+        built.save(self.path, b"x" * 32)
+        loaded = IngredientIndex.load(self.path, b"x" * 32)
+        
+        for index in (built, loaded):
+            self.assertEqual([index.position_of(r["id"]) for r in RECIPES], [0, 1, 2])
+            self.assertIsNone(index.position_of("missing"))
+            self.assertEqual(index.ids[1], "b")
+        loaded.close()
+    
+    def test_close_releases_mapping(self):
+        """Test closing unmaps the file, after searches on both engines"""
+        IngredientIndex.build(RECIPES).save(self.path, b"x" * 32)
+        index = IngredientIndex.load(self.path, b"x" * 32)
+        mapped = index._mmap
+        for vectorize in {False, recipe_index.VECTORIZE}:
+            recipe_index.VECTORIZE, saved = vectorize, recipe_index.VECTORIZE
+            index._totals = None
+            try:
+                keep = index.columns.mask(None, 30)
+                index.top_matches(index.matching_terms(["rice"]), 2, "time-asc", keep)
+                index.position_of("c")
+            finally:
+                recipe_index.VECTORIZE = saved
+        
+        index.close()
+        
+        self.assertTrue(mapped.closed)
+    
+    def test_stale_index_rejected(self):
+        """Test an index built from other data is not used"""
+        IngredientIndex.build(RECIPES).save(self.path, b"x" * 32)
+        
+        self.assertIsNone(IngredientIndex.load(self.path, b"y" * 32))
+        self.assertIsNone(IngredientIndex.load(os.path.join(self.tmp.name, "missing.idx")))
+    
+    def test_load_or_build_rebuilds(self):
+        """Test a missing index is rebuilt and written"""
+        data_path = os.path.join(self.tmp.name, "data.jsonl")
+        with open(data_path, "w") as f:
+            f.write("{}\n")
+        
+        index = load_or_build(data_path, self.path, lambda: IngredientIndex.build(RECIPES))
+        
+        self.assertEqual(len(index), 4)
+        self.assertIsNotNone(IngredientIndex.load(self.path, file_digest(data_path)))
+    
+    def test_shipped_index_is_current(self):
+        """Test the shipped index was built from the shipped data"""
+        shipped = IngredientIndex.load(INDEX_PATH, file_digest(RECIPES_PATH))
+        
+        self.assertIsNotNone(shipped, "run: python -m providers.recipe_index build")
+        self.assertEqual(shipped.n_recipes, len(load_fallback_recipes()))
+
+class TestRecipeColumns(unittest.TestCase):
+    """Test the columnar metadata and filter masks"""
+    
+    RECIPES = [
+        {"id": "a", "ingredients": ["rice"], "time": 20, "servings": 2, "cuisine": "Thai", "category": ["Vegan", "Quick"]},
+        {"id": "b", "ingredients": ["rice"], "time": 45, "servings": 4, "cuisine": "Indian", "category": ["vegetarian"]},
+        {"id": "c", "ingredients": ["rice"], "time": 0, "category": ["vegan"]},
+        {"id": "d", "ingredients": ["rice"], "time": 10},
+    ]
+    
+    def setUp(self):
+        self.vectorize = recipe_index.VECTORIZE
+    
+    def tearDown(self):
+        recipe_index.VECTORIZE = self.vectorize
+    
+    def check_masks(self, columns):
+        self.assertIsNone(columns.mask())
+        self.assertEqual(list(map(bool, columns.mask(diet="VEGAN"))), [True, False, True, False])
+        self.assertEqual(list(map(bool, columns.mask(max_minutes=30))), [True, False, False, True])
+        self.assertEqual(list(map(bool, columns.mask(diet="vegan", max_minutes=30))), [True, False, False, False])
+        self.assertFalse(any(columns.mask(diet="keto")))
+    
+    def test_build(self):
+        """Test values are stored per position with -1 for unknown"""
+        columns = RecipeColumns.build(self.RECIPES)
+        
+        self.assertEqual(list(columns.time), [20, 45, 0, 10])
+        self.assertEqual(list(columns.servings), [2, 4, -1, -1])
+        self.assertEqual([columns.cuisines[c] if c >= 0 else None for c in columns.cuisine],
+                         ["Thai", "Indian", None, None])
+        self.assertTrue(columns.has_category(0, "quick"))
+        self.assertFalse(columns.has_category(1, "vegan"))
+        self.assertIsNone(RecipeColumns.build([{"ingredients": []}]).time_of(0))
+    
+    def test_masks_pure_python(self):
+        """Test filter masks without NumPy"""
+        recipe_index.VECTORIZE = False
+        self.check_masks(RecipeColumns.build(self.RECIPES))
+    
+    @unittest.skipIf(not recipe_index.HAS_NUMPY, "NumPy not installed")
+    def test_masks_vectorized(self):
+        """Test filter masks with NumPy"""
+        recipe_index.VECTORIZE = True
+        self.check_masks(RecipeColumns.build(self.RECIPES))
+    
+    def test_saved_columns(self):
+        """Test columns survive a save/load round trip, with more than 32 categories"""
+        recipes = self.RECIPES + [{"ingredients": ["salt"], "category": [f"tag{i}" for i in range(40)]}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "test.idx")
+            IngredientIndex.build(recipes).save(path, b"x" * 32)
+            loaded = IngredientIndex.load(path, b"x" * 32)
+            
+            self.assertEqual(list(loaded.columns.time), [20, 45, 0, 10, -1])
+            self.assertEqual(loaded.columns.cuisines, ["Indian", "Thai"])
+            self.assertTrue(loaded.columns.has_category(4, "tag39"))
+            self.assertIsNone(loaded.row_offsets)
+            
+            IngredientIndex.build(recipes, row_offsets=[10, 20, 30, 40, 2**40]).save(path, b"x" * 32)
+            self.assertEqual(list(IngredientIndex.load(path).row_offsets), [10, 20, 30, 40, 2**40])
+            self.assertFalse(loaded.columns.has_category(0, "tag39"))
+
+class TestScoring(unittest.TestCase):
+    """Test batched used/total counting"""
+    
+    def setUp(self):
+        self.vectorize = recipe_index.VECTORIZE
+    
+    def tearDown(self):
+        recipe_index.VECTORIZE = self.vectorize
+    
+    def score(self, index, terms):
+        scores = index.score(index.term_ids[t] for t in terms)
+        return list(zip(*scores))
+    
+    def test_pure_python(self):
+        """Test counts without NumPy"""
+        recipe_index.VECTORIZE = False
+        index = IngredientIndex.build(RECIPES)
+        
+        self.assertEqual(self.score(index, ["onion", "salt"]), [(0, 1, 2), (1, 1, 2), (2, 2, 3)])
+        self.assertEqual(self.score(index, []), [])
+    
+    def test_filter_mask(self):
+        """Test recipes outside the filter mask are not scored"""
+        recipe_index.VECTORIZE = False
+        index = IngredientIndex.build(RECIPES)
+        
+        scores = index.score([index.term_ids["onion"], index.term_ids["salt"]], keep=bytearray([1, 0, 1]))
+        self.assertEqual(list(zip(*scores)), [(0, 1, 2), (2, 2, 3)])
+    
+    def test_exclude_terms(self):
+        """Test excluded terms clear their recipes from the mask, on both engines"""
+        engines = [False, True] if recipe_index.HAS_NUMPY else [False]
+        for vectorize in engines:
+            recipe_index.VECTORIZE = vectorize
+            index = IngredientIndex.build(RECIPES)
+            
+            keep = index.exclude_terms([index.term_ids["eggs"]])
+            self.assertEqual(list(map(bool, keep)), [False, True, True])
+            keep = index.exclude_terms([index.term_ids["salt"]], keep)
+            self.assertEqual(list(map(bool, keep)), [False, True, False])
+            self.assertEqual(list(zip(*index.score([index.term_ids["rice"]], keep))), [(1, 1, 2)])
+    
+    @unittest.skipIf(not recipe_index.HAS_NUMPY, "NumPy not installed")
+    def test_vectorized_matches_pure_python(self):
+        """Test the NumPy engine gives identical scores"""
+        index = IngredientIndex.build(load_fallback_recipes())
+        terms = index.matching_terms(["egg", "onion", "salt", "rice"])
+        
+        recipe_index.VECTORIZE = False
+        expected = index.score(terms)
+        expected_filtered = index.score(terms, index.columns.mask(diet="vegetarian", max_minutes=30))
+        recipe_index.VECTORIZE = True
+        index._totals = None
+        
+        self.assertEqual(index.score(terms), expected)
+        self.assertEqual(index.score(terms, index.columns.mask(diet="vegetarian", max_minutes=30)), expected_filtered)
+    
+    @unittest.skipIf(not recipe_index.HAS_NUMPY, "NumPy not installed")
+    def test_top_matches_engines_agree(self):
+        """Test vectorized top-k selection gives the same candidates and tie order"""
+        index = IngredientIndex.build(load_fallback_recipes())
+        terms = index.matching_terms(["egg", "onion", "salt", "rice", "garlic"])
+        for sort_by in ["relevance", "match-desc", "used-desc", "missing-asc", "time-asc", "unknown"]:
+            for k in (1, 10, 1000):
+                for filters in ({}, {"diet": "vegan"}, {"max_minutes": 30}):
+                    recipe_index.VECTORIZE = False
+                    index._totals = None
+                    expected = index.top_matches(terms, k, sort_by, index.columns.mask(**filters))
+                    recipe_index.VECTORIZE = True
+                    index._totals = None
+                    result = index.top_matches(terms, k, sort_by, index.columns.mask(**filters))
+                    
+                    self.assertEqual(result, expected, (sort_by, k, filters))
+        self.assertEqual(index.top_matches([], 10), [])
+    
+    def test_ranked_matches(self):
+        """Test streaming every match in ranked chunks equals one top-k over all recipes, on both engines"""
+        index = IngredientIndex.build(load_fallback_recipes())
+        terms = index.matching_terms(["egg", "onion", "salt", "rice", "garlic"])
+        engines = [False, True] if recipe_index.HAS_NUMPY else [False]
+        for vectorize in engines:
+            recipe_index.VECTORIZE = vectorize
+            index._totals = None
+            for sort_by in ["relevance", "missing-asc", "time-asc", "unknown"]:
+                for filters in ({}, {"diet": "vegan"}):
+                    keep = index.columns.mask(**filters)
+                    expected = index.top_matches(terms, index.n_recipes, sort_by, keep)
+                    
+                    result = list(index.ranked_matches(terms, sort_by, keep, chunk_size=7))
+                    
+                    self.assertEqual(result, expected, (vectorize, sort_by, filters))
+            self.assertEqual(list(index.ranked_matches([])), [])
+    
+    def test_max_missing(self):
+        """Test max_missing keeps exactly the recipes missing at most k ingredients, on both engines"""
+        recipes = load_fallback_recipes()
+        engines = [False, True] if recipe_index.HAS_NUMPY else [False]
+        for vectorize in engines:
+            recipe_index.VECTORIZE = vectorize
+            index = IngredientIndex.build(recipes)
+            terms = index.matching_terms(["egg", "onion", "salt", "rice", "garlic", "butter"])
+            everything = index.top_matches(terms, len(recipes), "missing-asc")
+            for max_missing in (0, 1, 2):
+                expected = [c for c in everything if c[2] - c[1] <= max_missing]
+                
+                result = index.top_matches(terms, len(recipes), "missing-asc", max_missing=max_missing)
+                
+                self.assertEqual(result, expected, (vectorize, max_missing))
+                self.assertEqual(index.top_matches(terms, 3, "relevance", max_missing=max_missing),
+                                 index.top_matches(terms, len(recipes), "relevance", max_missing=max_missing)[:3])
+    
+    def test_unlock_counts(self):
+        """Test per-ingredient counts of recipes missing only it match brute force, on both engines"""
+        recipes = load_fallback_recipes()
+        index = IngredientIndex.build(recipes)
+        recipe_terms = [[] for _ in recipes]
+        for term_id in range(len(index.terms)):
+            for position in index.postings(term_id):
+                recipe_terms[position].append(term_id)
+        terms = index.matching_terms(["egg", "onion", "salt", "rice", "garlic", "butter"])
+        keep = index.columns.mask(diet="vegetarian")
+        
+        expected, expected_filtered = {}, {}
+        for position, owned in enumerate(recipe_terms):
+            missing = [term_id for term_id in owned if term_id not in terms]
+            if len(missing) == 1:
+                expected[missing[0]] = expected.get(missing[0], 0) + 1
+                if keep[position]:
+                    expected_filtered[missing[0]] = expected_filtered.get(missing[0], 0) + 1
+        
+        self.assertTrue(expected)
+        engines = [False, True] if recipe_index.HAS_NUMPY else [False]
+        for vectorize in engines:
+            recipe_index.VECTORIZE = vectorize
+            index._totals = None
+            self.assertEqual(index.unlock_counts(terms), expected, vectorize)
+            self.assertEqual(index.unlock_counts(terms, index.columns.mask(diet="vegetarian")), expected_filtered)
+    
+    def test_missing_sets(self):
+        """Test recipes grouped by their missing terms match brute force, on both engines"""
+        recipes = load_fallback_recipes()
+        index = IngredientIndex.build(recipes)
+        recipe_terms = [[] for _ in recipes]
+        for term_id in range(len(index.terms)):
+            for position in index.postings(term_id):
+                recipe_terms[position].append(term_id)
+        terms = index.matching_terms(["egg", "onion", "salt", "rice", "garlic", "butter"])
+        
+        engines = [False, True] if recipe_index.HAS_NUMPY else [False]
+        for vectorize in engines:
+            recipe_index.VECTORIZE = vectorize
+            index._totals = None
+            keep = index.columns.mask(diet="vegetarian")
+            for max_missing in (1, 3):
+                expected, expected_filtered = {}, {}
+                for position, owned in enumerate(recipe_terms):
+                    missing = tuple(term_id for term_id in owned if term_id not in terms)
+                    if 1 <= len(missing) <= max_missing:
+                        expected[missing] = expected.get(missing, 0) + 1
+                        if keep[position]:
+                            expected_filtered[missing] = expected_filtered.get(missing, 0) + 1
+                
+                self.assertTrue(expected)
+                self.assertEqual(index.missing_sets(terms, max_missing), expected, (vectorize, max_missing))
+                self.assertEqual(index.missing_sets(terms, max_missing, keep), expected_filtered)
+            self.assertEqual({missing[0]: count for missing, count in index.missing_sets(terms, 1).items()},
+                             index.unlock_counts(terms))
+
+class TestIngredientMatchIndex(unittest.TestCase):
+    """Test the fuzzy term matcher agrees with ingredients_match"""
+    
+    def test_same_semantics_as_ingredients_match(self):
+        """Test exact, containment and plural matches over the real vocabulary"""
+        terms = IngredientIndex.build(load_fallback_recipes()).terms
+        matcher = IngredientMatchIndex(terms)
+        queries = ["egg", "Tomatoes", "chicken breast", "oil", "s", "pepper", "xyz", "  Onion "]
+        queries += [term[:n] for term in terms[::7] for n in (1, 2, 4)]
+        
+        for query in queries:
+            expected = {i for i, term in enumerate(terms) if ingredients_match(query, term)}
+            self.assertEqual(set(matcher.match(query)), expected, query)
+    
+    def test_empty_query_matches_everything(self):
+        """Test the empty string matches all terms, like a substring check"""
+        matcher = IngredientMatchIndex(["egg", "rice"])
+        self.assertEqual(matcher.match(""), {0, 1})
+
+if __name__ == '__main__':
+    unittest.main()
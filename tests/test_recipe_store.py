@@ -0,0 +1,207 @@
+"""Tests for searchable recipe data files"""
+import json
+import os
+import tempfile
+import unittest
+from providers.recipe_store import (
+    RecipeStore,
+    iter_recipe_rows,
+    iter_stores,
+    read_recipe_file,
+    write_recipe_file
+)
+
+RECIPES = [
+    {"id": "r1", "title": "Egg Fried Rice", "cuisine": "Chinese", "category": ["Quick"],
+     "ingredients": ["eggs", "rice", "soy sauce"], "time": 15, "servings": 2, "instructions": "Fry."},
+    {"id": "r2", "title": "Tomato Soup", "cuisine": "Universal", "category": ["Vegan"],
+     "ingredients": ["tomato", "onion"], "time": 30, "servings": 4, "instructions": "Simmer."},
+    {"id": "r3", "title": "Crème Brûlée", "cuisine": "French", "category": ["Dessert"],
+     "ingredients": ["eggs", "cream", "sugar"], "time": 60, "servings": 4, "instructions": "Bake."},
+]
+
+class TestRecipeFiles(unittest.TestCase):
+    """Test reading and writing data files"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "recipes.jsonl")
+        write_recipe_file(self.path, RECIPES)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_round_trip(self):
+        """Test written recipes read back unchanged"""
+        self.assertEqual(read_recipe_file(self.path), RECIPES)
+    
+    def test_row_offsets(self):
+        """Test streamed rows carry the byte offset of their line"""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        rows = list(iter_recipe_rows(self.path))
+        
+        self.assertEqual([recipe for _, recipe in rows], RECIPES)
+        for offset, recipe in rows:
+            self.assertEqual(json.loads(data[offset:].split(b"\n", 1)[0]), recipe)
+    
+    def test_bad_header(self):
+        """Test files without the format header are rejected"""
+        with open(self.path, "w") as f:
+            f.write('{"id": "r1"}\n')
+        with self.assertRaises(ValueError):
+            read_recipe_file(self.path)
+
+class TestRecipeStore(unittest.TestCase):
+    """Test searching a data file through its index"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "recipes.jsonl")
+        write_recipe_file(self.path, RECIPES)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_search_reads_only_results(self):
+        """Test results are parsed from single lines, without loading the file"""
+        store = RecipeStore(self.path)
+        results = store.search(["egg"], max_results=10)
+        
+        self.assertEqual([r.id for r in results], ["r1", "r3"])
+        self.assertEqual(results[1].title, "Crème Brûlée")
+        self.assertEqual(results[0].used_ingredients, ["eggs"])
+        self.assertIsNone(store._recipes)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "recipes.idx")))
+    
+    def test_filters_and_exclude(self):
+        """Test diet, time and exclude filters"""
+        store = RecipeStore(self.path)
+        
+        self.assertEqual([r.id for r in store.search(["eggs", "tomato"], diet="vegan")], ["r2"])
+        self.assertEqual([r.id for r in store.search(["eggs"], max_minutes=20)], ["r1"])
+        self.assertEqual([r.id for r in store.search(["eggs"], exclude=["sugar"])], ["r1"])
+    
+    def test_count(self):
+        """Test the count comes from the header"""
+        self.assertEqual(RecipeStore(self.path).count(), 3)
+
+class TestRecipeStoreUpdates(unittest.TestCase):
+    """Test adding, removing and updating recipes without rebuilding the index"""
+    
+    NEW = {"id": "r4", "title": "Shakshuka", "cuisine": "Middle Eastern", "category": ["Vegetarian"],
+           "ingredients": ["eggs", "tomato", "paprika"], "time": 25, "servings": 2, "instructions": "Poach."}
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "recipes.jsonl")
+        write_recipe_file(self.path, RECIPES)
+        self.store = RecipeStore(self.path)
+    
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+    
+    def test_add(self):
+        """Test an added recipe is searchable, including new ingredients and filters"""
+        position = self.store.add_recipe(self.NEW)
+        
+        self.assertEqual(position, 3)
+        self.assertIsNone(self.store._recipes)
+        results = self.store.search(["eggs", "tomato"])
+        self.assertEqual([r.id for r in results], ["r4", "r2", "r1", "r3"])
+        self.assertEqual(results[0].used_ingredients, ["eggs", "tomato"])
+        self.assertEqual([r.id for r in self.store.search(["paprika"])], ["r4"])
+        self.assertEqual([r.id for r in self.store.search(["eggs"], diet="vegetarian")], ["r4"])
+        self.assertEqual([r.id for r in self.store.search(["eggs"], exclude=["paprika"])], ["r1", "r3"])
+        self.assertEqual(self.store.count(), 4)
+        with self.assertRaises(ValueError):
+            self.store.add_recipe(self.NEW)
+    
+    def test_similar(self):
+        """Test similar recipes follow additions and removals after the LSH index is built"""
+        self.assertEqual(self.store.similar(["Eggs", "rice", "soy sauce"]), [(1.0, 0)])
+        
+        self.store.add_recipe(dict(self.NEW, id="r5", ingredients=["eggs", "rice", "soy sauce"]))
+        self.assertEqual(self.store.similar(["eggs", "rice", "soy sauce"]), [(1.0, 0), (1.0, 3)])
+        self.store.remove_recipe("r1")
+        self.assertEqual(self.store.similar(["eggs", "rice", "soy sauce"]), [(1.0, 3)])
+        self.assertEqual(self.store.similar([]), [])
+    
+    def test_text_query(self):
+        """Test free-text queries see added and removed recipes, alone and with ingredients"""
+        self.assertEqual([r.id for r in self.store.search(["eggs"], query="fry")], ["r1"])
+        self.assertEqual([position for _, position in self.store.text_search("fr*")], [0, 2])
+        
+        self.store.add_recipe(dict(self.NEW, title="Poached Eggs"))
+        self.store.remove_recipe("r3")
+        
+        self.assertEqual([r.id for r in self.store.search(["eggs"], query="poach*")], ["r4"])
+        self.assertEqual([position for _, position in self.store.text_search("fr*")], [0])
+        self.assertEqual(sorted(position for _, position in self.store.text_search("egg*")), [0, 3])
+        self.assertEqual([position for _, position in self.store.text_search("egg*", max_minutes=20)], [0])
+        self.assertEqual([position for _, position in self.store.text_search("egg*", exclude=["soy sauce"])], [3])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "recipes.tidx")))
+    
+    def test_ranked_candidates(self):
+        """Test streamed results follow additions and removals in the same order as search"""
+        self.store.add_recipe(self.NEW)
+        self.store.remove_recipe("r1")
+        for sort_by in ("relevance", "missing-asc", "time-asc"):
+            expected = self.store.search(["eggs", "tomato"], 10, sort_by=sort_by)
+            
+            results = list(iter_stores([self.store], ["eggs", "tomato"], sort_by=sort_by))
+            
+            self.assertEqual([r.id for r in results], [r.id for r in expected], sort_by)
+        self.assertEqual([r.id for r in iter_stores([self.store], ["eggs"], query="poach")], ["r4"])
+        self.assertEqual(list(iter_stores([self.store], ["paprika"], exclude=["paprika"])), [])
+    
+    def test_missing_sets(self):
+        """Test recipes grouped by missing ingredients follow additions, removals and filters"""
+        self.store.add_recipe(self.NEW)
+        self.store.remove_recipe("r3")
+        
+        self.assertEqual(self.store.missing_sets(["eggs"], 2),
+                         {("rice", "soy sauce"): 1, ("onion", "tomato"): 1, ("paprika", "tomato"): 1})
+        self.assertEqual(self.store.missing_sets(["eggs"], 2, max_minutes=20), {("rice", "soy sauce"): 1})
+        self.assertEqual(self.store.missing_sets(["eggs", "tomato"], 1), {("onion",): 1, ("paprika",): 1})
+    
+    def test_remove_and_update(self):
+        """Test removed recipes disappear and updated ones are searched with their new data"""
+        self.assertTrue(self.store.remove_recipe("r1"))
+        self.assertFalse(self.store.remove_recipe("r1"))
+        self.assertIsNone(self.store._recipes)
+        self.assertEqual([r.id for r in self.store.search(["eggs"])], ["r3"])
+        
+        self.store.update_recipe(dict(RECIPES[2], ingredients=["eggs", "sugar"], time=20))
+        results = self.store.search(["eggs"], max_minutes=30)
+        self.assertEqual([r.id for r in results], ["r3"])
+        self.assertEqual(results[0].missing_ingredients, ["sugar"])
+        self.assertEqual(self.store.count(), 2)
+        with self.assertRaises(KeyError):
+            self.store.update_recipe(dict(RECIPES[0]))
+    
+    def test_check_and_compact(self):
+        """Test the consistency check, and that compacting persists the changes"""
+        self.store.add_recipe(self.NEW)
+        self.store.remove_recipe("r2")
+        self.assertEqual(self.store.check(), [])
+        expected = [r.id for r in self.store.search(["eggs", "tomato"])]
+        
+        self.store.compact()
+        
+        reopened = RecipeStore(self.path)
+        self.assertEqual([r["id"] for r in reopened.recipes()], ["r1", "r3", "r4"])
+        self.assertEqual([r.id for r in reopened.search(["eggs", "tomato"])], expected)
+        self.assertEqual(reopened.check(), [])
+        self.assertFalse(self.store.modified)
+    
+    def test_check_detects_stale_index(self):
+        """Test the check reports an index that does not match the data file"""
+        self.store.index
+        self.store._index.columns.time[0] = 99
+        
+        self.assertTrue(self.store.check())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for MinHash signatures and LSH buckets"""
+import os
+import subprocess
+import sys
+import unittest
+from core import similarity
+from core.similarity import LSHIndex, MinHasher, estimate_jaccard, ingredient_tokens, jaccard
+
+def token_sets():
+    """Overlapping ingredient sets of varying similarity"""
+    base = [f"item {i}" for i in range(20)]
+    return [set(base[i:i + 8 + i % 5]) for i in range(12)] + [set(), {"salt"}]
+
+class TestMinHash(unittest.TestCase):
+    """Test signatures estimate Jaccard similarity"""
+    
+    def setUp(self):
+        self.vectorize = similarity.VECTORIZE
+    
+    def tearDown(self):
+        similarity.VECTORIZE = self.vectorize
+    
+    def test_ingredient_tokens(self):
+        """Test names are normalized and blanks dropped"""
+        self.assertEqual(ingredient_tokens([" Salt", "salt", "", "Olive Oil"]), {"salt", "olive oil"})
+    
+    def test_estimate_close_to_jaccard(self):
+        """Test identical sets agree everywhere and others are estimated closely"""
+        hasher = MinHasher(num_perm=256)
+        sets = token_sets()[:12]
+        for a in sets:
+            for b in sets:
+                estimate = estimate_jaccard(hasher.signature(a), hasher.signature(b))
+                self.assertAlmostEqual(estimate, jaccard(a, b), delta=0.15)
+            self.assertEqual(estimate_jaccard(hasher.signature(a), hasher.signature(set(a))), 1.0)
+    
+    def test_bulk_signatures_match_single(self):
+        """Test signatures from an inverted index equal per-set signatures, with and without NumPy"""
+        hasher = MinHasher()
+        sets = token_sets()
+        tokens = sorted(set().union(*sets))
+        members = [(token, [i for i, s in enumerate(sets) if token in s]) for token in tokens]
+        expected = [hasher.signature(s) for s in sets]
+        
+        engines = [False, True] if similarity.HAS_NUMPY else [False]
+        for vectorize in engines:
+            similarity.VECTORIZE = vectorize
+            self.assertEqual([tuple(int(v) for v in row) for row in hasher.signatures(len(sets), members)], expected)
+
+class TestLSHIndex(unittest.TestCase):
+    """Test LSH candidates"""
+    
+    def setUp(self):
+        self.vectorize = similarity.VECTORIZE
+    
+    def tearDown(self):
+        similarity.VECTORIZE = self.vectorize
+    
+    def test_similar_sets_are_candidates(self):
+        """Test near-identical sets share a bucket and unrelated ones do not"""
+        hasher = MinHasher()
+        lsh = LSHIndex()
+        lsh.add("a", hasher.signature({"egg", "rice", "onion", "garlic", "soy sauce", "oil"}))
+        lsh.add("b", hasher.signature({"egg", "rice", "onion", "garlic", "soy sauce", "peas"}))
+        lsh.add("c", hasher.signature({"flour", "sugar", "butter", "milk"}))
+        
+        found = lsh.candidates(hasher.signature({"egg", "rice", "onion", "garlic", "soy sauce", "oil"}))
+        
+        self.assertIn("a", found)
+        self.assertNotIn("c", found)
+    
+    def test_build_matches_add(self):
+        """Test bulk-built buckets give the same candidates as adding one by one"""
+        hasher = MinHasher()
+        sets = token_sets()
+        tokens = sorted(set().union(*sets))
+        members = [(token, [i for i, s in enumerate(sets) if token in s]) for token in tokens]
+        keep = [1 if s else 0 for s in sets]
+        expected = LSHIndex()
+        for i, s in enumerate(sets):
+            if s:
+                expected.add(i, hasher.signature(s))
+        
+        engines = [False, True] if similarity.HAS_NUMPY else [False]
+        for vectorize in engines:
+            similarity.VECTORIZE = vectorize
+            lsh = LSHIndex.build(hasher.signatures(len(sets), members), keep)
+            for s in sets[:-2]:
+                query = hasher.signature(s)
+                self.assertEqual(lsh.candidates(query), expected.candidates(query))
+            lsh.add("new", hasher.signature(sets[0]))
+            self.assertIn("new", lsh.candidates(hasher.signature(sets[0])))
+    
+    def test_import_does_not_load_numpy(self):
+        """Test importing the orchestrator (which dedups with LSH) leaves NumPy unloaded"""
+        probe = "import sys, core.orchestrator; print('numpy' in sys.modules)"
+        
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, "-c", probe], cwd=root, capture_output=True, text=True,
+                             check=True).stdout
+        
+        self.assertEqual(out.strip(), "False")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,11 @@ from core.sorters import (
     sort_by_cost_asc,
     sort_by_time_asc,
     filter_by_max_cost,
-    filter_by_max_time
+    filter_by_max_time,
+    filter_by_max_missing,
+    filter_by_query,
+    sort_recipes,
+    top_k_recipes
 )
 
 class TestSorters(unittest.TestCase):
@@ -104,6 +108,49 @@ class TestSorters(unittest.TestCase):
         ids = {r.id for r in filtered}
         self.assertIn("1", ids)
         self.assertIn("3", ids)
+    
+    def test_filter_by_max_missing(self):
+        """Test filtering by number of missing ingredients"""
+        recipes = [self.recipe1, self.recipe2, self.recipe3]
+        
+        self.assertEqual([r.id for r in filter_by_max_missing(recipes, 0)], ["3"])
+        self.assertEqual([r.id for r in filter_by_max_missing(recipes, 1)], ["1", "3"])
+    
+    def test_filter_by_query(self):
+        """Test every query word must appear in the title, instructions, cuisine or categories"""
+        self.recipe1.instructions = "Simmer the curry gently."
+        self.recipe2.cuisine = "Indian"
+        self.recipe2.category_or_diet = ["Spicy", "Curry"]
+        recipes = [self.recipe1, self.recipe2, self.recipe3]
+        
+        self.assertEqual([r.id for r in filter_by_query(recipes, "curry")], ["1", "2"])
+        self.assertEqual([r.id for r in filter_by_query(recipes, "SPICY curr*")], ["2"])
+        self.assertEqual([r.id for r in filter_by_query(recipes, "recipe 3")], ["3"])
+        self.assertEqual(len(filter_by_query(recipes, "")), 3)
+
+class TestTopK(unittest.TestCase):
+    """Test top-k selection matches the full sort"""
+    
+    def test_matches_full_sort_with_ties(self):
+        """Test every sort mode, including tie order, against sort + slice"""
+        recipes = []
+        for i in range(60):
+            recipes.append(Recipe(
+                id=str(i),
+                provider=Provider.THEMEALDB,
+                title=f"Recipe {i}",
+                used_ingredients=["x"] * (i % 4),
+                missing_ingredients=["y"] * (i % 3),
+                cost_per_serving_usd=None if i % 5 == 0 else float(i % 7),
+                ready_in_minutes=None if i % 6 == 0 else (i % 4) * 10
+            ))
+        
+        modes = ['used-desc', 'missing-asc', 'cost-asc', 'time-asc', 'match-desc', 'relevance', 'unknown']
+        for mode in modes:
+            full = [r.id for r in sort_recipes(recipes, mode)]
+            for k in (0, 1, 7, 60, 100):
+                self.assertEqual([r.id for r in top_k_recipes(recipes, mode, k)], full[:k], mode)
+                self.assertEqual([r.id for r in sort_recipes(recipes, mode, limit=k)], full[:k], mode)
 
 if __name__ == '__main__':
     unittest.main()
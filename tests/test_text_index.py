@@ -0,0 +1,114 @@
+"""Tests for the BM25 full-text index"""
+import os
+import tempfile
+import unittest
+from providers import recipe_index
+from providers.fallback_recipes import RECIPES_PATH
+from providers.recipe_index import file_digest
+from providers.recipe_store import text_index_path_for
+from providers.text_index import TITLE_WEIGHT, TextIndex, recipe_tokens
+
+RECIPES = [
+    {"title": "Spicy Chicken Curry", "cuisine": "Indian", "category": ["Spicy"],
+     "instructions": "Fry the onions, add the chicken and simmer the curry."},
+    {"title": "Lamb Stew", "cuisine": "British", "category": ["Comfort"],
+     "instructions": "Brown the lamb, add curry powder and stew slowly for two hours."},
+    {"title": "Currant Buns", "cuisine": "British", "category": ["Baking"],
+     "instructions": "Knead the dough with the currants and bake."},
+    {"title": "Green Salad", "cuisine": None, "category": [],
+     "instructions": "Toss the leaves."},
+]
+
+class TestTextIndex(unittest.TestCase):
+    """Test building, scoring and mapping the full-text index"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "test.tidx")
+        self.vectorize = recipe_index.VECTORIZE
+    
+    def tearDown(self):
+        recipe_index.VECTORIZE = self.vectorize
+        self.tmp.cleanup()
+    
+    def test_recipe_tokens(self):
+        """Test title words are weighted and every field is tokenized"""
+        tokens = recipe_tokens(RECIPES[0])
+        
+        self.assertEqual(tokens.count("curry"), TITLE_WEIGHT + 1)
+        self.assertIn("indian", tokens)
+        self.assertNotIn("the", tokens)
+        self.assertEqual(recipe_tokens(RECIPES[3]), ["green", "salad"] * TITLE_WEIGHT + ["toss", "leaves"])
+    
+    def test_bm25_ranking(self):
+        """Test a word in the title outranks the same word in the instructions"""
+        index = TextIndex.build(RECIPES)
+        scores = index.search("curry")
+        
+        self.assertEqual(set(scores), {0, 1})
+        self.assertGreater(scores[0], scores[1])
+        self.assertEqual(index.search("salad bake"), {})
+        self.assertEqual(index.search("the"), {})
+    
+    def test_every_word_required(self):
+        """Test a multi-word query only matches recipes containing all words"""
+        index = TextIndex.build(RECIPES)
+        
+        self.assertEqual(set(index.search("curry lamb")), {1})
+        self.assertAlmostEqual(index.search("curry lamb")[1], index.search("curry")[1] + index.search("lamb")[1])
+    
+    def test_prefix(self):
+        """Test a trailing * (or prefix=True) matches every word with that prefix"""
+        index = TextIndex.build(RECIPES)
+        
+        self.assertEqual(set(index.search("curr*")), {0, 1, 2})
+        self.assertEqual(set(index.search("curr", prefix=True)), {0, 1, 2})
+        self.assertEqual(index.search("curr"), {})
+        self.assertEqual(set(index.search("brit* curr*")), {1, 2})
+    
+    def test_engines_agree(self):
+        """Test NumPy and pure-Python scoring give the same scores"""
+        if not recipe_index.HAS_NUMPY:
+            self.skipTest("NumPy not installed")
+        index = TextIndex.build(RECIPES)
+        for query in ("curry", "curr*", "brit* curr*", "add the lamb", "c*", "nothing"):
+            recipe_index.VECTORIZE = False
+            expected = index.search(query)
+            recipe_index.VECTORIZE = True
+            scores = index.search(query)
+            
+            self.assertEqual(set(scores), set(expected), query)
+            for position, score in expected.items():
+                self.assertAlmostEqual(scores[position], score)
+    
+    def test_score_tokens(self):
+        """Test a recipe outside the index scores like an indexed copy of it"""
+        index = TextIndex.build(RECIPES)
+        
+        self.assertAlmostEqual(index.score_tokens("spicy curr*", recipe_tokens(RECIPES[0])),
+                               index.search("spicy curr*")[0])
+        self.assertIsNone(index.score_tokens("lamb", recipe_tokens(RECIPES[0])))
+    
+    def test_save_and_load(self):
+        """Test a mapped index scores like the built one and stale files are rejected"""
+        built = TextIndex.build(RECIPES)
+        built.save(self.path, b"x" * 32)
+        loaded = TextIndex.load(self.path, b"x" * 32)
+        
+        self.assertEqual(loaded.terms, built.terms)
+        self.assertEqual(loaded.search("curr*"), built.search("curr*"))
+        self.assertIsNone(TextIndex.load(self.path, b"y" * 32))
+        self.assertIsNone(TextIndex.load(os.path.join(self.tmp.name, "missing.tidx")))
+        mapped = loaded._mmap
+        loaded.close()
+        self.assertTrue(mapped.closed)
+    
+    def test_shipped_index_is_current(self):
+        """Test the shipped full-text index was built from the shipped data"""
+        shipped = TextIndex.load(text_index_path_for(RECIPES_PATH), file_digest(RECIPES_PATH))
+        
+        self.assertIsNotNone(shipped, "run: python -m providers.recipe_index build")
+        shipped.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Tests for TheMealDB provider parsing and top-k fetching"""
+import unittest
+from providers.themealdb import TheMealDBProvider, MealParser
+
+
+def make_meal(meal_id, ingredients):
+    """Build a minimal lookup.php meal payload"""
+    meal = {"idMeal": meal_id, "strMeal": f"Meal {meal_id}", "strArea": "British", "strTags": "Quick, Easy"}
+    for i, name in enumerate(ingredients, 1):
+        meal[f"strIngredient{i}"] = name
+        meal[f"strMeasure{i}"] = "1 cup "
+    return meal
+
+
+class FakeProvider(TheMealDBProvider):
+    """Provider serving meals from a dict and counting lookups"""
+    
+    def __init__(self, meals):
+        super().__init__()
+        self.meals = meals
+        self.looked_up = []
+    
+    def lookup_meal(self, meal_id):
+        self.looked_up.append(meal_id)
+        return self.meals.get(meal_id)
+
+
+class TestMealParser(unittest.TestCase):
+    """Test single-pass meal parsing"""
+    
+    def test_parse(self):
+        """Test ingredients, measures, categories and matches in one pass"""
+        meal = make_meal("1", ["Eggs", " Milk ", "", "Flour"])
+        meal["strMeasure3"] = None
+        recipe = MealParser(["egg", "flour"]).parse(meal)
+        
+        self.assertEqual([i.name for i in recipe.ingredients], ["Eggs", "Milk", "Flour"])
+        self.assertEqual(recipe.ingredients[0].quantity, "1 cup")
+        self.assertEqual(recipe.used_ingredients, ["Eggs", "Flour"])
+        self.assertEqual(recipe.missing_ingredients, ["Milk"])
+        self.assertEqual(recipe.category_or_diet, ["British cuisine", "Quick", "Easy"])
+
+
+def old_lookup_count(meals, sorted_meal_ids, max_results):
+    """Lookups issued by the previous loop: in order, until max_results meals were fetched"""
+    lookups = fetched = 0
+    for meal_id in sorted_meal_ids[:max_results * 2]:
+        lookups += 1
+        if meal_id in meals:
+            fetched += 1
+            if fetched >= max_results:
+                break
+    return lookups
+
+
+class TestFetchTopMeals(unittest.TestCase):
+    """Test fetching and ranking the top candidates"""
+    
+    def test_stops_when_results_are_filled(self):
+        """Test lookups stop once max_results meals were fetched"""
+        meals = {str(i): make_meal(str(i), ["egg", "rice"] if i < 2 else ["egg"]) for i in range(6)}
+        counts = {"0": 2, "1": 2, "2": 1, "3": 1, "4": 1, "5": 1}
+        provider = FakeProvider(meals)
+        
+        recipes = provider.fetch_top_meals(list("012345"), counts, ["egg", "rice"], 2)
+        
+        self.assertEqual([r.id for r in recipes], ["0", "1"])
+        self.assertEqual(provider.looked_up, ["0", "1"])
+        self.assertEqual(provider.last_fetch_stats["lookups"], 2)
+    
+    def test_ranks_by_verified_score(self):
+        """Test a meal scoring below its filter count drops behind fetched meals that verify"""
+        meals = {
+            "0": make_meal("0", ["egg", "rice"]),
+            "1": make_meal("1", ["egg"]),  # filter said 2, verifies as 1
+            "2": make_meal("2", ["egg", "rice"]),
+        }
+        counts = {"0": 2, "1": 2, "2": 2}
+        provider = FakeProvider(meals)
+        
+        recipes = provider.fetch_top_meals(["0", "1", "2"], counts, ["egg", "rice"], 3)
+        
+        self.assertEqual([r.id for r in recipes], ["0", "2", "1"])
+    
+    def test_no_more_lookups_than_before(self):
+        """Test lookups never exceed those of the previous fetch loop"""
+        cases = [
+            ({"0": ["egg", "rice"], "1": ["egg"], "2": ["egg", "rice"]}, ["0", "1", "2"], 2),
+            ({"1": ["egg"], "3": ["rice"]}, ["0", "1", "2", "3"], 2),
+            ({str(i): ["egg"] for i in range(10)}, [str(i) for i in range(10)], 3),
+        ]
+        for meals, ids, k in cases:
+            provider = FakeProvider({m: make_meal(m, ings) for m, ings in meals.items()})
+            counts = {meal_id: 2 for meal_id in ids}
+            
+            provider.fetch_top_meals(ids, counts, ["egg", "rice"], k)
+            
+            self.assertLessEqual(len(provider.looked_up), old_lookup_count(meals, ids, k))
+    
+    def test_skips_failed_lookups(self):
+        """Test missing meals don't occupy result slots"""
+        provider = FakeProvider({"1": make_meal("1", ["egg"])})
+        
+        recipes = provider.fetch_top_meals(["0", "1"], {"0": 1, "1": 1}, ["egg"], 1)
+        
+        self.assertEqual([r.id for r in recipes], ["1"])
+
+if __name__ == '__main__':
+    unittest.main()
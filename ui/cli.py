@@ -8,6 +8,7 @@ from rich import box
 from core.model import Recipe
 from core.orchestrator import search_recipes as orchestrator_search
 from core.export import export_recipes
+from core.normalize import parse_ingredients
 
 console = Console()
 
@@ -147,7 +148,10 @@ def handle_find_command(args) -> int:
     global _last_results
     
     try:
-        console.print(f"\n[bold]Searching for recipes with: {args.ingredients}[/bold]")
+        if args.ingredients:
+            console.print(f"\n[bold]Searching for recipes with: {args.ingredients}[/bold]")
+        if args.query:
+            console.print(f"\n[bold]Searching recipe text for: {args.query}[/bold]")
         
         if args.provider != 'themealdb':
             console.print(f"[dim]Using provider: {args.provider}[/dim]")
@@ -162,7 +166,9 @@ def handle_find_command(args) -> int:
             max_minutes=args.max_mins,
             max_cost=args.max_cost,
             exclude_str=args.exclude,
-            sort_by=args.sort
+            sort_by=args.sort,
+            max_missing=args.max_missing,
+            query=args.query
         )
         
         # Store results for export
@@ -186,7 +192,83 @@ def handle_find_command(args) -> int:
             export_recipes(recipes, args.export)
         
         return 0
+    
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return 1
+
+def handle_suggest_command(args) -> int:
+    """Handle the 'suggest' command"""
+    from providers.fallback_recipes import best_ingredients_to_buy, best_next_ingredients
+    
+    try:
+        pantry = parse_ingredients(args.ingredients)
+        if args.count > 1:
+            picks = best_ingredients_to_buy(pantry, args.count, diet=args.diet, max_minutes=args.max_mins)
+            title = f"🛒 Best {args.count} Ingredients to Buy Together"
+            count_header = "New Recipes"
+        else:
+            picks = best_next_ingredients(pantry, args.limit, diet=args.diet, max_minutes=args.max_mins)
+            title = "🛒 Best Next Ingredient to Buy"
+            count_header = "Recipes Unlocked"
         
+        if not picks:
+            if args.count > 1:
+                console.print(f"[yellow]No {args.count} ingredients would complete another recipe.[/yellow]")
+            else:
+                console.print("[yellow]No single ingredient would complete another recipe.[/yellow]")
+            return 0
+        
+        table = Table(title=title, box=box.ROUNDED, show_header=True, header_style="bold magenta")
+        table.add_column("#", style="dim", width=3)
+        table.add_column("Ingredient", style="cyan", width=30)
+        table.add_column(count_header, justify="right", width=16)
+        for idx, (ingredient, count) in enumerate(picks, 1):
+            table.add_row(str(idx), ingredient, str(count))
+        
+        console.print(table)
+        return 0
+    
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return 1
+
+def handle_plan_command(args) -> int:
+    """Handle the 'plan' command"""
+    global _last_results
+    from core.planner import plan_week
+    
+    try:
+        pantry = parse_ingredients(args.ingredients)
+        exclude = parse_ingredients(args.exclude) if args.exclude else None
+        console.print(f"\n[bold]Planning {args.days} meals with: {args.ingredients}[/bold]")
+        
+        plan = plan_week(pantry, args.days, diet=args.diet, max_minutes=args.max_mins, exclude=exclude)
+        
+        # Store the planned recipes for export
+        _last_results = plan.recipes
+        
+        console.print()
+        display_recipes_table(plan.recipes)
+        if not plan.recipes:
+            return 0
+        
+        if not plan.shopping_list:
+            console.print("\n[green]You already have everything for this plan![/green]")
+        else:
+            table = Table(title="🛒 Shopping List", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+            table.add_column("Ingredient", style="cyan", width=30)
+            table.add_column("Recipes", justify="right", width=8)
+            for ingredient, count in plan.shopping_list:
+                table.add_row(ingredient, str(count))
+            console.print(table)
+            console.print(f"\n[dim]{plan.missing_count} ingredients to buy[/dim]")
+        
+        if args.export:
+            export_recipes(plan.recipes, args.export)
+        
+        return 0
+    
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
         return 1